@@ -0,0 +1,648 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from email.message import Message
+
+import tornado.httputil
+import tornado.ioloop
+import tornado.web
+
+# --------- Pipeline Imports ----------
+from audio_preprocessing.pcm_store import release_pcm_dir
+from main06 import (
+    DECODING_PROFILE,
+    NLLB_LANG_MAP,
+    TARGET_LANGUAGE,
+    open_exporters,
+    preprocess_audio,
+    run_conversation_stages,
+)
+from monitoring.metrics import job_context
+from speech_to_text.decoding_profiles import DECODING_PROFILES
+from transcript_export.exporter import SUPPORTED_FORMATS
+from utils.file_utils import SUPPORTED_FORMATS as SUPPORTED_AUDIO_FORMATS, create_dir_if_not_exists
+from utils.model_cache import MODEL_CACHE
+
+
+# ==================== CONFIG ====================
+
+JOBS_DIR = "jobs"
+
+# Jobs processed concurrently
+API_WORKERS = int(os.getenv("ACMTS_API_WORKERS", "2"))
+
+# Jobs allowed to wait for a worker before new submissions are rejected
+API_MAX_QUEUED = int(os.getenv("ACMTS_API_MAX_QUEUED", "8"))
+
+# Suggested client back-off when the queue is full
+RETRY_AFTER_SEC = 30
+
+MAX_UPLOAD_BYTES = 1024 * 1024 * 1024
+
+# Form fields / JSON bodies are small; only the audio part may be large
+MAX_FIELD_BYTES = 64 * 1024
+
+# Finished jobs (status, result.json, exports) are kept this long
+JOB_TTL_SEC = int(os.getenv("ACMTS_JOB_TTL_SEC", str(24 * 3600)))
+
+# JSON {"path": ...} submissions may only name files under this
+# directory; unset → server-side paths are refused (upload instead)
+API_INPUT_DIR = os.getenv("ACMTS_API_INPUT_DIR") or None
+
+
+# ==================== JOBS ====================
+
+class QueueFullError(Exception):
+    """
+    Raised when every worker is busy and the wait queue is full.
+    """
+
+
+def _json_safe(value):
+    # ChunkStore keeps missing segment scores as NaN, which is not JSON
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    return value
+
+
+class Job:
+    """
+    One submitted recording. Everything it writes lives under job_dir;
+    the final result is kept on disk (result.json), not in memory.
+    Status fields are written by the worker thread and read on the
+    IOLoop, always under the job's lock (to_status() is the snapshot).
+    """
+
+    def __init__(self, job_id: str, job_dir: str, audio_path: str, options: dict):
+        self.id = job_id
+        self.job_dir = job_dir
+        self.audio_path = audio_path
+        self.options = options
+
+        self.status = "queued"
+        self.stage = None
+        self.progress = 0.0
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def result_path(self) -> str:
+        return os.path.join(self.job_dir, "result.json")
+
+    def update_progress(self, stage: str, fraction: float) -> None:
+        with self._lock:
+            self.stage = stage
+            self.progress = fraction
+
+    def set_status(self, status: str, error: str = None) -> None:
+        with self._lock:
+            self.status = status
+            if error is not None:
+                self.error = error
+            if status == "running":
+                self.started_at = time.time()
+            elif status in ("done", "failed"):
+                self.finished_at = time.time()
+
+    def to_status(self) -> dict:
+        with self._lock:
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "stage": self.stage,
+                "progress": self.progress,
+                "error": self.error,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+
+class JobManager:
+    """
+    Bounded worker pool for pipeline jobs.
+
+    At most max_workers jobs run at once and at most max_queued wait;
+    submit() raises QueueFullError beyond that so callers can back off.
+    Finished jobs are forgotten, and their directories deleted, job_ttl
+    seconds after they finish (prune()).
+    """
+
+    def __init__(
+        self,
+        jobs_dir: str = JOBS_DIR,
+        max_workers: int = API_WORKERS,
+        max_queued: int = API_MAX_QUEUED,
+        job_ttl: float = JOB_TTL_SEC
+    ):
+        self.jobs_dir = jobs_dir
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.job_ttl = job_ttl
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queued
+
+    def is_full(self) -> bool:
+        with self._lock:
+            return self._pending >= self.capacity
+
+    def stats(self) -> dict:
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if job.to_status()["status"] == "running")
+            return {
+                "running": running,
+                "queued": self._pending - running,
+                "workers": self.max_workers,
+                "max_queued": self.max_queued,
+            }
+
+    def new_job_dir(self) -> tuple:
+        job_id = uuid.uuid4().hex[:12]
+        job_dir = os.path.join(self.jobs_dir, job_id)
+        create_dir_if_not_exists(job_dir)
+        return job_id, job_dir
+
+    def prune(self) -> int:
+        """
+        Evict finished jobs older than job_ttl; returns how many.
+        """
+        cutoff = time.time() - self.job_ttl
+        with self._lock:
+            expired = []
+            for job in self._jobs.values():
+                finished_at = job.to_status()["finished_at"]
+                if finished_at is not None and finished_at < cutoff:
+                    expired.append(job)
+            for job in expired:
+                del self._jobs[job.id]
+
+        for job in expired:
+            shutil.rmtree(job.job_dir, ignore_errors=True)
+
+        return len(expired)
+
+    def submit(self, job_id: str, job_dir: str, audio_path: str, options: dict) -> Job:
+        self.prune()
+
+        with self._lock:
+            if self._pending >= self.capacity:
+                raise QueueFullError(f"{self._pending} jobs pending (capacity {self.capacity})")
+            self._pending += 1
+
+            job = Job(job_id, job_dir, audio_path, options)
+            self._jobs[job_id] = job
+
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str):
+        return self._jobs.get(job_id)
+
+    def _run(self, job: Job) -> None:
+        job.set_status("running")
+
+        try:
+            with job_context(job.id):
+                # Opened up front: chunks, speakers, timeline and insights
+                # are exported as each completes
+                exporter = open_exporters(
+                    [job.audio_path],
+                    export_dir=os.path.join(job.job_dir, "exports"),
+                    formats=job.options["export_formats"]
+                )[0]
+
+                with exporter if exporter is not None else nullcontext():
+                    chunks = preprocess_audio(
+                        job.audio_path,
+                        target_language=job.options["target_language"],
+                        decoding_profile=job.options["decoding_profile"],
+                        chunks_dir=os.path.join(job.job_dir, "chunks"),
+                        progress=job.update_progress,
+                        exporter=exporter
+                    )
+                    conversation, insights = run_conversation_stages(
+                        chunks, progress=job.update_progress, exporter=exporter
+                    )
+
+                paths = exporter.paths if exporter is not None else {}
+
+            result = {
+                "job_id": job.id,
+                "chunks": chunks.to_records(),
+                "conversation": conversation,
+                "insights": insights,
+                "exports": paths,
+            }
+            with open(job.result_path, "w", encoding="utf-8") as f:
+                json.dump(_json_safe(result), f, ensure_ascii=False, default=str)
+
+            job.update_progress("done", 1.0)
+            job.set_status("done")
+        except Exception as exc:
+            job.set_status("failed", error=f"{type(exc).__name__}: {exc}")
+        finally:
+            # Failed jobs never reach diarization, which frees the PCM file
+            release_pcm_dir(os.path.join(job.job_dir, "chunks"))
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ==================== HTTP HANDLERS ====================
+
+def _header_params(value: str) -> dict:
+    """
+    Parameters of a Content-Type / Content-Disposition header value.
+    """
+    message = Message()
+    message["content-disposition"] = value
+    return dict(message.get_params(header="content-disposition", unquote=True)[1:])
+
+
+class MultipartSpooler:
+    """
+    Incremental multipart/form-data parser for streamed request bodies.
+
+    File parts are written straight to files in upload_dir; other fields
+    are kept in memory up to MAX_FIELD_BYTES. Neither the whole body nor
+    the whole upload is ever held in memory.
+    """
+
+    def __init__(self, boundary: bytes, upload_dir: str):
+        self.delimiter = b"\r\n--" + boundary
+        self.upload_dir = upload_dir
+        self.fields = {}
+        self.files = {}
+
+        # The first delimiter has no leading CRLF
+        self._buffer = bytearray(b"\r\n")
+        self._state = "preamble"
+        self._part = None
+
+    def feed(self, data: bytes) -> None:
+        self._buffer += data
+
+        while True:
+            if self._state == "preamble":
+                idx = self._buffer.find(self.delimiter)
+                if idx < 0:
+                    del self._buffer[:max(0, len(self._buffer) - len(self.delimiter))]
+                    return
+                del self._buffer[:idx + len(self.delimiter)]
+                self._state = "delimiter"
+
+            elif self._state == "delimiter":
+                if len(self._buffer) < 2:
+                    return
+                if self._buffer[:2] == b"--":
+                    self._state = "done"
+                    self._buffer.clear()
+                    return
+                del self._buffer[:2]  # CRLF
+                self._state = "headers"
+
+            elif self._state == "headers":
+                idx = self._buffer.find(b"\r\n\r\n")
+                if idx < 0:
+                    if len(self._buffer) > MAX_FIELD_BYTES:
+                        raise tornado.web.HTTPError(400, "Malformed multipart body")
+                    return
+                headers = tornado.httputil.HTTPHeaders.parse(self._buffer[:idx].decode("utf-8", "replace"))
+                del self._buffer[:idx + 4]
+                self._open_part(headers)
+                self._state = "body"
+
+            elif self._state == "body":
+                idx = self._buffer.find(self.delimiter)
+                if idx < 0:
+                    # Keep a possible partial delimiter for the next feed
+                    keep = len(self.delimiter) - 1
+                    if len(self._buffer) > keep:
+                        self._write(self._buffer[:-keep])
+                        del self._buffer[:-keep]
+                    return
+                self._write(self._buffer[:idx])
+                del self._buffer[:idx + len(self.delimiter)]
+                self._close_part()
+                self._state = "delimiter"
+
+            else:
+                self._buffer.clear()
+                return
+
+    def _open_part(self, headers) -> None:
+        params = _header_params(headers.get("Content-Disposition", ""))
+        name = params.get("name", "")
+
+        if "filename" in params:
+            path = os.path.join(self.upload_dir, f"upload-{len(self.files)}")
+            self._part = {"name": name, "filename": params["filename"], "path": path, "sink": open(path, "wb")}
+        else:
+            self._part = {"name": name, "sink": bytearray()}
+
+    def _write(self, data) -> None:
+        sink = self._part["sink"]
+        if isinstance(sink, bytearray):
+            if len(sink) + len(data) > MAX_FIELD_BYTES:
+                raise tornado.web.HTTPError(413, f"Form field '{self._part['name']}' is too large")
+            sink += data
+        else:
+            sink.write(data)
+
+    def _close_part(self) -> None:
+        part, self._part = self._part, None
+        if isinstance(part["sink"], bytearray):
+            self.fields[part["name"]] = part["sink"].decode("utf-8", "replace")
+        else:
+            part["sink"].close()
+            self.files[part["name"]] = (part["filename"], part["path"])
+
+    def close(self) -> None:
+        if self._part is not None and not isinstance(self._part["sink"], bytearray):
+            self._part["sink"].close()
+        self._part = None
+
+class BaseHandler(tornado.web.RequestHandler):
+
+    def initialize(self, manager: JobManager, input_dir: str = None):
+        self.manager = manager
+        self.input_dir = input_dir
+
+    def write_error(self, status_code: int, **kwargs):
+        reason = self._reason
+        exc_info = kwargs.get("exc_info")
+        if exc_info and isinstance(exc_info[1], tornado.web.HTTPError) and exc_info[1].log_message:
+            reason = exc_info[1].log_message
+        self.finish({"error": reason, "status": status_code})
+
+    def get_job(self, job_id: str) -> Job:
+        job = self.manager.get(job_id)
+        if job is None:
+            raise tornado.web.HTTPError(404, f"Unknown job '{job_id}'")
+        return job
+
+
+@tornado.web.stream_request_body
+class JobsHandler(BaseHandler):
+    """
+    POST /jobs
+
+    multipart/form-data with an "audio" file, or JSON {"path": ...} naming
+    a file under the server's input directory (--input-dir; refused when
+    none is configured).
+    Optional fields: target_language, decoding_profile, export_formats
+    (comma separated). Returns 202 {"job_id", "status_url", "result_url"}.
+
+    The body is streamed: a saturated server answers 503 in prepare(),
+    before any of the upload is read, and accepted uploads go straight
+    to the job directory.
+    """
+
+    def _options(self, fields: dict) -> dict:
+        target_language = (fields.get("target_language") or TARGET_LANGUAGE).lower()
+        if target_language not in NLLB_LANG_MAP:
+            raise tornado.web.HTTPError(400, f"Unsupported target_language '{target_language}'. Supported languages are: {tuple(NLLB_LANG_MAP)}")
+
+        decoding_profile = fields.get("decoding_profile") or DECODING_PROFILE
+        if decoding_profile not in DECODING_PROFILES:
+            raise tornado.web.HTTPError(400, f"Unknown decoding_profile '{decoding_profile}'. Supported profiles are: {tuple(DECODING_PROFILES)}")
+
+        export_formats = fields.get("export_formats", "jsonl")
+        if isinstance(export_formats, str):
+            export_formats = [f for f in export_formats.split(",") if f]
+        unknown = set(export_formats) - set(SUPPORTED_FORMATS)
+        if unknown:
+            raise tornado.web.HTTPError(400, f"Unsupported export formats {sorted(unknown)}. Supported formats are: {SUPPORTED_FORMATS}")
+
+        return {
+            "target_language": target_language,
+            "decoding_profile": decoding_profile,
+            "export_formats": export_formats,
+        }
+
+    def prepare(self):
+        self.job = None
+        self.job_dir = None
+        self.spooler = None
+        self.json_body = bytearray()
+        self.received = 0
+        self.body_error = None
+
+        # Reject before reading (let alone buffering) the upload
+        if self.manager.is_full():
+            self._reject()
+            self.finish()
+            return
+
+        self.request.connection.set_max_body_size(MAX_UPLOAD_BYTES)
+        self.job_id, self.job_dir = self.manager.new_job_dir()
+
+        content_type = self.request.headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            boundary = _header_params(content_type).get("boundary")
+            if not boundary:
+                raise tornado.web.HTTPError(400, "multipart/form-data without a boundary")
+            self.spooler = MultipartSpooler(boundary.encode("latin-1"), self.job_dir)
+        elif not content_type.startswith("application/json"):
+            raise tornado.web.HTTPError(415, "Send multipart/form-data or application/json")
+
+    def data_received(self, chunk: bytes):
+        # Errors are raised from post(), where tornado can answer with them;
+        # the rest of the body is read and discarded
+        if self.body_error is not None:
+            return
+
+        self.received += len(chunk)
+        try:
+            if self.received > MAX_UPLOAD_BYTES:
+                raise tornado.web.HTTPError(413, f"Upload exceeds {MAX_UPLOAD_BYTES} bytes")
+
+            if self.spooler is not None:
+                self.spooler.feed(chunk)
+            else:
+                if len(self.json_body) + len(chunk) > MAX_FIELD_BYTES:
+                    raise tornado.web.HTTPError(413, "JSON body is too large")
+                self.json_body += chunk
+        except tornado.web.HTTPError as exc:
+            self.body_error = exc
+            if self.spooler is not None:
+                self.spooler.close()
+
+    def on_finish(self):
+        if self.spooler is not None:
+            self.spooler.close()
+        # Anything not handed to a job is dropped
+        if self.job_dir and self.job is None:
+            shutil.rmtree(self.job_dir, ignore_errors=True)
+
+    def on_connection_close(self):
+        self.on_finish()
+
+    def _fields(self) -> dict:
+        if self.spooler is not None:
+            return dict(self.spooler.fields)
+
+        try:
+            return json.loads(bytes(self.json_body) or b"{}")
+        except ValueError:
+            raise tornado.web.HTTPError(400, "Request body is not valid JSON")
+
+    def post(self):
+        if self.body_error is not None:
+            raise self.body_error
+
+        fields = self._fields()
+        options = self._options(fields)
+
+        upload = self.spooler.files.get("audio") if self.spooler is not None else None
+
+        if upload:
+            filename = os.path.basename(upload[0] or "audio")
+            if not filename.lower().endswith(SUPPORTED_AUDIO_FORMATS):
+                raise tornado.web.HTTPError(400, f"The file format of {filename} is not supported. Supported formats are: {SUPPORTED_AUDIO_FORMATS}")
+
+            audio_path = os.path.join(self.job_dir, filename)
+            os.replace(upload[1], audio_path)
+        elif fields.get("path"):
+            audio_path = self._input_path(fields["path"])
+        else:
+            raise tornado.web.HTTPError(400, "Provide an 'audio' file upload or a 'path'")
+
+        try:
+            self.job = self.manager.submit(self.job_id, self.job_dir, audio_path, options)
+        except QueueFullError:
+            self._reject()
+            return
+
+        job = self.job
+        self.set_status(202)
+        self.set_header("Location", f"/jobs/{job.id}")
+        self.write({
+            **job.to_status(),
+            "status_url": f"/jobs/{job.id}",
+            "result_url": f"/jobs/{job.id}/result",
+        })
+
+    def _input_path(self, path: str) -> str:
+        if not self.input_dir:
+            raise tornado.web.HTTPError(403, "Server-side paths are disabled; upload the file as 'audio'")
+
+        root = os.path.realpath(self.input_dir)
+        # Relative paths are taken relative to the input directory
+        resolved = os.path.realpath(os.path.join(root, path))
+        if os.path.commonpath([root, resolved]) != root:
+            raise tornado.web.HTTPError(403, f"Path {path} is outside the input directory")
+        if not os.path.isfile(resolved):
+            raise tornado.web.HTTPError(400, f"The file at path {path} does not exist.")
+
+        return resolved
+
+    def _reject(self):
+        self.set_status(503)
+        self.set_header("Retry-After", str(RETRY_AFTER_SEC))
+        self.write({"error": "Job queue is full, retry later", **self.manager.stats()})
+
+
+class JobStatusHandler(BaseHandler):
+    """
+    GET /jobs/<id> → status, stage and progress (0..1).
+    """
+
+    def get(self, job_id: str):
+        self.write(self.get_job(job_id).to_status())
+
+
+class JobResultHandler(BaseHandler):
+    """
+    GET /jobs/<id>/result → chunks, conversation, insights and export paths.
+    """
+
+    def get(self, job_id: str):
+        job = self.get_job(job_id)
+        status = job.to_status()
+
+        if status["status"] == "failed":
+            raise tornado.web.HTTPError(500, status["error"])
+        if status["status"] != "done":
+            self.set_status(409)
+            self.write(status)
+            return
+
+        self.set_header("Content-Type", "application/json; charset=UTF-8")
+        with open(job.result_path, "rb") as f:
+            self.write(f.read())
+
+
+class HealthHandler(BaseHandler):
+
+    def get(self):
+        self.write({"status": "ok", **self.manager.stats(), "model_cache": MODEL_CACHE.stats()})
+
+
+def make_app(manager: JobManager, input_dir: str = API_INPUT_DIR) -> tornado.web.Application:
+    args = {"manager": manager, "input_dir": input_dir}
+
+    return tornado.web.Application([
+        (r"/jobs", JobsHandler, args),
+        (r"/jobs/([0-9a-f]+)", JobStatusHandler, args),
+        (r"/jobs/([0-9a-f]+)/result", JobResultHandler, args),
+        (r"/health", HealthHandler, args),
+    ])
+
+
+# ==================== RUNNER ====================
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="HTTP job API for the audio pipeline")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=API_WORKERS, help="Jobs processed concurrently")
+    parser.add_argument("--max-queued", type=int, default=API_MAX_QUEUED, help="Jobs waiting before new ones are rejected (503)")
+    parser.add_argument("--jobs-dir", default=JOBS_DIR)
+    parser.add_argument("--job-ttl", type=int, default=JOB_TTL_SEC, help="Seconds finished jobs stay retrievable")
+    parser.add_argument("--input-dir", default=API_INPUT_DIR, help="Directory JSON 'path' submissions may read from (unset: uploads only)")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+
+    manager = JobManager(args.jobs_dir, args.workers, args.max_queued, args.job_ttl)
+    app = make_app(manager, args.input_dir)
+    app.listen(args.port, max_body_size=MAX_UPLOAD_BYTES)
+
+    # Finished jobs expire even when no new ones arrive
+    tornado.ioloop.PeriodicCallback(manager.prune, 60 * 1000).start()
+
+    print(f"🌐 Job API listening on :{args.port} ({args.workers} workers, {args.max_queued} queued max)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        manager.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,7 +1,17 @@
+import os
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
 from pydub import AudioSegment
 
+from audio_preprocessing.resampler import TARGET_SAMPLE_RATE, resample
 from utils.file_utils import validate_file_path
 
+# Decoded in-process by libsndfile, no ffmpeg subprocess
+SOUNDFILE_FORMATS = (".wav", ".flac")
+
 
 def load_audio(file_path: str) -> AudioSegment:
     """Load an audio file and return an AudioSegment object.
@@ -13,4 +23,128 @@ def load_audio(file_path: str) -> AudioSegment:
     validate_file_path(file_path)
     audio = AudioSegment.from_file(file_path)
 
-    return audio
\ No newline at end of file
+    return audio
+
+
+def _ffmpeg_executable() -> str:
+    path = shutil.which("ffmpeg")
+    if path:
+        return path
+
+    # Bundled binary from imageio-ffmpeg when ffmpeg isn't on PATH
+    import imageio_ffmpeg
+    return imageio_ffmpeg.get_ffmpeg_exe()
+
+
+def _wav_stream_samples(buffer: bytearray) -> tuple:
+    """
+    (float32 samples, sample rate) of a streamed float WAV from ffmpeg.
+
+    A piped WAV cannot have its sizes patched in, so the data chunk is
+    taken to run to the end of the buffer.
+    """
+    view = memoryview(buffer)
+    if bytes(view[0:4]) != b"RIFF" or bytes(view[8:12]) != b"WAVE":
+        raise RuntimeError("ffmpeg did not produce a WAV stream")
+
+    sample_rate = None
+    pos = 12
+    while pos + 8 <= len(buffer):
+        chunk_id = bytes(view[pos:pos + 4])
+        size = int.from_bytes(view[pos + 4:pos + 8], "little")
+        body = pos + 8
+
+        if chunk_id == b"fmt ":
+            sample_rate = int.from_bytes(view[body + 4:body + 8], "little")
+        elif chunk_id == b"data":
+            if sample_rate is None:
+                break
+            count = (len(buffer) - body) // 4
+            return np.frombuffer(buffer, dtype=np.float32, count=count, offset=body), sample_rate
+
+        pos = body + size + (size & 1)
+
+    raise RuntimeError("ffmpeg WAV stream has no fmt/data chunk")
+
+
+def _decode_with_ffmpeg(file_path: str, sample_rate: int) -> np.ndarray:
+    # Decoded and downmixed at the native rate; resampling is left to
+    # soxr (resampler.resample) rather than ffmpeg's default swresample
+    cmd = [
+        _ffmpeg_executable(),
+        "-nostdin",
+        "-loglevel", "error",
+        "-threads", "0",
+        "-i", file_path,
+        "-vn",
+        "-map_metadata", "-1",
+        "-fflags", "+bitexact",
+        "-f", "wav",
+        "-acodec", "pcm_f32le",
+        "-ac", "1",
+        "-",
+    ]
+
+    # Read the pipe into one mutable buffer: the array wraps it without a
+    # further copy and stays writable for in-place normalization. stderr
+    # goes to a temp file so a flood of warnings can never fill its pipe
+    # and stall ffmpeg while we wait on stdout.
+    buffer = bytearray()
+    with tempfile.TemporaryFile() as stderr_file:
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file) as proc:
+            while True:
+                block = proc.stdout.read(1 << 20)
+                if not block:
+                    break
+                buffer += block
+
+        stderr_file.seek(0)
+        errors = stderr_file.read()
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to decode {file_path}: {errors.decode(errors='ignore').strip()}")
+
+    samples, native_rate = _wav_stream_samples(buffer)
+    return resample(samples, native_rate, sample_rate)
+
+
+def _decode_with_soundfile(file_path: str, sample_rate: int) -> np.ndarray:
+    import soundfile as sf
+
+    info = sf.info(file_path)
+
+    if info.samplerate == sample_rate and info.channels == 1:
+        # Already conformant: a straight read, no downmix or resample
+        samples, _ = sf.read(file_path, dtype="float32")
+        return samples
+
+    samples, sr = sf.read(file_path, dtype="float32", always_2d=True)
+    return resample(samples, sr, sample_rate)
+
+
+def load_audio_array(file_path: str, sample_rate: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    """Decode an audio file straight to mono float32 at sample_rate.
+
+    WAV and FLAC are read in-process with soundfile (and not converted at
+    all when already mono at sample_rate); every other format, and any
+    WAV/FLAC soundfile cannot read, is decoded and downmixed by a single
+    ffmpeg subprocess piped into a NumPy buffer. Resampling is always
+    done by soxr (resampler.resample).
+
+    Args:
+        file_path (str): The path to the audio file.
+        sample_rate (int, optional): Output sample rate. Defaults to 16000.
+
+    Returns:
+        np.ndarray: Mono float32 samples in [-1, 1].
+    """
+
+    validate_file_path(file_path)
+
+    if os.path.splitext(file_path)[1].lower() in SOUNDFILE_FORMATS:
+        try:
+            return _decode_with_soundfile(file_path, sample_rate)
+        except (ImportError, RuntimeError):
+            pass  # e.g. WAV with an unusual codec; ffmpeg handles far more
+
+    return _decode_with_ffmpeg(file_path, sample_rate)
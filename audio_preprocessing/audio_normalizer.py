@@ -1,5 +1,32 @@
+import math
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
 from pydub import AudioSegment
 
+# Integrated loudness target (LUFS) for the pipeline
+TARGET_LUFS = -20.0
+
+# Never push the sample peak above this level (dBFS)
+PEAK_LIMIT_DB = -1.0
+
+# Cap on the gain applied to quiet material
+MAX_GAIN_DB = 24.0
+
+# BS.1770 gating: 400 ms blocks, 75 % overlap → 100 ms hop
+GATE_BLOCK_SEC = 0.4
+GATE_HOP_SEC = 0.1
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+
+# Gating-block histogram for the relative gate: 0.01 LU bins above the
+# absolute gate (blocks louder than the top bin land in it)
+HISTOGRAM_STEP_LU = 0.01
+HISTOGRAM_TOP_LUFS = 10.0
+
+# Samples touched per in-place gain step
+GAIN_BLOCK_SAMPLES = 1 << 16
+
 
 def normalize_audio(audio: AudioSegment, target_dBFS: float = -20.0) -> AudioSegment:
 
@@ -15,4 +42,276 @@ def normalize_audio(audio: AudioSegment, target_dBFS: float = -20.0) -> AudioSeg
 
     change_in_dBFS = target_dBFS - audio.dBFS
 
-    return audio.apply_gain(change_in_dBFS)
\ No newline at end of file
+    return audio.apply_gain(change_in_dBFS)
+
+
+def k_weighting_sos(sample_rate: int) -> np.ndarray:
+    """Second-order sections of the BS.1770 K-weighting filter.
+
+    Stage 1 is the +4 dB high shelf (head effect), stage 2 the
+    38 Hz high-pass (RLB curve), both designed for sample_rate.
+    """
+
+    # Stage 1: high shelf, fc = 1500 Hz, G = +4 dB, Q = 1/sqrt(2)
+    A = 10 ** (4.0 / 40)
+    w0 = 2 * math.pi * 1500.0 / sample_rate
+    alpha = math.sin(w0) / (2 * (1 / math.sqrt(2)))
+    cos_w0 = math.cos(w0)
+    sqrt_a = math.sqrt(A)
+
+    shelf = [
+        A * ((A + 1) + (A - 1) * cos_w0 + 2 * sqrt_a * alpha),
+        -2 * A * ((A - 1) + (A + 1) * cos_w0),
+        A * ((A + 1) + (A - 1) * cos_w0 - 2 * sqrt_a * alpha),
+        (A + 1) - (A - 1) * cos_w0 + 2 * sqrt_a * alpha,
+        2 * ((A - 1) - (A + 1) * cos_w0),
+        (A + 1) - (A - 1) * cos_w0 - 2 * sqrt_a * alpha,
+    ]
+
+    # Stage 2: high-pass, fc = 38 Hz, Q = 0.5
+    w0 = 2 * math.pi * 38.0 / sample_rate
+    alpha = math.sin(w0) / (2 * 0.5)
+    cos_w0 = math.cos(w0)
+
+    highpass = [
+        (1 + cos_w0) / 2,
+        -(1 + cos_w0),
+        (1 + cos_w0) / 2,
+        1 + alpha,
+        -2 * cos_w0,
+        1 - alpha,
+    ]
+
+    sos = np.array([shelf, highpass], dtype=np.float64)
+    sos[:, :3] /= sos[:, 3:4]
+    sos[:, 3:] /= sos[:, 3:4]
+
+    return sos
+
+
+def _power_to_lufs(power):
+    with np.errstate(divide="ignore"):
+        return -0.691 + 10 * np.log10(power)
+
+
+class LoudnessMeter:
+    """Streaming BS.1770 / EBU R128 integrated loudness meter.
+
+    Feed float32 blocks of any size with add(); the K-weighting filter
+    state and the partial 100 ms hop are carried across calls. Each
+    completed hop updates running sums: the last three hop powers for
+    the overlapping 400 ms block, and a per-bin count and power sum of
+    gating blocks for the relative gate. Memory and the cost of
+    integrated_loudness() stay constant however long the stream runs.
+    """
+
+    def __init__(self, sample_rate: int = 16000):
+        self.sample_rate = sample_rate
+        self.hop = int(round(GATE_HOP_SEC * sample_rate))
+        self.hops_per_block = int(round(GATE_BLOCK_SEC / GATE_HOP_SEC))
+
+        self._sos = k_weighting_sos(sample_rate)
+        self._zi = np.zeros((self._sos.shape[0], 2))
+        self._pending = np.zeros(0, dtype=np.float64)
+
+        # Last hops_per_block hop powers (ring buffer) and their sum
+        self._window = np.zeros(self.hops_per_block, dtype=np.float64)
+        self._window_sum = 0.0
+        self.hops = 0
+        self._hop_power_total = 0.0
+
+        n_bins = int(round((HISTOGRAM_TOP_LUFS - ABSOLUTE_GATE_LUFS) / HISTOGRAM_STEP_LU))
+        self._bin_counts = np.zeros(n_bins, dtype=np.int64)
+        self._bin_powers = np.zeros(n_bins, dtype=np.float64)
+        self._bin_centres = ABSOLUTE_GATE_LUFS + (np.arange(n_bins) + 0.5) * HISTOGRAM_STEP_LU
+        self._gated_count = 0
+        self._gated_power = 0.0
+
+        self._loudness = None
+        self._loudness_hops = -1
+
+        self.peak = 0.0
+        self.samples_seen = 0
+
+    def add(self, samples: np.ndarray) -> None:
+        from scipy.signal import sosfilt
+
+        if samples.size == 0:
+            return
+
+        self.peak = max(self.peak, float(np.max(np.abs(samples))))
+        self.samples_seen += samples.size
+
+        weighted, self._zi = sosfilt(self._sos, samples, zi=self._zi)
+        if self._pending.size:
+            weighted = np.concatenate([self._pending, weighted])
+
+        full = (weighted.size // self.hop) * self.hop
+        if full:
+            hops = weighted[:full].reshape(-1, self.hop)
+            for power in np.einsum("ij,ij->i", hops, hops) / self.hop:
+                self._add_hop(float(power))
+        self._pending = weighted[full:]
+
+    def _add_hop(self, power: float) -> None:
+        slot = self.hops % self.hops_per_block
+        self._window_sum += power - self._window[slot]
+        self._window[slot] = power
+        self.hops += 1
+        self._hop_power_total += power
+
+        if self.hops < self.hops_per_block:
+            return
+
+        block = max(self._window_sum, 0.0) / self.hops_per_block
+        loudness = float(_power_to_lufs(block))
+        if loudness <= ABSOLUTE_GATE_LUFS:
+            return
+
+        index = min(int((loudness - ABSOLUTE_GATE_LUFS) / HISTOGRAM_STEP_LU), self._bin_counts.size - 1)
+        self._bin_counts[index] += 1
+        self._bin_powers[index] += block
+        self._gated_count += 1
+        self._gated_power += block
+
+    def integrated_loudness(self) -> float:
+        """Gated integrated loudness in LUFS (-inf for silence).
+
+        Cached per completed hop; the relative gate resolves to the
+        histogram's 0.01 LU bins.
+        """
+
+        if self.hops < self.hops_per_block:
+            # Shorter than one gating block: one ungated block over what we have
+            tail = self._pending
+            total = self._hop_power_total * self.hop + float(np.dot(tail, tail))
+            count = self.hops * self.hop + tail.size
+            loudness = float(_power_to_lufs(total / count)) if count and total > 0.0 else float("-inf")
+            return loudness if loudness > ABSOLUTE_GATE_LUFS else float("-inf")
+
+        if self._loudness_hops != self.hops:
+            self._loudness_hops = self.hops
+            self._loudness = float("-inf")
+
+            if self._gated_count:
+                relative_gate = _power_to_lufs(self._gated_power / self._gated_count) + RELATIVE_GATE_LU
+                above = self._bin_centres > relative_gate
+                count = int(self._bin_counts[above].sum())
+                if count:
+                    self._loudness = float(_power_to_lufs(self._bin_powers[above].sum() / count))
+
+        return self._loudness
+
+    def gain_db(self, target_lufs: float = TARGET_LUFS) -> float:
+        """Gain reaching target_lufs without pushing the peak past PEAK_LIMIT_DB."""
+
+        loudness = self.integrated_loudness()
+        if not math.isfinite(loudness) or self.peak <= 0.0:
+            return 0.0
+
+        headroom = PEAK_LIMIT_DB - 20 * math.log10(self.peak)
+        return min(target_lufs - loudness, headroom, MAX_GAIN_DB)
+
+
+def _meter_for(samples: np.ndarray, sample_rate: int) -> LoudnessMeter:
+    meter = LoudnessMeter(sample_rate)
+    for start in range(0, samples.size, GAIN_BLOCK_SAMPLES):
+        meter.add(samples[start:start + GAIN_BLOCK_SAMPLES])
+    return meter
+
+
+def measure_loudness(samples: np.ndarray, sample_rate: int = 16000) -> float:
+    """Integrated loudness (LUFS) of a mono float array."""
+
+    return _meter_for(samples, sample_rate).integrated_loudness()
+
+
+def apply_gain(samples: np.ndarray, gain_db: float, block_size: int = GAIN_BLOCK_SAMPLES) -> np.ndarray:
+    """Scale a float array in place, block by block, clipping to [-1, 1]."""
+
+    if gain_db == 0.0:
+        return samples
+
+    factor = samples.dtype.type(10 ** (gain_db / 20))
+    for start in range(0, samples.size, block_size):
+        block = samples[start:start + block_size]
+        block *= factor
+        np.clip(block, -1.0, 1.0, out=block)
+
+    return samples
+
+
+def normalize_loudness(
+    samples: np.ndarray,
+    sample_rate: int = 16000,
+    target_lufs: float = TARGET_LUFS
+) -> Tuple[np.ndarray, float]:
+    """Normalize a mono float32 array in place to target_lufs.
+
+    Loudness is gated (BS.1770), so long silences don't inflate the
+    gain. Returns (samples, applied gain in dB).
+    """
+
+    gain = _meter_for(samples, sample_rate).gain_db(target_lufs)
+    apply_gain(samples, gain)
+
+    return samples, gain
+
+
+def normalize_segments(
+    samples: np.ndarray,
+    sample_rate: int = 16000,
+    bounds: Optional[Iterable[Tuple[int, int]]] = None,
+    segment_sec: float = 20.0,
+    target_lufs: float = TARGET_LUFS
+) -> list:
+    """Normalize each segment of a float array in place independently.
+
+    bounds are (start, end) sample indices; by default the array is cut
+    into segment_sec pieces. Evens out speakers recorded at different
+    levels. Returns the gain (dB) applied to each segment.
+    """
+
+    if bounds is None:
+        step = int(segment_sec * sample_rate)
+        bounds = [(start, min(start + step, samples.size)) for start in range(0, samples.size, step)]
+
+    gains = []
+    for start, end in bounds:
+        _, gain = normalize_loudness(samples[start:end], sample_rate, target_lufs)
+        gains.append(gain)
+
+    return gains
+
+
+class StreamingNormalizer:
+    """Loudness normalization for a live stream of float32 blocks.
+
+    Each block updates the running meter and is then scaled in place
+    with the gain derived from everything heard so far; the target gain
+    is recomputed only when a 100 ms hop completes or the peak rises.
+    The gain moves by at most max_step_db per block so level changes
+    stay inaudible.
+    """
+
+    def __init__(self, sample_rate: int = 16000, target_lufs: float = TARGET_LUFS, max_step_db: float = 1.0):
+        self.meter = LoudnessMeter(sample_rate)
+        self.target_lufs = target_lufs
+        self.max_step_db = max_step_db
+        self.gain = 0.0
+        self._wanted = 0.0
+        self._measured = (-1, 0.0)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        self.meter.add(block)
+
+        measured = (self.meter.hops, self.meter.peak)
+        if measured != self._measured:
+            self._measured = measured
+            self._wanted = self.meter.gain_db(self.target_lufs)
+
+        wanted = self._wanted
+        step = max(-self.max_step_db, min(self.max_step_db, wanted - self.gain))
+        self.gain += step
+
+        return apply_gain(block, self.gain)
@@ -1,22 +1,126 @@
 import numpy as np
-import librosa
-import noisereduce as nr
 import soundfile as sf
 
+from audio_preprocessing.resampler import load_wav_16k
+from monitoring.profiler import profile_stage
+
+# Above this SNR (dB) the recording is clean enough to skip denoising
+SKIP_SNR_DB = 30.0
+
+# Between LIGHT and SKIP only a light reduction is applied
+LIGHT_SNR_DB = 18.0
+
+PROP_DECREASE = {"light": 0.5, "full": 0.8}
+
+# Energy frames used for the SNR estimate and the noise profile
+FRAME_SEC = 0.03
+
+# Frames within this many dB of the quietest ones count as non-speech
+NOISE_MARGIN_DB = 6.0
+
+# Longest noise sample fed to noisereduce as y_noise
+MAX_NOISE_SEC = 10.0
+
+
+def _frame_energies_db(audio: np.ndarray, frame_len: int) -> np.ndarray:
+    n_frames = len(audio) // frame_len
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+    power = np.einsum("ij,ij->i", frames, frames) / frame_len
+
+    return 10 * np.log10(power + 1e-12)
+
+
+def estimate_snr(audio: np.ndarray, sample_rate: int = 16000) -> dict:
+    """
+    Cheap SNR estimate from frame energies.
+
+    The quietest frames (leading silence and pauses between speech) give
+    the noise floor; the loud frames give the speech level. Returns
+    {"snr_db", "noise_mask"}, where noise_mask flags the non-speech frames.
+    """
+    frame_len = int(FRAME_SEC * sample_rate)
+    energies = _frame_energies_db(audio, frame_len)
+
+    if energies.size == 0:
+        return {"snr_db": float("inf"), "noise_mask": np.zeros(0, dtype=bool), "frame_len": frame_len}
+
+    noise_floor = np.percentile(energies, 10)
+    speech_level = np.percentile(energies, 90)
+    noise_mask = energies <= noise_floor + NOISE_MARGIN_DB
+
+    return {
+        "snr_db": float(speech_level - np.mean(energies[noise_mask])),
+        "noise_mask": noise_mask,
+        "frame_len": frame_len,
+    }
+
+
+def learn_noise_profile(audio: np.ndarray, noise_mask: np.ndarray, frame_len: int, sample_rate: int = 16000) -> np.ndarray:
+    """
+    Concatenate the non-speech frames (capped at MAX_NOISE_SEC) as the
+    stationary noise sample for noisereduce.
+    """
+    frames = np.flatnonzero(noise_mask)[:int(MAX_NOISE_SEC * sample_rate / frame_len)]
+    if frames.size == 0:
+        return np.zeros(0, dtype=audio.dtype)
+
+    starts = frames * frame_len
+    return audio[starts[:, None] + np.arange(frame_len)].ravel()
+
+
+def choose_noise_path(snr_db: float) -> str:
+    if snr_db >= SKIP_SNR_DB:
+        return "skip"
+    if snr_db >= LIGHT_SNR_DB:
+        return "light"
+    return "full"
+
+
+@profile_stage("reduce_noise")
+def reduce_noise_array(audio: np.ndarray, sample_rate: int = 16000) -> tuple:
+    """
+    Adaptive noise reduction on 16 kHz float32 samples.
+
+    Clean audio is returned untouched; otherwise noisereduce runs in
+    stationary mode against a noise profile learned once from the
+    recording's own non-speech frames. Returns (audio, info) where info
+    records {"path", "snr_db", "noise_seconds"}.
+    """
+    estimate = estimate_snr(audio, sample_rate)
+    path = choose_noise_path(estimate["snr_db"])
+    info = {"path": path, "snr_db": round(estimate["snr_db"], 2), "noise_seconds": 0.0}
+
+    if path == "skip":
+        return audio, info
+
+    import noisereduce as nr
+
+    noise = learn_noise_profile(audio, estimate["noise_mask"], estimate["frame_len"], sample_rate)
+    info["noise_seconds"] = len(noise) / sample_rate
+
+    reduced = nr.reduce_noise(
+        y=audio,
+        sr=sample_rate,
+        y_noise=noise if noise.size else None,
+        stationary=True,
+        prop_decrease=PROP_DECREASE[path]
+    )
+
+    return reduced.astype(np.float32, copy=False), info
+
+
 def reduce_noise(
     wav_path: str,
     output_path: str,
     sample_rate: int = 16000
-) -> None:
+) -> dict:
     """
     Perform noise reduction on WAV audio.
     """
-    audio, sr = librosa.load(wav_path, sr=sample_rate, mono=True)
+    audio, sr = load_wav_16k(wav_path, sample_rate)
 
-    reduced_noise = nr.reduce_noise(
-        y=audio,
-        sr=sr,
-        prop_decrease=0.8
-    )
+    reduced_noise, info = reduce_noise_array(audio, sr)
 
     sf.write(output_path, reduced_noise, sr)
+
+    return info
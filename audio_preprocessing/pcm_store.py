@@ -0,0 +1,140 @@
+import glob
+import os
+import threading
+import uuid
+
+import numpy as np
+
+from audio_preprocessing.resampler import TARGET_SAMPLE_RATE
+
+# pcm-<id>.npy: one file per job, so concurrent jobs sharing a chunks
+# directory never truncate (or re-map) each other's signal
+PCM_FILENAME_PATTERN = "pcm-*.npy"
+
+# Per-process cache of open memory maps, keyed by file path
+_maps = {}
+_lock = threading.Lock()
+
+
+def open_pcm(path: str) -> np.ndarray:
+    """
+    Read-only memory map of a PCM .npy file, opened once per process.
+
+    Every view into the same file shares the OS page cache, so worker
+    processes never copy or re-decode the signal.
+    """
+    pcm = _maps.get(path)
+
+    if pcm is None:
+        with _lock:
+            pcm = _maps.get(path)
+            if pcm is None:
+                pcm = np.load(path, mmap_mode="r")
+                _maps[path] = pcm
+
+    return pcm
+
+
+def release_pcm(path: str, delete: bool = False) -> None:
+    """
+    Drop this process's map of path (and optionally the file itself).
+    """
+    with _lock:
+        _maps.pop(path, None)
+
+    if delete and os.path.exists(path):
+        os.remove(path)
+
+
+def new_pcm_path(directory: str) -> str:
+    """
+    Unique PCM file path for a new job in directory.
+    """
+    return os.path.join(directory, PCM_FILENAME_PATTERN.replace("*", uuid.uuid4().hex[:12]))
+
+
+def release_chunk_pcm(chunks) -> None:
+    """
+    Unmap and delete the PCM files behind a job's chunks, once nothing
+    reads their audio any more (after diarization).
+    """
+    for path in {chunk.get("pcm_path") for chunk in chunks} - {None}:
+        release_pcm(path, delete=True)
+
+
+def release_pcm_dir(directory: str) -> None:
+    """
+    Unmap and delete every PCM file in directory (cleanup after a failed
+    job, whose chunks may never have been returned).
+    """
+    for path in glob.glob(os.path.join(directory, "**", PCM_FILENAME_PATTERN), recursive=True):
+        release_pcm(path, delete=True)
+
+
+class PcmView:
+    """
+    (path, offset, length) window into a memory-mapped PCM file.
+
+    Only the path and two integers are pickled, so views are cheap to
+    send to worker processes; .samples maps the file on first access.
+    """
+
+    __slots__ = ("path", "offset", "length", "sample_rate")
+
+    def __init__(self, path: str, offset: int, length: int, sample_rate: int = TARGET_SAMPLE_RATE):
+        self.path = path
+        self.offset = int(offset)
+        self.length = int(length)
+        self.sample_rate = sample_rate
+
+    def __getstate__(self):
+        return (self.path, self.offset, self.length, self.sample_rate)
+
+    def __setstate__(self, state):
+        self.path, self.offset, self.length, self.sample_rate = state
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"PcmView({self.path!r}, offset={self.offset}, length={self.length})"
+
+    @property
+    def samples(self) -> np.ndarray:
+        """Read-only float32 samples, a slice of the shared map (no copy)."""
+        return open_pcm(self.path)[self.offset:self.offset + self.length]
+
+    @property
+    def duration(self) -> float:
+        return self.length / self.sample_rate
+
+    def slice(self, start: int, length: int) -> "PcmView":
+        """Sub-view, start and length in samples relative to this view."""
+        start = max(0, min(start, self.length))
+        length = max(0, min(length, self.length - start))
+        return PcmView(self.path, self.offset + start, length, self.sample_rate)
+
+    @classmethod
+    def from_chunk(cls, chunk) -> "PcmView":
+        """View described by a chunk's pcm_path / pcm_offset / pcm_length."""
+        return cls(chunk["pcm_path"], chunk["pcm_offset"], chunk["pcm_length"])
+
+
+def write_pcm(samples: np.ndarray, path: str, sample_rate: int = TARGET_SAMPLE_RATE) -> PcmView:
+    """
+    Persist a job's decoded, denoised signal once as a float32 .npy and
+    return a view over the whole file.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # A stale map of a previous job's file must not be reused
+    release_pcm(path)
+
+    pcm = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(len(samples),))
+    pcm[:] = samples
+    pcm.flush()
+    del pcm
+
+    return PcmView(path, 0, len(samples), sample_rate)
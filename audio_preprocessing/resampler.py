@@ -0,0 +1,94 @@
+from typing import Tuple
+
+import numpy as np
+
+# Every model in the pipeline (Whisper, Resemblyzer, language profiles) runs at 16 kHz
+TARGET_SAMPLE_RATE = 16000
+
+# soxr quality recipe: "QQ", "LQ", "MQ", "HQ" or "VHQ"
+RESAMPLE_QUALITY = "HQ"
+
+
+def to_mono_float32(samples: np.ndarray) -> np.ndarray:
+    """
+    Float32 mono in [-1, 1] from int or float PCM, (frames,) or (frames, channels).
+    """
+    if np.issubdtype(samples.dtype, np.integer):
+        scale = float(np.iinfo(samples.dtype).max) + 1.0
+        samples = samples.astype(np.float32) / scale
+    elif samples.dtype != np.float32:
+        samples = samples.astype(np.float32)
+
+    if samples.ndim == 2:
+        samples = samples[:, 0] if samples.shape[1] == 1 else samples.mean(axis=1, dtype=np.float32)
+
+    return samples
+
+
+def resample(
+    samples: np.ndarray,
+    orig_sr: int,
+    target_sr: int = TARGET_SAMPLE_RATE,
+    quality: str = RESAMPLE_QUALITY
+) -> np.ndarray:
+    """
+    Resample a whole buffer with soxr; returns float32 mono.
+
+    When the rate already matches, the (mono, float32) input is returned
+    without a copy.
+    """
+    samples = to_mono_float32(samples)
+
+    if orig_sr == target_sr:
+        return samples
+
+    import soxr
+    return soxr.resample(samples, orig_sr, target_sr, quality=quality)
+
+
+class StreamingResampler:
+    """
+    Chunked soxr resampling with the filter state carried across calls.
+
+    Feed blocks of any size to process(); call flush() (or pass
+    last=True) at the end of the stream to drain the filter delay.
+    """
+
+    def __init__(
+        self,
+        orig_sr: int,
+        target_sr: int = TARGET_SAMPLE_RATE,
+        quality: str = RESAMPLE_QUALITY
+    ):
+        self.orig_sr = orig_sr
+        self.target_sr = target_sr
+        self._stream = None
+
+        if orig_sr != target_sr:
+            import soxr
+            self._stream = soxr.ResampleStream(orig_sr, target_sr, 1, dtype="float32", quality=quality)
+
+    def process(self, block: np.ndarray, last: bool = False) -> np.ndarray:
+        block = to_mono_float32(block)
+
+        if self._stream is None:
+            return block
+
+        return self._stream.resample_chunk(block, last=last)
+
+    def flush(self) -> np.ndarray:
+        return self.process(np.zeros(0, dtype=np.float32), last=True)
+
+
+def load_wav_16k(path: str, target_sr: int = TARGET_SAMPLE_RATE) -> Tuple[np.ndarray, int]:
+    """
+    Read a WAV/FLAC file with soundfile as float32 mono at target_sr.
+
+    Files written by the pipeline are already 16 kHz, so this is a
+    plain read; anything else is resampled once, here.
+    """
+    import soundfile as sf
+
+    samples, sr = sf.read(path, dtype="float32", always_2d=True)
+
+    return resample(samples, sr, target_sr), target_sr
@@ -0,0 +1,98 @@
+"""
+Measure process start-up cost: wall time and peak RSS of importing each
+entry point and pipeline module in a fresh interpreter, plus the heaviest
+modules pulled in along the way (from ``python -X importtime``).
+
+Usage:
+    python benchmarks/bench_import_time.py [module ...]
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "main06",
+    "audio_preprocessing.noise_reduction",
+    "language_detection.whisper_lang_detector",
+    "speech_to_text.whisper_asr",
+    "translation.tf_translator",
+    "summarization.summarizer",
+    "speaker_diarization.diarization_engine",
+    "business_intelligence.key_points_extractor",
+]
+
+HEAVY_PACKAGES = (
+    "torch", "tensorflow", "transformers", "whisper", "resemblyzer",
+    "sklearn", "librosa", "openai",
+)
+
+PROBE = """
+import importlib, json, sys, time
+try:
+    import resource
+except ImportError:
+    resource = None
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+heavy = sorted(p for p in sys.argv[2].split(",") if p in sys.modules)
+print(json.dumps({"seconds": elapsed, "max_rss_kb": rss, "heavy": heavy}))
+"""
+
+
+def measure(module: str) -> dict:
+    import json
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE, module, ",".join(HEAVY_PACKAGES)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True
+    )
+
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr else "failed"}
+
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    # importtime lines: "import time: self [us] | cumulative | imported package"
+    top_level = []
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not line.startswith("import time:"):
+            continue
+        name = parts[2].rstrip()
+        if name.startswith(" ") and not name.startswith("  "):
+            try:
+                top_level.append((int(parts[1]), name.strip()))
+            except ValueError:
+                continue
+
+    result["slowest"] = sorted(top_level, reverse=True)[:5]
+    return result
+
+
+def main():
+    modules = sys.argv[1:] or DEFAULT_MODULES
+
+    print(f"{'module':45s} {'seconds':>8s} {'max RSS MB':>11s}  heavy imports")
+    for module in modules:
+        result = measure(module)
+
+        if "error" in result:
+            print(f"{module:45s} ERROR: {result['error']}")
+            continue
+
+        rss_mb = result["max_rss_kb"] / 1024
+        heavy = ", ".join(result["heavy"]) or "-"
+        print(f"{module:45s} {result['seconds']:8.3f} {rss_mb:11.1f}  {heavy}")
+
+        for micros, name in result["slowest"]:
+            print(f"    {micros / 1e6:8.3f}s  {name}")
+
+
+if __name__ == "__main__":
+    main()
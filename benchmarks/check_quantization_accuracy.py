@@ -0,0 +1,176 @@
+"""
+Compare int8 dynamic-quantized models against fp32 on the sample files.
+
+For every sample the script transcribes with both Whisper variants,
+translates the fp32 transcript with both NLLB variants and summarizes it
+with both BART variants, then reports word error rate between the two
+outputs, wall time and serialized model size.
+
+Usage:
+    python benchmarks/check_quantization_accuracy.py [audio ...]
+        [--max-wer 0.15] [--target hin_Deva] [--skip-summary]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from speech_to_text.whisper_model import MODEL_NAME, load_whisper_model  # noqa: E402
+from utils.quantization import model_size_bytes  # noqa: E402
+
+TRANSLATION_MODEL = "facebook/nllb-200-distilled-600M"
+SUMMARIZATION_MODEL = "facebook/bart-large-cnn"
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    # Single-row Levenshtein distance over words
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, start=1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, start=1):
+            prev, row[j] = row[j], min(
+                row[j] + 1,
+                row[j - 1] + 1,
+                prev + (r != h)
+            )
+
+    return row[-1] / len(ref)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def generate(model, tokenizer, text, encode=None, **kwargs):
+    import torch
+
+    if encode is None:
+        inputs = tokenizer(text, return_tensors="pt", truncation=True, max_length=1024)
+    else:
+        inputs = encode(text)
+    with torch.no_grad():
+        output = model.generate(**inputs, **kwargs)
+    return tokenizer.decode(output[0], skip_special_tokens=True)
+
+
+def report(name, fp32_model, int8_model, pairs):
+    fp32_mb = model_size_bytes(fp32_model) / 2 ** 20
+    int8_mb = model_size_bytes(int8_model) / 2 ** 20
+
+    print(f"\n== {name}: {fp32_mb:.0f} MB fp32 -> {int8_mb:.0f} MB int8 ({fp32_mb / int8_mb:.1f}x)")
+
+    wers = []
+    fp32_time = int8_time = 0.0
+    for label, (ref, t_ref), (hyp, t_hyp) in pairs:
+        wer = word_error_rate(ref, hyp)
+        wers.append(wer)
+        fp32_time += t_ref
+        int8_time += t_hyp
+        print(f"  {label:30s} WER vs fp32 {wer:6.3f}   {t_ref:7.2f}s -> {t_hyp:7.2f}s")
+
+    mean_wer = sum(wers) / len(wers) if wers else 0.0
+    speedup = fp32_time / int8_time if int8_time else 0.0
+    print(f"  mean WER {mean_wer:.3f}, speed-up {speedup:.2f}x")
+
+    return mean_wer
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("audio", nargs="*")
+    parser.add_argument("--max-wer", type=float, default=0.15)
+    parser.add_argument("--target", default="hin_Deva")
+    parser.add_argument("--skip-summary", action="store_true")
+    args = parser.parse_args()
+
+    audio_files = args.audio or sorted(glob.glob(os.path.join(ROOT, "*.aac")))
+
+    from transformers import AutoTokenizer
+    from main06 import NLLB_LANG_MAP
+    from summarization import torch_summarizer
+    from translation import tf_translator
+
+    # ---------- Whisper ----------
+    fp32_whisper = load_whisper_model(quantize=False)
+    int8_whisper = load_whisper_model(quantize=True)
+
+    asr_pairs = []
+    transcripts = []
+    for path in audio_files:
+        ref, t_ref = timed(fp32_whisper.transcribe, path, fp16=False)
+        hyp, t_hyp = timed(int8_whisper.transcribe, path, fp16=False, language=ref["language"])
+        asr_pairs.append((os.path.basename(path), (ref["text"], t_ref), (hyp["text"], t_hyp)))
+        transcripts.append((os.path.basename(path), ref["text"], ref["language"]))
+
+    results = {f"whisper-{MODEL_NAME}": report(f"Whisper {MODEL_NAME}", fp32_whisper, int8_whisper, asr_pairs)}
+    del fp32_whisper, int8_whisper
+
+    # ---------- NLLB ----------
+    # Same source-language encoding and generate() settings as translate_batch
+    tokenizer = tf_translator.load_tokenizer(TRANSLATION_MODEL, cache_dir=tf_translator.HF_CACHE_DIR)
+    fp32_nllb = tf_translator.load_model(TRANSLATION_MODEL, quantize=False)
+    int8_nllb = tf_translator.load_model(TRANSLATION_MODEL, quantize=True)
+    target_id = tokenizer.convert_tokens_to_ids(args.target)
+
+    mt_pairs = []
+    for label, text, language in transcripts:
+        src_lang = NLLB_LANG_MAP.get(language)
+        if not text.strip() or src_lang is None or src_lang == args.target:
+            continue
+
+        def encode(text, src_lang=src_lang):
+            return tf_translator.encode_with_src_lang(
+                tokenizer, text, src_lang, return_tensors="pt", **tf_translator.ENCODE_KWARGS
+            )
+
+        kwargs = {"encode": encode, "forced_bos_token_id": target_id, **tf_translator.GENERATE_KWARGS}
+        mt_pairs.append((
+            label,
+            timed(generate, fp32_nllb, tokenizer, text, **kwargs),
+            timed(generate, int8_nllb, tokenizer, text, **kwargs),
+        ))
+
+    results["nllb"] = report("NLLB", fp32_nllb, int8_nllb, mt_pairs)
+    del fp32_nllb, int8_nllb
+
+    # ---------- BART ----------
+    if not args.skip_summary:
+        tokenizer = AutoTokenizer.from_pretrained(SUMMARIZATION_MODEL, cache_dir=torch_summarizer.HF_CACHE_DIR)
+        fp32_bart = torch_summarizer.load_model(SUMMARIZATION_MODEL, quantize=False)
+        int8_bart = torch_summarizer.load_model(SUMMARIZATION_MODEL, quantize=True)
+
+        kwargs = {"max_length": 150, "min_length": 40, "num_beams": 4, "length_penalty": 2.0, "early_stopping": True}
+        sum_pairs = []
+        for label, text, language in transcripts:
+            if language != "en" or not text.strip():
+                continue  # BART-large-cnn is English-only
+            sum_pairs.append((
+                label,
+                timed(generate, fp32_bart, tokenizer, text, **kwargs),
+                timed(generate, int8_bart, tokenizer, text, **kwargs),
+            ))
+
+        results["bart"] = report("BART", fp32_bart, int8_bart, sum_pairs)
+
+    failed = {name: wer for name, wer in results.items() if wer > args.max_wer}
+    if failed:
+        print(f"\nFAILED: mean WER above {args.max_wer}: {failed}")
+        sys.exit(1)
+
+    print(f"\nOK: all models within WER {args.max_wer} of fp32")
+
+
+if __name__ == "__main__":
+    main()
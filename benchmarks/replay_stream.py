@@ -0,0 +1,99 @@
+"""
+Replay recordings through the live streaming ingest at real-time speed
+and report per-utterance latency (VAD close → update pushed).
+
+Usage:
+    python benchmarks/replay_stream.py [audio ...]
+        [--speed 1.0] [--frame-ms 20] [--target-latency 3.0]
+        [--target hi] [--decoding-profile fast]
+
+Exits non-zero when the p95 latency misses --target-latency.
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from audio_preprocessing.audio_loader import load_audio_array  # noqa: E402
+from streaming.session import StreamingSession  # noqa: E402
+from streaming.vad import SAMPLE_RATE  # noqa: E402
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def replay(path: str, speed: float, frame_ms: int, target_language: str, decoding_profile: str) -> list:
+    samples = load_audio_array(path, SAMPLE_RATE)
+    frame_len = SAMPLE_RATE * frame_ms // 1000
+
+    session = StreamingSession(target_language=target_language, decoding_profile=decoding_profile)
+
+    def show(update):
+        if update["type"] == "utterance":
+            chunk = update["chunk"]
+            print(
+                f"  [{chunk['start_time']:7.2f}s] {chunk['speaker_id']} ({chunk['detected_language']}) "
+                f"{update['latency_sec']:.2f}s → {chunk['translated_text']}"
+            )
+        elif update["type"] == "error":
+            print(f"  ⚠️ utterance {update['utterance']}: {update['error']}")
+
+    session.subscribe(show)
+
+    # Pace frames against the wall clock, not cumulative sleeps
+    started = time.monotonic()
+    for n, start in enumerate(range(0, len(samples), frame_len)):
+        due = started + n * frame_ms / 1000 / speed
+        delay = due - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        session.push_pcm(samples[start:start + frame_len])
+
+    session.close()
+    return session.latencies
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Real-time replay through the streaming ingest")
+    parser.add_argument("audio", nargs="*")
+    parser.add_argument("--speed", type=float, default=1.0, help="1.0 = real time")
+    parser.add_argument("--frame-ms", type=int, default=20)
+    parser.add_argument("--target-latency", type=float, default=3.0, help="p95 budget in seconds")
+    parser.add_argument("--target", default=None, help="Output language code (default: main06.TARGET_LANGUAGE)")
+    parser.add_argument("--decoding-profile", default="fast")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_args()
+    files = args.audio or sorted(glob.glob(os.path.join(ROOT, "*.aac")))
+
+    all_latencies = []
+    for path in files:
+        print(f"\n▶️ Replaying {os.path.basename(path)} at {args.speed}x")
+        latencies = replay(path, args.speed, args.frame_ms, args.target, args.decoding_profile)
+        all_latencies.extend(latencies)
+
+        if latencies:
+            print(
+                f"  {len(latencies)} utterances, latency p50 {statistics.median(latencies):.2f}s, "
+                f"p95 {percentile(latencies, 0.95):.2f}s, max {max(latencies):.2f}s"
+            )
+
+    if not all_latencies:
+        print("\nNo utterances detected")
+        sys.exit(1)
+
+    p95 = percentile(all_latencies, 0.95)
+    ok = p95 <= args.target_latency
+    print(f"\n{'✅' if ok else '❌'} p95 latency {p95:.2f}s (target {args.target_latency:.2f}s)")
+    sys.exit(0 if ok else 1)
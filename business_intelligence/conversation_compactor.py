@@ -0,0 +1,212 @@
+import math
+import re
+
+LLM_MODEL = "gpt-4o-mini"
+
+# Max prompt tokens spent on the transcript itself
+DEFAULT_TOKEN_BUDGET = 6000
+
+# Turns made only of these carry no business content. Only true fillers
+# and acknowledgements: answers such as "yes", "no" or "sure" stay.
+# Per transcript language (en, hi, ta, te, ml, kn), native script plus
+# common romanisations
+BACKCHANNELS_BY_LANGUAGE = {
+    "en": {"yeah", "yep", "yup", "ok", "okay", "hmm", "hm", "mm", "mhm", "uh-huh", "uh", "um", "ah", "oh", "huh"},
+    "hi": {"अच्छा", "ओके", "हम्म", "हूँ", "अं", "achha", "acha", "accha"},
+    "ta": {"சரி", "ஓகே", "ம்ம்", "seri", "sari"},
+    "te": {"సరే", "ఓకే", "ఊ", "sare"},
+    "ml": {"ശരി", "ഓകെ", "ഉം", "shari"},
+    "kn": {"ಸರಿ", "ಓಕೆ", "ಹೂಂ"},
+}
+BACKCHANNELS = set().union(*BACKCHANNELS_BY_LANGUAGE.values())
+
+# Hesitations removed from inside turns
+FILLER_WORDS = {"um", "uh", "erm", "er", "hmm", "hm", "mm", "mhm", "हम्म", "ம்ம்"}
+
+# Turns mentioning these are kept first when trimming to the budget.
+# Whole words, except a trailing "*" (stem: "decid*" → decide, decided)
+IMPORTANT_TERMS_BY_LANGUAGE = {
+    "en": (
+        "decid*", "decision*", "agree*", "approv*", "action*", "deadline*", "budget*",
+        "cost*", "price*", "pricing", "deliver*", "launch*", "plan", "plans", "planned",
+        "planning", "risk*", "issue*", "problem*", "next step*", "follow up", "by monday",
+        "by friday", "will", "must", "need*",
+    ),
+    "hi": (
+        "निर्णय*", "फैसल*", "फ़ैसल*", "सहमत*", "मंजूर*", "मंज़ूर*", "बजट*", "कीमत*", "लागत*",
+        "समय सीमा", "योजना*", "जोखिम*", "समस्या*", "लॉन्च*", "डिलीवरी*", "करेंगे", "ज़रूरी", "जरूरी",
+    ),
+    "ta": (
+        "முடிவ*", "ஒப்புதல்*", "பட்ஜெட்*", "விலை*", "செலவ*", "காலக்கெடு*", "திட்ட*",
+        "ஆபத்த*", "பிரச்சனை*",
+    ),
+    "te": (
+        "నిర్ణయ*", "ఆమోద*", "బడ్జెట్*", "ధర*", "ఖర్చ*", "గడువు*", "ప్రణాళిక*",
+        "ప్రమాద*", "సమస్య*",
+    ),
+    "ml": (
+        "തീരുമാന*", "അംഗീകാര*", "ബജറ്റ്*", "വില*", "ചെലവ*", "സമയപരിധി*", "പദ്ധതി*",
+        "അപകടസാധ്യത*", "പ്രശ്ന*",
+    ),
+    "kn": (
+        "ನಿರ್ಧಾರ*", "ಅನುಮೋದನೆ*", "ಬಜೆಟ್*", "ಬೆಲೆ*", "ವೆಚ್ಚ*", "ಗಡುವು*", "ಯೋಜನೆ*",
+        "ಅಪಾಯ*", "ಸಮಸ್ಯೆ*",
+    ),
+}
+IMPORTANT_TERMS = tuple(term for terms in IMPORTANT_TERMS_BY_LANGUAGE.values() for term in terms)
+
+# Word characters, including the combining vowel signs of Indic scripts
+# (not \w for Python's re)
+_LETTER = r"\w\u0900-\u0D7F"
+
+_TURN_RE = re.compile(r"^(?P<speaker>[^:]{1,40}):\s*(?P<text>.*)$")
+_WORD_RE = re.compile(rf"[^{_LETTER}'-]+", re.UNICODE)
+
+
+def _term_pattern(term: str) -> str:
+    stem = term.endswith("*")
+    pattern = r"\s+".join(re.escape(word) for word in term.rstrip("*").split())
+    return rf"(?<![{_LETTER}]){pattern}" + ("" if stem else rf"(?![{_LETTER}])")
+
+
+_IMPORTANT_RE = re.compile("|".join(_term_pattern(term) for term in IMPORTANT_TERMS), re.IGNORECASE)
+
+_ENCODING = None
+
+
+def _get_encoding():
+    global _ENCODING
+
+    if _ENCODING is None:
+        import tiktoken
+
+        try:
+            _ENCODING = tiktoken.encoding_for_model(LLM_MODEL)
+        except KeyError:
+            _ENCODING = tiktoken.get_encoding("o200k_base")
+
+    return _ENCODING
+
+
+def count_tokens(text: str) -> int:
+    """
+    Prompt tokens for the LLM model, measured with tiktoken.
+    """
+    if not text:
+        return 0
+    return len(_get_encoding().encode(text))
+
+
+def parse_turns(conversation_text: str) -> list:
+    """
+    "Speaker 1: text" lines → [(speaker, text)]; unlabelled lines continue
+    the previous turn.
+    """
+    turns = []
+
+    for line in conversation_text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        match = _TURN_RE.match(line)
+        if match:
+            turns.append([match.group("speaker").strip(), match.group("text").strip()])
+        elif turns:
+            turns[-1][1] += " " + line
+        else:
+            turns.append(["Speaker 1", line])
+
+    return [tuple(t) for t in turns]
+
+
+def _strip_fillers(text: str) -> str:
+    words = [w for w in text.split() if _WORD_RE.sub("", w.lower()) not in FILLER_WORDS]
+    return " ".join(words)
+
+
+def _is_low_content(text: str) -> bool:
+    words = [_WORD_RE.sub("", w.lower()) for w in text.split()]
+    words = [w for w in words if w]
+    return not words or all(w in BACKCHANNELS for w in words)
+
+
+def _importance(text: str, tokens: int) -> float:
+    hits = len(_IMPORTANT_RE.findall(text))
+    return hits * 2.0 + math.log1p(tokens)
+
+
+def compact_conversation(conversation_text: str, token_budget: int = DEFAULT_TOKEN_BUDGET) -> dict:
+    """
+    Shrink a speaker-labelled conversation for the LLM prompt:
+
+    1. speaker labels → short aliases (S1, S2, ...) with a legend line
+    2. filler words removed, backchannel-only turns dropped
+    3. consecutive turns of the same speaker merged
+    4. lowest-importance turns dropped until the text fits token_budget
+
+    Returns the compacted text plus before/after token counts.
+    """
+    tokens_before = count_tokens(conversation_text)
+    turns = parse_turns(conversation_text)
+    turns_before = len(turns)
+
+    # 2️⃣ Drop low-content turns
+    turns = [(speaker, _strip_fillers(text)) for speaker, text in turns]
+    turns = [(speaker, text) for speaker, text in turns if not _is_low_content(text)]
+
+    # 3️⃣ Merge micro-turns of the same speaker
+    merged = []
+    for speaker, text in turns:
+        if merged and merged[-1][0] == speaker:
+            merged[-1] = (speaker, merged[-1][1] + " " + text)
+        else:
+            merged.append((speaker, text))
+
+    # 1️⃣ Speaker legend
+    aliases = {}
+    for speaker, _ in merged:
+        aliases.setdefault(speaker, f"S{len(aliases) + 1}")
+
+    legend = "Speakers: " + ", ".join(f"{alias}={speaker}" for speaker, alias in aliases.items())
+    lines = [f"{aliases[speaker]}: {text}" for speaker, text in merged]
+    line_tokens = [count_tokens(line) + 1 for line in lines]  # + newline
+
+    # 4️⃣ Trim to the budget by importance, keeping conversation order
+    budget = token_budget - count_tokens(legend) - 1
+    keep = set(range(len(lines)))
+
+    if sum(line_tokens) > budget:
+        ranked = sorted(
+            range(len(lines)),
+            key=lambda i: _importance(merged[i][1], line_tokens[i])
+        )
+        total = sum(line_tokens)
+        for i in ranked:
+            if total <= budget:
+                break
+            keep.discard(i)
+            total -= line_tokens[i]
+
+    kept = sorted(keep)
+    kept_lines = [lines[i] for i in kept]
+
+    # Legend of the speakers still present (never longer than the budgeted one)
+    kept_speakers = {merged[i][0] for i in kept}
+    aliases = {speaker: alias for speaker, alias in aliases.items() if speaker in kept_speakers}
+    legend = "Speakers: " + ", ".join(f"{alias}={speaker}" for speaker, alias in aliases.items())
+
+    # A single oversized turn can still exceed the budget: hard-truncate
+    text = "\n".join([legend] + kept_lines) if kept_lines else ""
+    if count_tokens(text) > token_budget:
+        encoding = _get_encoding()
+        text = encoding.decode(encoding.encode(text)[:token_budget])
+
+    return {
+        "text": text,
+        "legend": {alias: speaker for speaker, alias in aliases.items()},
+        "tokens_before": tokens_before,
+        "tokens_after": count_tokens(text),
+        "turns_before": turns_before,
+        "turns_after": len(kept_lines),
+    }
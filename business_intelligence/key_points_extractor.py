@@ -1,4 +1,7 @@
+from business_intelligence.conversation_compactor import DEFAULT_TOKEN_BUDGET, LLM_MODEL, compact_conversation
 from business_intelligence.llm_client import get_llm_client
+from monitoring.metrics import span
+from monitoring.profiler import profile_stage
 
 SYSTEM_PROMPT = """
 You are a senior business analyst.
@@ -29,28 +32,57 @@ Respond strictly in the following JSON format:
 }}
 """
 
-def extract_business_key_points(conversation_text: str):
+@profile_stage("extract_business_key_points")
+def extract_business_key_points(conversation_text: str, token_budget: int = DEFAULT_TOKEN_BUDGET):
+    """
+    Compact the conversation to token_budget prompt tokens, then ask the
+    LLM for structured insights. The result carries a "compaction" entry
+    with the before/after token counts.
+    """
     client = get_llm_client()
     if client is None:
         return None  # LLM not enabled
 
-    prompt = USER_PROMPT_TEMPLATE.format(conversation=conversation_text)
+    with span("llm.compact", token_budget=token_budget) as s:
+        compacted = compact_conversation(conversation_text, token_budget)
+        s["prompt_tokens_before"] = compacted["tokens_before"]
+        s["prompt_tokens_after"] = compacted["tokens_after"]
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": prompt},
-        ],
-        temperature=0.2,
-    )
+    # The compacted text opens with its "Speakers: S1=..." legend line
+    prompt = USER_PROMPT_TEMPLATE.format(conversation=compacted["text"])
+
+    compaction = {
+        "tokens_before": compacted["tokens_before"],
+        "tokens_after": compacted["tokens_after"],
+        "turns_before": compacted["turns_before"],
+        "turns_after": compacted["turns_after"],
+    }
+
+    with span("llm.chat", model=LLM_MODEL) as s:
+        response = client.chat.completions.create(
+            model=LLM_MODEL,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.2,
+        )
+
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            s["tokens_in"] = usage.prompt_tokens
+            s["tokens_out"] = usage.completion_tokens
 
     content = response.choices[0].message.content
 
     try:
         import json
-        return json.loads(content)
+        insights = json.loads(content)
     except Exception:
-        return {
+        insights = {
             "raw_output": content
         }
+
+    if isinstance(insights, dict):
+        insights["compaction"] = compaction
+    return insights
@@ -1,5 +1,4 @@
 import os
-from openai import OpenAI
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -9,5 +8,7 @@ def get_llm_client():
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         return None
+
+    from openai import OpenAI
     return OpenAI(api_key=api_key)
 
@@ -1,7 +1,47 @@
-from typing import List, Dict
+from typing import List, Dict, Union
 
+from conversation_structuring.chunk_store import ChunkStore
 
-def merge_chunks(chunks: List[Dict]) -> List[Dict]:
+
+def _can_merge(current, nxt) -> bool:
+    return (
+        nxt["detected_language"] == current["detected_language"]
+        and nxt["user_output_language"] == current["user_output_language"]
+    )
+
+
+def _extend_pcm(current, nxt) -> None:
+    # Adjacent chunks are contiguous in the job's PCM file
+    if current.get("pcm_path") and current.get("pcm_path") == nxt.get("pcm_path"):
+        current["pcm_length"] = nxt["pcm_offset"] + nxt["pcm_length"] - current["pcm_offset"]
+
+
+def _merge_store(chunks: ChunkStore) -> ChunkStore:
+    """
+    Merge rows of a ChunkStore into a new store sharing its SegmentTable.
+    """
+    merged = ChunkStore(segments=chunks.segments)
+    current = None
+    current_index = -1
+
+    for i, nxt in enumerate(chunks):
+        if current is not None and _can_merge(current, nxt):
+            current["transcript"] += " " + nxt["transcript"]
+            current["translated_text"] += " " + nxt["translated_text"]
+            current["end_time"] = nxt["end_time"]
+            _extend_pcm(current, nxt)
+            merged.extend_segments(current_index, chunks.segment_range(i))
+        else:
+            current = merged.append({
+                key: nxt[key] for key in nxt.keys() if key != "segments"
+            })
+            current_index = len(merged) - 1
+            merged.extend_segments(current_index, chunks.segment_range(i))
+
+    return merged
+
+
+def merge_chunks(chunks: Union[List[Dict], ChunkStore]) -> Union[List[Dict], ChunkStore]:
     """
     Merge adjacent chunks that:
     - have the same detected language
@@ -9,25 +49,28 @@ def merge_chunks(chunks: List[Dict]) -> List[Dict]:
     """
 
     if not chunks:
-        return []
+        return ChunkStore() if isinstance(chunks, ChunkStore) else []
+
+    if isinstance(chunks, ChunkStore):
+        return _merge_store(chunks)
 
     merged = []
     current = chunks[0].copy()
+    current["segments"] = list(current.get("segments", []))
 
     for nxt in chunks[1:]:
-        if (
-            nxt["detected_language"] == current["detected_language"]
-            and nxt["user_output_language"] == current["user_output_language"]
-        ):
+        if _can_merge(current, nxt):
             # Merge text
             current["transcript"] += " " + nxt["transcript"]
             current["translated_text"] += " " + nxt["translated_text"]
+            _extend_pcm(current, nxt)
 
-            # Merge segments
+            # Merge segments (into our own list, never the input's)
             current["segments"].extend(nxt.get("segments", []))
         else:
             merged.append(current)
             current = nxt.copy()
+            current["segments"] = list(current.get("segments", []))
 
     merged.append(current)
     return merged
@@ -0,0 +1,338 @@
+import math
+import sys
+from array import array
+from typing import Iterable, List
+
+# Typed (array-backed) chunk columns; every other field is a list column
+NUMERIC_COLUMNS = {
+    "chunk_id": "i",
+    "start_time": "d",
+    "end_time": "d",
+    "language_confidence": "d",
+    "pcm_offset": "q",
+    "pcm_length": "q",
+}
+
+# Low-cardinality string columns whose values are interned
+INTERNED_COLUMNS = (
+    "detected_language",
+    "user_output_language",
+    "language_tier",
+    "asr_language",
+    "model",
+    "speaker_id",
+    "pcm_path",
+)
+
+SEGMENT_FLOAT_FIELDS = ("start", "end", "avg_logprob", "no_speech_prob", "compression_ratio")
+
+_MISSING = object()
+
+
+class SegmentTable:
+    """
+    Whisper segments of a whole job as parallel columns.
+
+    Only times, quality scores and text are kept; token lists and the
+    other per-segment decoder fields are dropped. A table handed to a
+    second ChunkStore is marked shared: its rows are then never
+    overwritten or compacted away.
+    """
+
+    __slots__ = ("columns", "text", "shared")
+
+    def __init__(self):
+        self.columns = {name: array("d") for name in SEGMENT_FLOAT_FIELDS}
+        self.text = []
+        self.shared = False
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def append(self, segment: dict) -> int:
+        for name, column in self.columns.items():
+            value = segment.get(name)
+            column.append(math.nan if value is None else float(value))
+        self.text.append(segment.get("text", ""))
+
+        return len(self.text) - 1
+
+    def set_row(self, index: int, segment: dict) -> None:
+        for name, column in self.columns.items():
+            value = segment.get(name)
+            column[index] = math.nan if value is None else float(value)
+        self.text[index] = segment.get("text", "")
+
+    def row(self, index: int) -> dict:
+        seg = {name: column[index] for name, column in self.columns.items()}
+        seg["text"] = self.text[index]
+        return seg
+
+
+class ChunkView:
+    """
+    Dict-like handle on one row of a ChunkStore.
+
+    Supports the dict API (chunk["key"], get, keys, items, values, update,
+    setdefault, pop, del, "key" in chunk, iteration and len), so code
+    written against chunk dicts works unchanged. Assigning None stores
+    a missing value, as for a key the dict never had.
+    chunk["segments"] is built from the SegmentTable on every read: the
+    list and its dicts are copies, so edits only take effect when the
+    list is assigned back (chunk["segments"] = segments).
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "ChunkStore", index: int):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._store.get_value(self._index, key)
+
+    def __setitem__(self, key, value):
+        self._store.set_value(self._index, key, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._store.set_value(self._index, key, None)
+
+    def __contains__(self, key) -> bool:
+        return self._store.has_value(self._index, key)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        return self[key]
+
+    def keys(self):
+        return [key for key in self._store.column_names() if key in self]
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def update(self, other=(), **kwargs):
+        pairs = other.items() if hasattr(other, "items") else other
+        for key, value in pairs:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self.get(key)
+
+    def pop(self, key, default=_MISSING):
+        if key not in self:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        value = self[key]
+        del self[key]
+        return value
+
+    def to_dict(self) -> dict:
+        return {key: self[key] for key in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"ChunkView({self.to_dict()!r})"
+
+
+class ChunkStore:
+    """
+    Column-oriented store for a job's chunk records.
+
+    Times, ids and confidences live in typed arrays, repeated strings are
+    interned and segments sit in one shared SegmentTable, referenced by a
+    (start, stop) row range per chunk. Rows are exposed as ChunkView.
+    """
+
+    def __init__(self, segments: SegmentTable = None):
+        self.numeric = {name: array(code) for name, code in NUMERIC_COLUMNS.items()}
+        # Which numeric cells were set (unset ones read as missing, not 0)
+        self.present = {name: bytearray() for name in NUMERIC_COLUMNS}
+        self.objects = {}
+        if segments is not None:
+            segments.shared = True
+        self.segments = segments if segments is not None else SegmentTable()
+        self.seg_start = array("q")
+        self.seg_stop = array("q")
+        self._size = 0
+        # SegmentTable rows no chunk references any more
+        self._dead_segments = 0
+
+    # ---------- construction ----------
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "ChunkStore":
+        store = cls()
+        for record in records:
+            store.append(record)
+        return store
+
+    def append(self, record: dict) -> ChunkView:
+        index = self._size
+        self._size += 1
+
+        for column in self.numeric.values():
+            column.append(0)
+        for flags in self.present.values():
+            flags.append(0)
+        for column in self.objects.values():
+            column.append(None)
+        self.seg_start.append(0)
+        self.seg_stop.append(0)
+
+        view = ChunkView(self, index)
+        for key, value in record.items():
+            view[key] = value
+
+        return view
+
+    # ---------- row access ----------
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ChunkView(self, i) for i in range(*index.indices(self._size))]
+
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("chunk index out of range")
+
+        return ChunkView(self, index)
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield ChunkView(self, i)
+
+    def to_records(self) -> List[dict]:
+        return [view.to_dict() for view in self]
+
+    def column_names(self) -> List[str]:
+        return list(self.numeric) + list(self.objects) + ["segments"]
+
+    # ---------- cell access ----------
+
+    def get_value(self, index: int, key: str):
+        if key == "segments":
+            return [
+                self.segments.row(row)
+                for row in range(self.seg_start[index], self.seg_stop[index])
+            ]
+        if key in self.numeric and self.present[key][index]:
+            return self.numeric[key][index]
+        if key in self.objects and self.objects[key][index] is not None:
+            return self.objects[key][index]
+
+        raise KeyError(key)
+
+    def has_value(self, index: int, key: str) -> bool:
+        if key == "segments":
+            return True
+        if key in self.numeric:
+            return bool(self.present[key][index])
+        return key in self.objects and self.objects[key][index] is not None
+
+    def set_value(self, index: int, key: str, value) -> None:
+        if key == "segments":
+            self.set_segments(index, value or [])
+        elif key in self.numeric:
+            if value is None:
+                self.numeric[key][index] = 0
+                self.present[key][index] = 0
+            else:
+                self.numeric[key][index] = value
+                self.present[key][index] = 1
+        else:
+            if key not in self.objects:
+                self.objects[key] = [None] * self._size
+            if key in INTERNED_COLUMNS and isinstance(value, str):
+                value = sys.intern(value)
+            self.objects[key][index] = value
+
+    def set_segments(self, index: int, segments: Iterable[dict]) -> None:
+        """
+        Replace a chunk's segments: in place when they fit in its current
+        rows, else appended (the old rows are reclaimed by compaction).
+        """
+        segments = list(segments)
+        start, stop = self.seg_start[index], self.seg_stop[index]
+
+        if not self.segments.shared and len(segments) <= stop - start:
+            for offset, seg in enumerate(segments):
+                self.segments.set_row(start + offset, seg)
+            self.seg_stop[index] = start + len(segments)
+            self._dead_segments += stop - start - len(segments)
+        else:
+            new_start = len(self.segments)
+            for seg in segments:
+                self.segments.append(seg)
+            self.seg_start[index] = new_start
+            self.seg_stop[index] = len(self.segments)
+            self._dead_segments += stop - start
+
+        if self._dead_segments * 2 > len(self.segments):
+            self.compact_segments()
+
+    def compact_segments(self) -> None:
+        """
+        Rebuild the SegmentTable with only the rows chunks still
+        reference (no-op for a table shared with another store).
+        """
+        if self.segments.shared or not self._dead_segments:
+            return
+
+        old = self.segments
+        self.segments = SegmentTable()
+        for index in range(self._size):
+            start = len(self.segments)
+            for row in range(self.seg_start[index], self.seg_stop[index]):
+                self.segments.append(old.row(row))
+            self.seg_start[index] = start
+            self.seg_stop[index] = len(self.segments)
+
+        self._dead_segments = 0
+
+    def segment_range(self, index: int) -> range:
+        return range(self.seg_start[index], self.seg_stop[index])
+
+    def extend_segments(self, index: int, rows: range) -> None:
+        """
+        Append existing SegmentTable rows to a chunk's segment range.
+
+        Adjacent ranges are simply widened; otherwise the rows are copied
+        to the end of the table so the chunk's range stays contiguous.
+        """
+        if not rows:
+            return
+
+        if self.seg_stop[index] == rows.start or self.seg_start[index] == self.seg_stop[index]:
+            if self.seg_start[index] == self.seg_stop[index]:
+                self.seg_start[index] = rows.start
+            self.seg_stop[index] = rows.stop
+            return
+
+        current = self.segment_range(index)
+        start = len(self.segments)
+        for row in list(current) + list(rows):
+            self.segments.append(self.segments.row(row))
+
+        self.seg_start[index] = start
+        self.seg_stop[index] = len(self.segments)
+        self._dead_segments += len(current)
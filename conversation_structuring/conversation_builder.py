@@ -1,60 +1,182 @@
+from collections.abc import Sequence
 from typing import List, Dict
 from conversation_structuring.chunk_merger import merge_chunks
 from conversation_structuring.text_cleaner import clean_text
 
 
-def build_conversation(chunks: list[dict]) -> dict:
+class TimelineView(Sequence):
     """
-    Build speaker-aware conversation structure.
+    Read-only view of a builder's timeline: the closed entries plus the
+    open block, without copying the list.
     """
 
-    conversation_lines = []
-    timeline = []
+    def __init__(self, builder: "ConversationBuilder"):
+        self._builder = builder
+
+    def __len__(self) -> int:
+        return len(self._builder._timeline) + (1 if self._builder._has_open_block() else 0)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        closed = self._builder._timeline
+        if index < 0:
+            index += len(self)
+        if index == len(closed) and self._builder._has_open_block():
+            return self._builder._open_entry()
+        if not 0 <= index < len(closed):
+            raise IndexError("timeline index out of range")
+        return closed[index]
 
-    prev_speaker = None
-    buffer_text = []
+    def tail(self, n: int = 1) -> list:
+        return self[max(0, len(self) - n):]
 
-    for idx, chunk in enumerate(chunks):
+
+class ConversationBuilder:
+    """
+    Incremental, append-only conversation builder.
+
+    add_chunk() either extends the open speaker block or closes it and
+    opens a new timeline entry, in O(1). The open block's text is joined
+    only for the parts added since the last read. timeline is a
+    read-only view, and conversation_text is cached and grows by the
+    lines closed since the last read. Each block is tagged with the output
+    language of its own first chunk.
+    """
+
+    def __init__(self):
+        self._lines = []
+        self._timeline = []
+
+        self._speaker = None
+        self._language = None
+        self._buffer = []
+        self._open_text = ""
+        self._open_joined = 0
+        self._view = TimelineView(self)
+
+        # conversation_text: closed lines joined so far, and the full text
+        # cached for one (closed lines, open parts) state
+        self._closed_text = ""
+        self._closed_joined = 0
+        self._text = ""
+        self._text_key = (0, 0)
+
+    def add_chunk(self, chunk) -> None:
         speaker = chunk.get("speaker_id", "Speaker 1")
         text = chunk.get("translated_text", "").strip()
 
         if not text:
-            continue
+            return
 
         # If same speaker, accumulate
-        if speaker == prev_speaker:
-            buffer_text.append(text)
-        else:
-            # Flush previous speaker block
-            if buffer_text and prev_speaker:
-                combined_text = " ".join(buffer_text)
-                conversation_lines.append(f"{prev_speaker}: {combined_text}")
-                timeline.append({
-                    "index": len(timeline),
-                    "speaker": prev_speaker,
-                    "language": chunk.get("user_output_language"),
-                    "text": combined_text
-                })
-
-            # Start new speaker block
-            prev_speaker = speaker
-            buffer_text = [text]
-
-    # Flush last speaker block
-    if buffer_text and prev_speaker:
-        combined_text = " ".join(buffer_text)
-        conversation_lines.append(f"{prev_speaker}: {combined_text}")
-        timeline.append({
-            "index": len(timeline),
-            "speaker": prev_speaker,
-            "language": chunks[-1].get("user_output_language"),
+        if speaker == self._speaker:
+            self._buffer.append(text)
+            return
+
+        # Flush previous speaker block, start a new one
+        self._close_block()
+        self._speaker = speaker
+        self._language = chunk.get("user_output_language")
+        self._buffer = [text]
+        self._open_text = ""
+        self._open_joined = 0
+
+    def add_chunks(self, chunks) -> "ConversationBuilder":
+        for chunk in chunks:
+            self.add_chunk(chunk)
+        return self
+
+    def _has_open_block(self) -> bool:
+        return bool(self._buffer and self._speaker)
+
+    def _joined_open_text(self) -> str:
+        if self._open_joined != len(self._buffer):
+            new_parts = self._buffer[self._open_joined:]
+            prefix = self._open_text + " " if self._open_text else ""
+            self._open_text = prefix + " ".join(new_parts)
+            self._open_joined = len(self._buffer)
+        return self._open_text
+
+    def _close_block(self) -> None:
+        if not self._has_open_block():
+            return
+
+        combined_text = self._joined_open_text()
+        self._lines.append(f"{self._speaker}: {combined_text}")
+        self._timeline.append({
+            "index": len(self._timeline),
+            "speaker": self._speaker,
+            "language": self._language,
             "text": combined_text
         })
+        self._buffer = []
+        self._open_text = ""
+        self._open_joined = 0
+
+    def _open_entry(self):
+        if not self._has_open_block():
+            return None
+
+        return {
+            "index": len(self._timeline),
+            "speaker": self._speaker,
+            "language": self._language,
+            "text": self._joined_open_text()
+        }
 
-    conversation_text = "\n".join(conversation_lines)
+    def iter_lines(self):
+        """
+        "Speaker: text" lines, the open block last.
+        """
+        yield from self._lines
+        if self._has_open_block():
+            yield f"{self._speaker}: {self._joined_open_text()}"
+
+    @property
+    def conversation_text(self) -> str:
+        """
+        Cached until a chunk changes it; closed lines are appended to the
+        joined text once, so only the open block is re-joined per change.
+        """
+        key = (len(self._lines), len(self._buffer) if self._has_open_block() else 0)
+        if key == self._text_key:
+            return self._text
+
+        if self._closed_joined != len(self._lines):
+            new_lines = "\n".join(self._lines[self._closed_joined:])
+            self._closed_text = f"{self._closed_text}\n{new_lines}" if self._closed_text else new_lines
+            self._closed_joined = len(self._lines)
+
+        if self._has_open_block():
+            open_line = f"{self._speaker}: {self._joined_open_text()}"
+            self._text = f"{self._closed_text}\n{open_line}" if self._closed_text else open_line
+        else:
+            self._text = self._closed_text
+        self._text_key = key
 
-    return {
-        "conversation_text": conversation_text,
-        "timeline": timeline
-    }
+        return self._text
 
+    @property
+    def timeline(self) -> TimelineView:
+        """
+        Closed entries plus the open block, as a live read-only view
+        (entries are shared; the open block's entry is rebuilt per read).
+        """
+        return self._view
+
+    def snapshot(self) -> dict:
+        return {
+            "conversation_text": self.conversation_text,
+            "timeline": list(self._view)
+        }
+
+
+def build_conversation(chunks: list[dict]) -> dict:
+    """
+    Build speaker-aware conversation structure.
+
+    chunks may be a list of chunk dicts or a ChunkStore.
+    """
+    return ConversationBuilder().add_chunks(chunks).snapshot()
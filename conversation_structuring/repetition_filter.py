@@ -0,0 +1,150 @@
+import re
+from typing import List, Tuple
+
+from conversation_structuring.text_cleaner import clean_text
+
+# -------------------- CONFIG --------------------
+
+# Longest phrase (in words) checked for looping
+MAX_NGRAM = 8
+
+# A single word must repeat this often to be collapsed ("very very" is fine)
+MIN_WORD_REPEATS = 3
+
+# Whisper's own hallucination thresholds (see decoding_profiles)
+COMPRESSION_RATIO_THRESHOLD = 2.4
+NO_SPEECH_THRESHOLD = 0.6
+LOGPROB_THRESHOLD = -1.0
+
+_NORMALIZE_RE = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def _normalize(word: str) -> str:
+    return _NORMALIZE_RE.sub("", word.lower())
+
+
+def count_tokens(text: str) -> int:
+    return len(text.split()) if text else 0
+
+
+def collapse_repeated_ngrams(
+    text: str,
+    max_ngram: int = MAX_NGRAM,
+    min_word_repeats: int = MIN_WORD_REPEATS
+) -> Tuple[str, int]:
+    """
+    Collapse back-to-back repeats of the same phrase to a single copy.
+
+    "Thank you. Thank you. Thank you." → "Thank you."
+    Comparison ignores case and punctuation. Returns (text, words_removed).
+    """
+    words = text.split()
+    if len(words) < 2:
+        return text, 0
+
+    keys = [_normalize(w) for w in words]
+    kept = []
+    i = 0
+
+    while i < len(words):
+        collapsed = False
+
+        # Shortest period first, so "a b a b a b" collapses to "a b"
+        for n in range(1, min(max_ngram, (len(words) - i) // 2) + 1):
+            phrase = keys[i:i + n]
+            if not any(phrase):
+                continue
+
+            repeats = 1
+            while keys[i + repeats * n:i + (repeats + 1) * n] == phrase:
+                repeats += 1
+
+            if repeats >= (min_word_repeats if n == 1 else 2):
+                kept.extend(words[i:i + n])
+                i += repeats * n
+                collapsed = True
+                break
+
+        if not collapsed:
+            kept.append(words[i])
+            i += 1
+
+    return " ".join(kept), len(words) - len(kept)
+
+
+def _is_hallucinated_silence(segment: dict) -> bool:
+    no_speech = segment.get("no_speech_prob")
+    logprob = segment.get("avg_logprob")
+
+    # NaN compares False, so missing scores never drop a segment
+    return (
+        no_speech is not None and logprob is not None
+        and no_speech > NO_SPEECH_THRESHOLD
+        and logprob < LOGPROB_THRESHOLD
+    )
+
+
+def filter_segments(segments: List[dict], previous_text: str = "") -> Tuple[List[dict], int]:
+    """
+    Remove Whisper loops and silence hallucinations from a segment list.
+
+    - segments Whisper itself would treat as silence are dropped
+    - a segment repeating the previous segment (also across chunk
+      boundaries, via previous_text) is dropped
+    - repeated phrases inside a segment are collapsed (single repeated
+      words too when Whisper's compression ratio flags a loop)
+
+    Returns (cleaned segments, words removed).
+    """
+    kept = []
+    removed = 0
+    previous_key = " ".join(_normalize(w) for w in previous_text.split())
+
+    for seg in segments:
+        text = seg.get("text", "")
+        words = count_tokens(text)
+
+        if _is_hallucinated_silence(seg):
+            removed += words
+            continue
+
+        # Whisper flags looping output with a high compression ratio
+        looping = (seg.get("compression_ratio") or 0.0) > COMPRESSION_RATIO_THRESHOLD
+        text, dropped = collapse_repeated_ngrams(
+            text,
+            min_word_repeats=2 if looping else MIN_WORD_REPEATS
+        )
+        removed += dropped
+
+        key = " ".join(_normalize(w) for w in text.split())
+        if key and key == previous_key:
+            removed += count_tokens(text)
+            continue
+
+        if dropped:
+            seg = dict(seg)
+            seg["text"] = " " + text if text else ""
+
+        kept.append(seg)
+        previous_key = key or previous_key
+
+    return kept, removed
+
+
+def clean_transcript(segments: List[dict], previous_text: str = "") -> dict:
+    """
+    Cleaning stage run before translation.
+
+    Returns {"text", "segments", "tokens_removed"}; the text also goes
+    through clean_text and a final phrase-collapse across segment joins.
+    """
+    kept, removed = filter_segments(segments, previous_text)
+
+    text = clean_text("".join(seg["text"] for seg in kept))
+    text, dropped = collapse_repeated_ngrams(text)
+
+    return {
+        "text": text,
+        "segments": kept,
+        "tokens_removed": removed + dropped
+    }
@@ -1,47 +1,19 @@
-import librosa
-import numpy as np
-
-def extract_audio_features(wav_path: str, sample_rate: int = 16000) -> dict:
-    y, sr = librosa.load(wav_path, sr=sample_rate, mono=True)
-
-    # MFCC
-    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-    mfcc_delta = librosa.feature.delta(mfcc)
-
-    # Spectral features
-    zcr = librosa.feature.zero_crossing_rate(y)
-    spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)
-    spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)
+from typing import Union
 
-    # Energy
-    rms = librosa.feature.rms(y=y)
-
-    # Pitch (F0)
-    pitches, _ = librosa.piptrack(y=y, sr=sr)
-    pitch_values = pitches[pitches > 0]
-
-    # ✅ CORRECT silence ratio calculation
-    intervals = librosa.effects.split(y, top_db=25)
+import numpy as np
 
-    voiced_samples = sum(end - start for start, end in intervals)
-    total_samples = len(y)
+from audio_preprocessing.resampler import load_wav_16k
+from language_detection.feature_engine import extract_features
 
-    silence_ratio = 1.0 - (voiced_samples / total_samples) if total_samples > 0 else 0.0
 
-    # Tempo (speech rhythm)
-    tempo = librosa.beat.tempo(y=y, sr=sr)[0]
+def extract_audio_features(audio: Union[str, np.ndarray], sample_rate: int = 16000) -> dict:
+    """
+    Language-profile features for one chunk (WAV path or 16 kHz array).
 
-    features = {
-        "mfcc_mean": float(np.mean(mfcc)),
-        "mfcc_delta_mean": float(np.mean(mfcc_delta)),
-        "zcr_mean": float(np.mean(zcr)),
-        "spectral_centroid_mean": float(np.mean(spectral_centroid)),
-        "spectral_rolloff_mean": float(np.mean(spectral_rolloff)),
-        "rms_var": float(np.var(rms)),
-        "pitch_mean": float(np.mean(pitch_values)) if len(pitch_values) > 0 else 0.0,
-        "pitch_var": float(np.var(pitch_values)) if len(pitch_values) > 0 else 0.0,
-        "silence_ratio": float(silence_ratio),
-        "tempo": float(tempo),
-    }
+    Thin wrapper over feature_engine, which derives every feature from a
+    single STFT; use feature_engine.extract_feature_matrix for batches.
+    """
+    if isinstance(audio, str):
+        audio, _ = load_wav_16k(audio, sample_rate)
 
-    return features
+    return extract_features(audio, sample_rate)
@@ -0,0 +1,139 @@
+from typing import Sequence
+
+import numpy as np
+
+# -------------------- CONFIG --------------------
+
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MELS = 128
+N_MFCC = 13
+
+# Same threshold as librosa.effects.split(top_db=25) in the old extractor
+SILENCE_TOP_DB = 25.0
+
+ROLLOFF_PERCENT = 0.85
+
+FEATURE_NAMES = (
+    "mfcc_mean",
+    "mfcc_delta_mean",
+    "zcr_mean",
+    "spectral_centroid_mean",
+    "spectral_rolloff_mean",
+    "rms_var",
+    "pitch_mean",
+    "pitch_var",
+    "silence_ratio",
+    "tempo",
+)
+
+
+def _frame(y: np.ndarray, frame_length: int = N_FFT, hop_length: int = HOP_LENGTH) -> np.ndarray:
+    """
+    Centered, zero-padded frames (frames × frame_length) as a strided view.
+    """
+    pad = frame_length // 2
+    padded = np.pad(y, pad, mode="constant")
+    n_frames = 1 + (len(padded) - frame_length) // hop_length
+
+    return np.lib.stride_tricks.as_strided(
+        padded,
+        shape=(n_frames, frame_length),
+        strides=(padded.strides[0] * hop_length, padded.strides[0])
+    )
+
+
+def _features_from_signal(y: np.ndarray, sr: int, mel_basis: np.ndarray, window: np.ndarray) -> np.ndarray:
+    import librosa
+
+    if len(y) == 0:
+        return np.zeros(len(FEATURE_NAMES), dtype=np.float32)
+
+    frames = _frame(y)
+
+    # ---- One STFT: everything below is derived from it ----
+    spectrum = np.fft.rfft(frames * window, axis=1).T  # (bins, frames)
+    magnitude = np.abs(spectrum)
+    power = magnitude ** 2
+
+    freqs = np.fft.rfftfreq(N_FFT, d=1.0 / sr)
+
+    # MFCC + delta from the mel power spectrogram
+    mel = mel_basis @ power
+    mfcc = librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=N_MFCC)
+    mfcc_delta = librosa.feature.delta(mfcc) if mfcc.shape[1] >= 9 else np.zeros_like(mfcc)
+
+    # Zero-crossing rate on the same frames
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+    # Spectral centroid / rolloff
+    mag_sum = magnitude.sum(axis=0)
+    safe_sum = np.where(mag_sum > 0, mag_sum, 1.0)
+    centroid = (freqs[:, None] * magnitude).sum(axis=0) / safe_sum
+
+    cumulative = np.cumsum(magnitude, axis=0)
+    rolloff_idx = np.argmax(cumulative >= ROLLOFF_PERCENT * cumulative[-1:, :], axis=0)
+    rolloff = freqs[rolloff_idx]
+
+    # RMS energy (Parseval on the windowed spectrum, as librosa.feature.rms(S=...))
+    rms = librosa.feature.rms(S=magnitude, frame_length=N_FFT)[0]
+
+    # Pitch from the existing magnitude spectrogram
+    pitches, _ = librosa.piptrack(S=magnitude, sr=sr, n_fft=N_FFT, hop_length=HOP_LENGTH)
+    pitch_values = pitches[pitches > 0]
+
+    # Silence ratio: frames more than top_db below the loudest frame
+    rms_db = librosa.amplitude_to_db(rms, ref=np.max) if rms.max() > 0 else np.full_like(rms, -np.inf)
+    silence_ratio = float(np.mean(rms_db < -SILENCE_TOP_DB))
+
+    # Tempo from the onset envelope of the same mel spectrogram
+    onset_env = librosa.onset.onset_strength(S=librosa.power_to_db(mel), sr=sr, hop_length=HOP_LENGTH)
+    tempo = librosa.feature.tempo(onset_envelope=onset_env, sr=sr, hop_length=HOP_LENGTH)[0]
+
+    return np.array([
+        np.mean(mfcc),
+        np.mean(mfcc_delta),
+        np.mean(zcr),
+        np.mean(centroid),
+        np.mean(rolloff),
+        np.var(rms),
+        np.mean(pitch_values) if len(pitch_values) > 0 else 0.0,
+        np.var(pitch_values) if len(pitch_values) > 0 else 0.0,
+        silence_ratio,
+        tempo,
+    ], dtype=np.float32)
+
+
+def extract_feature_matrix(chunks: Sequence[np.ndarray], sample_rate: int = 16000) -> np.ndarray:
+    """
+    Compute the language-profile features for a batch of in-memory chunks.
+
+    Each chunk gets a single framing + STFT; MFCC, ZCR, centroid, rolloff,
+    RMS, pitch, silence ratio and tempo are all derived from it.
+
+    Returns a (chunks × len(FEATURE_NAMES)) float32 matrix.
+    """
+    import librosa
+
+    mel_basis = librosa.filters.mel(sr=sample_rate, n_fft=N_FFT, n_mels=N_MELS)
+    window = np.hanning(N_FFT + 1)[:-1].astype(np.float32)  # periodic Hann
+
+    matrix = np.zeros((len(chunks), len(FEATURE_NAMES)), dtype=np.float32)
+    for i, y in enumerate(chunks):
+        y = np.ascontiguousarray(y, dtype=np.float32)
+        matrix[i] = _features_from_signal(y, sample_rate, mel_basis, window)
+
+    return matrix
+
+
+def features_to_dict(row: np.ndarray) -> dict:
+    return {name: float(value) for name, value in zip(FEATURE_NAMES, row)}
+
+
+def extract_features(y: np.ndarray, sample_rate: int = 16000) -> dict:
+    """
+    Single-chunk convenience wrapper returning a feature dict.
+    """
+    return features_to_dict(extract_feature_matrix([y], sample_rate)[0])
+
@@ -0,0 +1,141 @@
+import math
+import threading
+from typing import Union
+
+import numpy as np
+
+from language_detection.feature_engine import features_to_dict
+from language_detection.language_profiles import LANGUAGE_PROFILES
+from language_detection.whisper_lang_detector import detect_language_whisper
+from monitoring.metrics import record_language_tier
+
+# -------------------- CONFIG --------------------
+
+# Accept the profile decision only when the best language beats the
+# runner-up by this much and matches its own profile well enough
+PREFILTER_MARGIN = 0.35
+PREFILTER_MIN_SCORE = 0.8
+
+# Languages the pipeline can meet; tier 1 is only trusted when every one
+# of them has a profile (otherwise an unprofiled language is silently
+# assigned its nearest profiled neighbour)
+SUPPORTED_LANGUAGES = ("en", "hi", "ta", "te", "ml", "kn")
+
+TIER_STATS = {"profile": 0, "whisper": 0}
+_lock = threading.Lock()
+
+
+def _range_score(value: float, low: float, high: float) -> float:
+    if low <= value <= high:
+        return 1.0
+
+    distance = low - value if value < low else value - high
+    return math.exp(-distance / max(high - low, 1e-6))
+
+
+def _min_score(value: float, minimum: float) -> float:
+    if value >= minimum:
+        return 1.0
+    return math.exp(-(minimum - value) / max(abs(minimum), 1e-6))
+
+
+def _max_score(value: float, maximum: float) -> float:
+    if value <= maximum:
+        return 1.0
+    return math.exp(-(value - maximum) / max(abs(maximum) * 0.25, 1e-6))
+
+
+def score_language_profiles(features: dict) -> dict:
+    """
+    Score how well a chunk's features match each language profile (0–1).
+    """
+    scores = {}
+
+    for lang, profile in LANGUAGE_PROFILES.items():
+        parts = [
+            _range_score(features["mfcc_mean"], *profile["mfcc_range"]),
+            _range_score(features["zcr_mean"], *profile["zcr_range"]),
+            _range_score(features["tempo"], *profile["tempo_range"]),
+            _min_score(features["pitch_var"], profile["pitch_var_min"]),
+            _max_score(features["spectral_rolloff_mean"], profile["rolloff_max"]),
+        ]
+        scores[lang] = sum(parts) / len(parts)
+
+    return scores
+
+
+def prefilter_available() -> bool:
+    """
+    Whether LANGUAGE_PROFILES cover every supported language. The
+    current profiles have no ml / kn entries and have not been
+    calibrated on labelled chunks, so the pre-filter stays off until
+    they are.
+    """
+    return all(lang in LANGUAGE_PROFILES for lang in SUPPORTED_LANGUAGES)
+
+
+def _record_tier(tier: str) -> None:
+    with _lock:
+        TIER_STATS[tier] += 1
+    record_language_tier(tier)
+
+
+def detect_language_tiered(
+    audio_path: Union[str, np.ndarray],
+    features=None,
+    margin: float = PREFILTER_MARGIN,
+    min_score: float = PREFILTER_MIN_SCORE
+) -> dict:
+    """
+    Tier 1: match the chunk's acoustic features against LANGUAGE_PROFILES.
+    Tier 2: fall back to a Whisper encoder pass when tier 1 is ambiguous.
+
+    features may be a feature dict or a row of a feature_engine matrix;
+    when omitted it is computed from the audio (WAV path or 16 kHz array).
+    Without full profile coverage (prefilter_available) tier 1 is skipped.
+    """
+    if not prefilter_available():
+        _record_tier("whisper")
+        result = detect_language_whisper(audio_path)
+        result["tier"] = "whisper"
+        return result
+
+    if features is None:
+        from language_detection.audio_features import extract_audio_features
+        features = extract_audio_features(audio_path)
+    elif isinstance(features, np.ndarray):
+        features = features_to_dict(features)
+
+    scores = score_language_profiles(features)
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+    best_lang, best_score = ranked[0]
+    runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+
+    if best_score >= min_score and best_score - runner_up >= margin:
+        _record_tier("profile")
+        return {
+            "detected_language": best_lang,
+            "confidence": best_score,
+            "scores": scores,
+            "tier": "profile"
+        }
+
+    _record_tier("whisper")
+    result = detect_language_whisper(audio_path)
+    result["tier"] = "whisper"
+    return result
+
+
+def get_tier_stats() -> dict:
+    """
+    How often each tier decided, plus the share of Whisper passes saved.
+    """
+    with _lock:
+        stats = dict(TIER_STATS)
+
+    total = stats["profile"] + stats["whisper"]
+    stats["total"] = total
+    stats["whisper_passes_saved"] = stats["profile"] / total if total else 0.0
+    return stats
+
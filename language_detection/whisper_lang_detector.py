@@ -1,30 +1,38 @@
-import os
-import whisper
+from typing import Union
 
-MODEL_NAME = "small"
+import numpy as np
 
-# 🔥 Custom cache directory on D drive
-CACHE_DIR = r"D:\.cache"
+from model_server.client import get_model_client
+from monitoring.metrics import span
+from monitoring.profiler import profile_stage
+from speech_to_text.whisper_model import get_whisper_model
 
-os.makedirs(CACHE_DIR, exist_ok=True)
 
-# Load whisper model with explicit cache path
-model = whisper.load_model(
-    MODEL_NAME,
-    download_root=CACHE_DIR
-)
-
-
-def detect_language_whisper(audio_path: str) -> dict:
+@profile_stage("detect_language_whisper")
+def detect_language_whisper(audio: Union[str, np.ndarray]) -> dict:
     """
-    Detect language from audio using Whisper.
+    Detect language from audio (file path or 16 kHz float32 array) using Whisper.
     """
-    audio = whisper.load_audio(audio_path)
+    remote = get_model_client()
+    if remote is not None:
+        if isinstance(audio, str):
+            from audio_preprocessing.audio_loader import load_audio_array
+            audio = load_audio_array(audio)
+        return remote.call("detect_language", audio=np.asarray(audio, dtype=np.float32))
+
+    import whisper
+
+    model = get_whisper_model()
+
+    if isinstance(audio, str):
+        audio = whisper.load_audio(audio)
+    audio_seconds = len(audio) / whisper.audio.SAMPLE_RATE
     audio = whisper.pad_or_trim(audio)
 
     mel = whisper.log_mel_spectrogram(audio).to(model.device)
 
-    _, probs = model.detect_language(mel)
+    with span("whisper.detect_language", audio_seconds=audio_seconds):
+        _, probs = model.detect_language(mel)
     detected_lang = max(probs, key=probs.get)
 
     return {
@@ -32,3 +40,36 @@ def detect_language_whisper(audio_path: str) -> dict:
         "confidence": probs.get(detected_lang, 0.0),
         "scores": probs
     }
+
+
+def detect_languages_whisper(audios: list) -> list:
+    """
+    Language ID for several 16 kHz arrays in one batched encoder pass.
+    """
+    import torch
+    import whisper
+
+    if not audios:
+        return []
+
+    model = get_whisper_model()
+    audio_seconds = sum(len(a) for a in audios) / whisper.audio.SAMPLE_RATE
+
+    mel = torch.stack([
+        whisper.log_mel_spectrogram(whisper.pad_or_trim(np.asarray(a, dtype=np.float32)))
+        for a in audios
+    ]).to(model.device)
+
+    with span("whisper.detect_language", audio_seconds=audio_seconds, batch=len(audios)):
+        _, all_probs = model.detect_language(mel)
+
+    results = []
+    for probs in all_probs:
+        detected_lang = max(probs, key=probs.get)
+        results.append({
+            "detected_language": detected_lang,
+            "confidence": probs.get(detected_lang, 0.0),
+            "scores": probs
+        })
+
+    return results
@@ -1,43 +1,88 @@
+import argparse
 import os
+from contextlib import ExitStack
+from typing import Callable, Optional
 
 # --------- Audio Preprocessing ----------
-from audio_preprocessing.audio_loader import load_audio
-from audio_preprocessing.audio_converter import convert_to_wav_mono
-from audio_preprocessing.audio_normalizer import normalize_audio
-from audio_preprocessing.audio_splitter import split_audio
-from audio_preprocessing.noise_reduction import reduce_noise
+from audio_preprocessing.audio_loader import load_audio_array
+from audio_preprocessing.audio_normalizer import normalize_loudness, normalize_segments
+from audio_preprocessing.pcm_store import new_pcm_path, release_chunk_pcm, write_pcm
+from audio_preprocessing.noise_reduction import reduce_noise_array
 
 # --------- Language Detection ----------
+from language_detection.feature_engine import extract_feature_matrix
+from language_detection.tiered_detector import PREFILTER_MARGIN, detect_language_tiered, get_tier_stats, prefilter_available
 from language_detection.whisper_lang_detector import detect_language_whisper
 
 # --------- Speech to Text ----------
-from speech_to_text.whisper_asr import transcribe_audio
+from speech_to_text.batched_asr import ASR_BATCH_SIZE, SAMPLE_RATE, transcribe_runs, transcribe_windows
+from speech_to_text.window_packing import assign_segments_to_chunks, group_chunks_by_language
 
 # --------- Translation (NLLB) ----------
 from translation.tf_translator import translate_text
 
 # --------- Speaker Diarization ----------
 from speaker_diarization.diarization_engine import diarize_chunks
+from speaker_diarization.embedding_extractor import extract_embedding
 
 # --------- Conversation Structuring ----------
+from conversation_structuring.chunk_store import ChunkStore
 from conversation_structuring.conversation_builder import build_conversation
+from conversation_structuring.repetition_filter import clean_transcript, count_tokens
 
 # --------- Business Intelligence (LLM) ----------
 from business_intelligence.key_points_extractor import extract_business_key_points
 
+# --------- Export ----------
+from transcript_export.exporter import SUPPORTED_FORMATS, TranscriptExporter
+
 # --------- Utils ----------
 from utils.file_utils import create_dir_if_not_exists
+from utils.model_cache import MODEL_CACHE
+from utils.stage_pipeline import STAGE_QUEUE_SIZE, Stage, StagePipeline
+
+# --------- Monitoring ----------
+from monitoring.metrics import current_job_id, job_context, span
+from monitoring.profiler import configure_profiling
 
 
 
 # ==================== CONFIG ====================
 
-TEMP_DIR = "temp_audio"
 CHUNKS_DIR = "audio_chunks"
+EXPORT_DIR = "exports"
+
+# Fixed chunk length for language ID, diarization and export
+CHUNK_DURATION_SEC = 20
 
 # ✅ USER SELECTED FINAL OUTPUT LANGUAGE
 TARGET_LANGUAGE = "hi"   # en, hi, ta, te, ml, kn
 
+# ✅ Source language assumed for detected languages missing from
+# NLLB_LANG_MAP (None → such chunks are left untranslated)
+FALLBACK_SOURCE_LANGUAGE = None
+
+# ✅ Cheap acoustic-profile language pre-filter before Whisper language ID.
+# Off: the profiles are not calibrated yet and lack ml / kn, so tier 1
+# never decides and every chunk would pay for features *and* Whisper
+LANGUAGE_PREFILTER = False
+
+# ✅ Loudness normalization (gated BS.1770 LUFS); per-chunk evens out speakers
+TARGET_LOUDNESS = -20.0
+NORMALIZE_PER_CHUNK = False
+
+# ✅ Collapse Whisper loops / silence hallucinations before translation
+COLLAPSE_REPETITIONS = True
+
+# ✅ Max transcript tokens sent to the LLM (after compaction)
+LLM_TOKEN_BUDGET = 6000
+
+# ✅ Overlap decode / language ID / ASR / translation / embedding per chunk
+PIPELINED = False
+
+# ✅ Whisper decoding profile: fast | balanced | accurate
+DECODING_PROFILE = "balanced"
+
 # ✅ NLLB multilingual model (ALL language pairs)
 TRANSLATION_MODEL = "facebook/nllb-200-distilled-600M"
 
@@ -54,102 +99,537 @@ NLLB_LANG_MAP = {
 
 # ==================== PIPELINE ====================
 
-def preprocess_audio(input_audio_path: str):
+# progress(stage, fraction of the job done), e.g. for the HTTP job API
+ProgressCallback = Optional[Callable[[str, float], None]]
+
+
+def _report(progress: ProgressCallback, stage: str, fraction: float) -> None:
+    if progress is not None:
+        progress(stage, round(fraction, 3))
+
+
+def decode_to_pcm(input_audio_path: str, chunks_dir: str = CHUNKS_DIR):
     """
-    Audio → Language Detection → ASR → Translation
+    Audio → Normalization → Noise reduction → memory-mapped PCM file
     """
 
-    create_dir_if_not_exists(TEMP_DIR)
-    create_dir_if_not_exists(CHUNKS_DIR)
+    create_dir_if_not_exists(chunks_dir)
 
-    # 1️⃣ Load audio
-    audio = load_audio(input_audio_path)
+    # 1️⃣ + 2️⃣ Decode straight to mono float32 @16kHz (single pass)
+    with span("decode") as s:
+        samples = load_audio_array(input_audio_path, SAMPLE_RATE)
+        audio_seconds = len(samples) / SAMPLE_RATE
+        s["audio_seconds"] = audio_seconds
 
-    # 2️⃣ Convert to mono WAV @16kHz
-    audio = convert_to_wav_mono(audio)
+    # 3️⃣ Normalize loudness (in place on the float32 samples)
+    with span("normalize", audio_seconds=audio_seconds) as s:
+        if NORMALIZE_PER_CHUNK:
+            gains = normalize_segments(samples, SAMPLE_RATE, target_lufs=TARGET_LOUDNESS)
+            s["gain_db"] = max(gains, default=0.0)
+        else:
+            _, s["gain_db"] = normalize_loudness(samples, SAMPLE_RATE, target_lufs=TARGET_LOUDNESS)
 
-    # 3️⃣ Normalize loudness
-    audio = normalize_audio(audio)
+    # 4️⃣ + 5️⃣ Adaptive noise reduction (skipped on clean audio), in memory
+    with span("noise_reduction", audio_seconds=audio_seconds) as s:
+        samples, noise_info = reduce_noise_array(samples, SAMPLE_RATE)
+        s.update(noise_path=noise_info["path"], snr_db=noise_info["snr_db"])
+    print(f"🔇 {input_audio_path}: noise reduction '{noise_info['path']}' (SNR {noise_info['snr_db']} dB)")
 
-    # 4️⃣ Save clean WAV
-    clean_wav_path = os.path.join(TEMP_DIR, "clean.wav")
-    audio.export(clean_wav_path, format="wav")
+    # 6️⃣ Persist the signal once as a memory-mapped PCM file; from here on
+    # every stage reads the same pages
+    with span("pcm_store", audio_seconds=audio_seconds):
+        return write_pcm(samples, new_pcm_path(chunks_dir), SAMPLE_RATE)
 
-    # 5️⃣ Noise reduction
-    denoised_path = os.path.join(TEMP_DIR, "denoised.wav")
-    reduce_noise(clean_wav_path, denoised_path)
 
-    # 6️⃣ Reload denoised audio
-    final_audio = load_audio(denoised_path)
+def split_pcm(pcm, target_language: str = TARGET_LANGUAGE) -> tuple[list, ChunkStore]:
+    """
+    Cut the PCM file into fixed-length chunk views and their records
+    (language fields are filled in by detect_chunk_language).
+    """
 
-    # 7️⃣ Split into chunks
-    chunks = split_audio(final_audio)
+    # 7️⃣ Split into chunks: (offset, length) views into the PCM file
+    chunk_len = CHUNK_DURATION_SEC * SAMPLE_RATE
+    with span("split"):
+        chunks = [pcm.slice(start, chunk_len) for start in range(0, len(pcm), chunk_len)]
 
-    chunk_metadata = []
+    chunk_metadata = ChunkStore()
+    target_lang = target_language.lower()
 
+    offset_sec = 0.0
     for i, chunk in enumerate(chunks):
-        chunk_path = os.path.join(CHUNKS_DIR, f"chunk_{i}.wav")
-        chunk.export(chunk_path, format="wav")
-
-        # 8️⃣ Language detection
-        lang_result = detect_language_whisper(chunk_path)
-        detected_lang = lang_result["detected_language"].lower()
-        target_lang = TARGET_LANGUAGE.lower()
-
-        # 9️⃣ Speech-to-text
-        asr_result = transcribe_audio(
-            chunk_path,
-            language=detected_lang
+        chunk_metadata.append({
+            "chunk_id": i,
+            "pcm_path": chunk.path,
+            "pcm_offset": chunk.offset,
+            "pcm_length": chunk.length,
+            "start_time": offset_sec,
+            "end_time": offset_sec + chunk.duration,
+            "user_output_language": target_lang,
+        })
+        offset_sec += chunk.duration
+
+    return chunks, chunk_metadata
+
+
+def detect_chunk_language(record, samples, features=None) -> None:
+    """
+    8️⃣ Language detection for one chunk, written onto its record.
+    """
+    with span("language_detection", chunk_id=record["chunk_id"], audio_seconds=len(samples) / SAMPLE_RATE) as s:
+        if features is not None:
+            lang_result = detect_language_tiered(
+                samples,
+                features=features,
+                margin=PREFILTER_MARGIN
+            )
+        else:
+            lang_result = detect_language_whisper(samples)
+        s["tier"] = lang_result.get("tier", "whisper")
+
+    record["detected_language"] = lang_result["detected_language"].lower()
+    record["language_confidence"] = lang_result["confidence"]
+    record["language_tier"] = lang_result.get("tier", "whisper")
+
+
+def prepare_chunks(
+    input_audio_path: str,
+    target_language: str = TARGET_LANGUAGE,
+    chunks_dir: str = CHUNKS_DIR
+):
+    """
+    Audio → Preprocessing → Chunks → Language Detection
+    """
+    pcm = decode_to_pcm(input_audio_path, chunks_dir)
+    chunks, chunk_metadata = split_pcm(pcm, target_language)
+
+    # Features for the language pre-filter, one STFT per chunk
+    feature_matrix = None
+    if LANGUAGE_PREFILTER and prefilter_available():
+        with span("language_features", audio_seconds=pcm.duration):
+            feature_matrix = extract_feature_matrix([c.samples for c in chunks], SAMPLE_RATE)
+
+    for i, (chunk, record) in enumerate(zip(chunks, chunk_metadata)):
+        detect_chunk_language(record, chunk.samples, None if feature_matrix is None else feature_matrix[i])
+
+    return pcm.samples, chunk_metadata
+
+
+def build_asr_runs(samples, chunk_metadata: ChunkStore) -> list[dict]:
+    """
+    Group chunks into same-language runs, each transcribed as one
+    continuous signal (no cuts at chunk or fixed 30 s boundaries).
+    """
+    runs = []
+    languages = [c["detected_language"] for c in chunk_metadata]
+
+    for first, last, run_lang in group_chunks_by_language(languages):
+        run_start = chunk_metadata[first]["start_time"]
+        run_end = chunk_metadata[last - 1]["end_time"]
+
+        runs.append({
+            "audio": samples[int(run_start * SAMPLE_RATE):int(run_end * SAMPLE_RATE)],
+            "language": run_lang,
+            "chunks": chunk_metadata[first:last],
+            "start_time": run_start,
+            # Chunk boundaries inside the run (see transcribe_runs)
+            "cuts": [
+                int((chunk_metadata[i]["start_time"] - run_start) * SAMPLE_RATE)
+                for i in range(first + 1, last)
+            ],
+        })
+
+    return runs
+
+
+def apply_asr_results(runs: list[dict], results: list[dict]) -> int:
+    """
+    Map run transcripts back onto the chunk records, collapsing
+    repetition loops on the way. Returns the number of tokens removed.
+    """
+    tokens_removed = 0
+    previous_text = ""
+
+    for run, result in zip(runs, results):
+        per_chunk_segments = assign_segments_to_chunks(
+            result["segments"],
+            [(c["start_time"], c["end_time"]) for c in run["chunks"]],
+            offset=run["start_time"]
         )
 
-        transcript_text = asr_result["text"].strip()
+        for record, segments in zip(run["chunks"], per_chunk_segments):
+            if COLLAPSE_REPETITIONS:
+                raw_text = "".join(seg["text"] for seg in segments)
+                with span("repetition_filter", chunk_id=record["chunk_id"], tokens_in=count_tokens(raw_text)) as s:
+                    cleaned = clean_transcript(segments, previous_text)
+                    s["tokens_out"] = count_tokens(cleaned["text"])
 
-        # 🔟 Conditional translation (NLLB)
-        src_code = NLLB_LANG_MAP.get(detected_lang)
-        tgt_code = NLLB_LANG_MAP.get(target_lang)
+                segments = cleaned["segments"]
+                record["transcript"] = cleaned["text"]
+                record["tokens_removed"] = cleaned["tokens_removed"]
+                tokens_removed += cleaned["tokens_removed"]
+                if segments:
+                    previous_text = segments[-1]["text"]
+            else:
+                record["transcript"] = "".join(seg["text"] for seg in segments).strip()
 
-        if src_code and tgt_code and src_code != tgt_code:
+            record["segments"] = segments
+            record["asr_language"] = result["language"]
+            record["model"] = result["model"]
+
+    return tokens_removed
+
+
+def translate_chunk(record, fallback_source_language: str = FALLBACK_SOURCE_LANGUAGE) -> None:
+    """
+    Conditional translation (NLLB) of one chunk transcript. Detected
+    languages missing from NLLB_LANG_MAP are translated as
+    fallback_source_language, or left untranslated when it is None.
+    """
+    transcript_text = record["transcript"]
+
+    src_code = NLLB_LANG_MAP.get(record["detected_language"], NLLB_LANG_MAP.get(fallback_source_language))
+    tgt_code = NLLB_LANG_MAP.get(record["user_output_language"])
+
+    if src_code and tgt_code and src_code != tgt_code:
+        with span("translation", chunk_id=record["chunk_id"]):
             translated_text = translate_text(
                 text=transcript_text,
                 src_lang=src_code,
                 tgt_lang=tgt_code,
                 model_name=TRANSLATION_MODEL
             )
-        else:
-            translated_text = transcript_text
+    else:
+        translated_text = transcript_text
 
-        chunk_metadata.append({
-            "chunk_id": i,
-            "path": chunk_path,
-            "detected_language": detected_lang,
-            "user_output_language": target_lang,
-            "language_confidence": lang_result["confidence"],
-            "transcript": transcript_text,
-            "translated_text": translated_text,
-            "segments": asr_result["segments"],
-            "asr_language": asr_result["language"],
-            "model": asr_result["model"]
-        })
+    record["translated_text"] = translated_text
+
+
+def translate_chunks(
+    chunk_metadata: ChunkStore,
+    exporter: TranscriptExporter = None,
+    fallback_source_language: str = FALLBACK_SOURCE_LANGUAGE
+) -> ChunkStore:
+    """
+    Conditional translation (NLLB) of every chunk transcript; each chunk
+    is exported as soon as it is translated.
+    """
+    for record in chunk_metadata:
+        translate_chunk(record, fallback_source_language)
+        if exporter is not None:
+            exporter.write_chunk(record)
 
     return chunk_metadata
 
 
+def preprocess_audio_files(
+    input_audio_paths: list[str],
+    target_language: str = TARGET_LANGUAGE,
+    decoding_profile: str = DECODING_PROFILE,
+    asr_batch_size: int = ASR_BATCH_SIZE,
+    chunks_dir: str = CHUNKS_DIR,
+    progress: ProgressCallback = None,
+    exporters: list = None,
+    fallback_source_language: str = FALLBACK_SOURCE_LANGUAGE
+) -> list[ChunkStore]:
+    """
+    Preprocess several recordings, sharing batched Whisper passes across them.
+    exporters (one TranscriptExporter or None per recording) receive each
+    chunk as soon as it is translated.
+    """
+    exporters = exporters or [None] * len(input_audio_paths)
+    all_runs = []
+    jobs = []
+
+    for n, path in enumerate(input_audio_paths):
+        _report(progress, "preprocessing", 0.35 * n / len(input_audio_paths))
+
+        file_dir = chunks_dir if len(input_audio_paths) == 1 else os.path.join(chunks_dir, f"file_{n}")
+        samples, chunk_metadata = prepare_chunks(path, target_language, file_dir)
+
+        runs = build_asr_runs(samples, chunk_metadata)
+        jobs.append((chunk_metadata, len(all_runs), len(all_runs) + len(runs)))
+        all_runs.extend(runs)
+
+    # 9️⃣ Speech-to-text: runs of all files decoded together, window
+    # rounds batched across runs
+    _report(progress, "asr", 0.35)
+    with span("asr", audio_seconds=sum(len(r["audio"]) for r in all_runs) / SAMPLE_RATE) as s:
+        results = transcribe_runs(
+            [{"audio": r["audio"], "language": r["language"], "cuts": r["cuts"]} for r in all_runs],
+            batch_size=asr_batch_size,
+            profile=decoding_profile
+        )
+        s["runs"] = len(all_runs)
+
+    _report(progress, "translation", 0.65)
+
+    outputs = []
+    for path, exporter, (chunk_metadata, first, last) in zip(input_audio_paths, exporters, jobs):
+        tokens_removed = apply_asr_results(all_runs[first:last], results[first:last])
+        if tokens_removed:
+            print(f"🧽 {path}: removed {tokens_removed} repeated / hallucinated tokens before translation")
+
+        # 🔟 Conditional translation (NLLB)
+        outputs.append(translate_chunks(chunk_metadata, exporter, fallback_source_language))
+
+    return outputs
+
+
+def preprocess_audio_files_pipelined(
+    input_audio_paths: list[str],
+    target_language: str = TARGET_LANGUAGE,
+    decoding_profile: str = DECODING_PROFILE,
+    asr_batch_size: int = ASR_BATCH_SIZE,
+    chunks_dir: str = CHUNKS_DIR,
+    queue_size: int = STAGE_QUEUE_SIZE,
+    exporters: list = None,
+    fallback_source_language: str = FALLBACK_SOURCE_LANGUAGE
+) -> tuple[list[ChunkStore], list[list]]:
+    """
+    Same output as preprocess_audio_files, but chunk by chunk through
+    decode → language ID → ASR → translation → speaker embedding, each
+    stage on its own worker with a bounded queue: chunk i+1 is being
+    transcribed while chunk i is translated and embedded.
+
+    Whisper windows are one chunk each (no same-language run packing,
+    no cross-chunk prompt or seeking); the ASR stage batches whatever
+    chunks are already queued. Returns the
+    chunk stores and, per file, the speaker embeddings for diarize_chunks.
+    """
+    exporters = exporters or [None] * len(input_audio_paths)
+    jobs = [
+        {"path": path, "exporter": exporter, "store": None, "embeddings": None, "previous_text": "", "tokens_removed": 0}
+        for path, exporter in zip(input_audio_paths, exporters)
+    ]
+
+    def decode(n):
+        job = jobs[n]
+        file_dir = chunks_dir if len(jobs) == 1 else os.path.join(chunks_dir, f"file_{n}")
+        pcm = decode_to_pcm(job["path"], file_dir)
+        chunks, job["store"] = split_pcm(pcm, target_language)
+        job["embeddings"] = [None] * len(chunks)
+        return [(job, record, chunk) for record, chunk in zip(job["store"], chunks)]
+
+    def identify_language(item):
+        _, record, chunk = item
+        features = None
+        if LANGUAGE_PREFILTER and prefilter_available():
+            features = extract_feature_matrix([chunk.samples], SAMPLE_RATE)[0]
+        detect_chunk_language(record, chunk.samples, features)
+        return item
+
+    def transcribe(items):
+        windows = [
+            {"audio": chunk.samples, "language": record["detected_language"], "offset": 0.0}
+            for _, record, chunk in items
+        ]
+        results = transcribe_windows(windows, batch_size=asr_batch_size, profile=decoding_profile)
+
+        # Items arrive in chunk order, so repetition context carries over
+        for (job, record, _), result in zip(items, results):
+            segments = result["segments"]
+            if COLLAPSE_REPETITIONS:
+                cleaned = clean_transcript(segments, job["previous_text"])
+                segments = cleaned["segments"]
+                record["transcript"] = cleaned["text"]
+                record["tokens_removed"] = cleaned["tokens_removed"]
+                job["tokens_removed"] += cleaned["tokens_removed"]
+                if segments:
+                    job["previous_text"] = segments[-1]["text"]
+            else:
+                record["transcript"] = "".join(seg["text"] for seg in segments).strip()
+
+            record["segments"] = segments
+            record["asr_language"] = result["language"]
+            record["model"] = result["model"]
+
+        return items
+
+    def translate(item):
+        job, record, _ = item
+        translate_chunk(record, fallback_source_language)
+        if job["exporter"] is not None:
+            job["exporter"].write_chunk(record)
+        return item
+
+    def embed(item):
+        job, record, chunk = item
+        with span("speaker_embedding", chunk_id=record["chunk_id"]):
+            job["embeddings"][record["chunk_id"]] = extract_embedding(chunk.samples)
+        return item
+
+    pipeline = StagePipeline([
+        Stage("decode", decode, fan_out=True, queue_size=queue_size),
+        Stage("language_id", identify_language, queue_size=queue_size),
+        Stage("asr", transcribe, batch_size=asr_batch_size, queue_size=queue_size),
+        Stage("translation", translate, queue_size=queue_size),
+        Stage("embedding", embed, queue_size=queue_size),
+    ])
+
+    with span("pipeline", files=len(jobs)) as s:
+        pipeline.run(range(len(jobs)))
+        s["bottleneck"] = pipeline.bottleneck()
+        s["stages"] = pipeline.stats()
+
+    print_stage_stats(pipeline.stats())
+
+    for job in jobs:
+        if job["tokens_removed"]:
+            print(f"🧽 {job['path']}: removed {job['tokens_removed']} repeated / hallucinated tokens before translation")
+
+    return [job["store"] for job in jobs], [job["embeddings"] for job in jobs]
+
+
+def print_stage_stats(stats: dict) -> None:
+    print("\n⏱️ PIPELINE STAGES\n")
+    print(f"{'stage':<12} {'items':>6} {'busy s':>8} {'util':>6} {'blocked s':>10} {'queue avg':>10} {'queue max':>10}")
+    for name, st in stats.items():
+        print(
+            f"{name:<12} {st['processed']:>6} {st['busy_sec']:>8.2f} {st['utilization']:>6.0%} "
+            f"{st['blocked_sec']:>10.2f} {st['avg_queue_depth']:>10.2f} {st['max_queue_depth']:>10}"
+        )
+
+
+def preprocess_audio(
+    input_audio_path: str,
+    target_language: str = TARGET_LANGUAGE,
+    decoding_profile: str = DECODING_PROFILE,
+    chunks_dir: str = CHUNKS_DIR,
+    progress: ProgressCallback = None,
+    exporter: TranscriptExporter = None,
+    fallback_source_language: str = FALLBACK_SOURCE_LANGUAGE
+):
+    """
+    Audio → Language Detection → ASR → Translation
+    """
+    return preprocess_audio_files(
+        [input_audio_path],
+        target_language=target_language,
+        decoding_profile=decoding_profile,
+        chunks_dir=chunks_dir,
+        progress=progress,
+        exporters=[exporter],
+        fallback_source_language=fallback_source_language
+    )[0]
+
+
 # ==================== RUNNER ====================
 
-if __name__ == "__main__":
+def parse_args():
+    parser = argparse.ArgumentParser(description="AC-MTS audio → conversation pipeline")
+    parser.add_argument("audio_files", nargs="*", default=["Test 4.aac"])
+    parser.add_argument(
+        "--asr-batch-size",
+        type=int,
+        default=ASR_BATCH_SIZE,
+        help="Whisper windows per encoder/decoder batch"
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        default=PIPELINED,
+        help="Run decode / language ID / ASR / translation / embedding as overlapping per-chunk stages"
+    )
+    parser.add_argument("--stage-queue-size", type=int, default=STAGE_QUEUE_SIZE, help="Bound of each stage queue")
+    parser.add_argument("--export-dir", default=EXPORT_DIR)
+    parser.add_argument(
+        "--export-formats",
+        default=",".join(SUPPORTED_FORMATS),
+        help="Comma separated subset of jsonl,parquet,srt,vtt ('' to disable)"
+    )
+    parser.add_argument(
+        "--decoding-profile",
+        choices=["fast", "balanced", "accurate"],
+        default=DECODING_PROFILE,
+        help="Whisper decoding profile"
+    )
+    parser.add_argument(
+        "--profile",
+        help="Comma separated stages to profile (e.g. reduce_noise,transcribe_windows) or 'all'"
+    )
+    parser.add_argument(
+        "--profile-mode",
+        default="cprofile",
+        help="cprofile, tracemalloc or cprofile,tracemalloc"
+    )
+    parser.add_argument("--profile-every", type=int, default=1, help="Profile every Nth job")
+    parser.add_argument("--profile-dir", default="profiles")
+    return parser.parse_args()
 
-    audio_file = "Test 4.aac"
 
-    # 🔹 Step 1: Audio → ASR → Translation
-    chunks = preprocess_audio(audio_file)
+def run_conversation_stages(
+    chunks: ChunkStore,
+    progress: ProgressCallback = None,
+    embeddings: list = None,
+    exporter: TranscriptExporter = None
+):
+    """
+    Diarization → Conversation → Business insights for one recording.
+    Speakers, timeline and insights go to the exporter as each completes.
+    """
 
     # 🔹 Step 2: Speaker diarization (Phase 7.1)
-    chunks = diarize_chunks(chunks)
+    _report(progress, "diarization", 0.8)
+    try:
+        with span("diarization"):
+            chunks = diarize_chunks(chunks, embeddings=embeddings)
+    finally:
+        # Last reader of the job's audio: unmap and delete its PCM file
+        release_chunk_pcm(chunks)
+
+    if exporter is not None:
+        with span("export"):
+            exporter.write_speakers(chunks)
 
     # 🔹 Step 3: Speaker-aware conversation structuring (Phase 7.2)
-    conversation = build_conversation(chunks)
+    _report(progress, "conversation", 0.9)
+    with span("conversation"):
+        conversation = build_conversation(chunks)
+
+    if exporter is not None:
+        with span("export"):
+            for entry in conversation["timeline"]:
+                exporter.write_timeline_entry(entry)
+
+    # 🔹 Step 4: Business Key Points (LLM – optional)
+    _report(progress, "business_insights", 0.92)
+    with span("business_insights"):
+        business_insights = extract_business_key_points(
+            conversation["conversation_text"],
+            token_budget=LLM_TOKEN_BUDGET
+        )
+
+    if exporter is not None:
+        exporter.write_insights(business_insights)
+
+    return conversation, business_insights
+
+
+def open_exporters(audio_files: list[str], export_dir: str = EXPORT_DIR, formats=SUPPORTED_FORMATS) -> list:
+    """
+    One TranscriptExporter per recording (None when no formats are
+    selected), opened before processing so records stream out as they
+    complete. Names carry the job id, plus the file index in a batch,
+    so inputs with the same basename never overwrite each other.
+    """
+    if not formats:
+        return [None] * len(audio_files)
 
-    print("\n✅ PIPELINE COMPLETED SUCCESSFULLY\n")
+    job_id = current_job_id()
+    exporters = []
+    for n, audio_file in enumerate(audio_files):
+        name = os.path.splitext(os.path.basename(audio_file))[0]
+        if job_id:
+            name += f"_{job_id}"
+        if len(audio_files) > 1:
+            name += f"_{n}"
+        exporters.append(TranscriptExporter(export_dir, name, formats))
+
+    return exporters
+
+
+def print_report(audio_file: str, conversation: dict, business_insights) -> None:
+    print(f"\n✅ PIPELINE COMPLETED SUCCESSFULLY: {audio_file}\n")
 
     print("🧹 STRUCTURED CONVERSATION\n")
     print(conversation["conversation_text"])
@@ -158,11 +638,6 @@ if __name__ == "__main__":
     for t in conversation["timeline"]:
         print(f"[{t['index']}] ({t['speaker']}) {t['text']}")
 
-    # 🔹 Step 4: Business Key Points (LLM – optional)
-    business_insights = extract_business_key_points(
-        conversation["conversation_text"]
-    )
-
     if business_insights:
         print("\n🧠 BUSINESS KEY POINTS (LLM)\n")
         print("Key Points:")
@@ -179,5 +654,70 @@ if __name__ == "__main__":
 
         print(f"\nMeeting Intent   : {business_insights.get('meeting_intent')}")
         print(f"Overall Sentiment: {business_insights.get('sentiment')}")
+
+        compaction = business_insights.get("compaction")
+        if compaction:
+            print(
+                f"Prompt tokens    : {compaction['tokens_before']} → {compaction['tokens_after']} "
+                f"({compaction['turns_before']} → {compaction['turns_after']} turns)"
+            )
     else:
         print("\nℹ️ Business insights skipped (OPENAI_API_KEY not set)\n")
+
+
+if __name__ == "__main__":
+
+    args = parse_args()
+    export_formats = [f for f in args.export_formats.split(",") if f]
+
+    if args.profile:
+        configure_profiling(
+            stages=args.profile.split(","),
+            modes=args.profile_mode.split(","),
+            every=args.profile_every,
+            out_dir=args.profile_dir
+        )
+
+    with job_context(), ExitStack() as exports:
+        exporters = [
+            exports.enter_context(exporter) if exporter is not None else None
+            for exporter in open_exporters(args.audio_files, args.export_dir, export_formats)
+        ]
+
+        # 🔹 Step 1: Audio → ASR → Translation (Whisper batched across files,
+        # or overlapping per-chunk stages)
+        if args.pipelined:
+            all_chunks, all_embeddings = preprocess_audio_files_pipelined(
+                args.audio_files,
+                decoding_profile=args.decoding_profile,
+                asr_batch_size=args.asr_batch_size,
+                queue_size=args.stage_queue_size,
+                exporters=exporters
+            )
+        else:
+            all_chunks = preprocess_audio_files(
+                args.audio_files,
+                decoding_profile=args.decoding_profile,
+                asr_batch_size=args.asr_batch_size,
+                exporters=exporters
+            )
+            all_embeddings = [None] * len(all_chunks)
+
+        for audio_file, chunks, embeddings, exporter in zip(args.audio_files, all_chunks, all_embeddings, exporters):
+            conversation, business_insights = run_conversation_stages(chunks, embeddings=embeddings, exporter=exporter)
+            print_report(audio_file, conversation, business_insights)
+
+            if exporter is not None:
+                print("💾 Exported: " + ", ".join(exporter.paths.values()))
+
+    tiers = get_tier_stats()
+    print(
+        f"🔎 Language ID: {tiers['profile']} chunks by profile, {tiers['whisper']} by Whisper "
+        f"({tiers['whisper_passes_saved']:.0%} Whisper passes saved)"
+    )
+
+    cache = MODEL_CACHE.stats()
+    print(
+        f"🧠 Model cache: {cache['bytes_in_use'] / 1024 ** 2:.0f} / {cache['budget_bytes'] / 1024 ** 2:.0f} MB, "
+        f"{cache['hits']} hits, {cache['loads']} loads, {cache['evictions']} evictions"
+    )
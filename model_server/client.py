@@ -0,0 +1,151 @@
+import itertools
+import os
+import secrets
+import tempfile
+import threading
+
+# -------------------- CONFIG --------------------
+
+# "unix:/tmp/acmts-models.sock", "tcp:127.0.0.1:9110" or "host:port";
+# unset → every process loads its own models
+MODEL_SERVER_ADDRESS = os.getenv("ACMTS_MODEL_SERVER") or None
+
+# 🔑 Shared secret for the connection handshake. Replies are unpickled,
+# so there is no built-in default: set ACMTS_MODEL_SERVER_KEY, or let the
+# server generate one into MODEL_SERVER_KEY_FILE (mode 0600)
+MODEL_SERVER_KEY_FILE = os.getenv(
+    "ACMTS_MODEL_SERVER_KEY_FILE",
+    os.path.join(os.path.expanduser("~"), ".acmts", "model-server.key")
+)
+
+# ⏱️ Longest wait for one reply (seconds)
+MODEL_SERVER_TIMEOUT_SEC = float(os.getenv("ACMTS_MODEL_SERVER_TIMEOUT", "600"))
+
+# Unix socket (owner-only permissions) unless a TCP address is given
+DEFAULT_ADDRESS = "unix:" + os.path.join(tempfile.gettempdir(), "acmts-models.sock")
+
+_local = threading.local()
+_request_ids = itertools.count()
+
+
+def parse_address(address: str):
+    """
+    Server address string → (address, family) for multiprocessing.connection.
+    """
+    if address.startswith("unix:"):
+        return address[len("unix:"):], "AF_UNIX"
+
+    if address.startswith("tcp:"):
+        address = address[len("tcp:"):]
+
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Invalid model server address '{address}'. Expected unix:<path> or tcp:<host>:<port>")
+
+    return (host, int(port)), "AF_INET"
+
+
+def load_authkey(create: bool = False) -> bytes:
+    """
+    The model server key: ACMTS_MODEL_SERVER_KEY, else the key file.
+
+    With create=True (the server) a missing key file is filled with a
+    random key readable only by its owner; clients never invent a key.
+    """
+    key = os.getenv("ACMTS_MODEL_SERVER_KEY")
+    if key:
+        return key.encode()
+
+    if os.path.exists(MODEL_SERVER_KEY_FILE):
+        with open(MODEL_SERVER_KEY_FILE, "rb") as f:
+            key = f.read().strip()
+        if key:
+            return key
+
+    if not create:
+        raise RuntimeError(
+            "No model server key. Set ACMTS_MODEL_SERVER_KEY or start the model server "
+            f"first so it writes {MODEL_SERVER_KEY_FILE}"
+        )
+
+    os.makedirs(os.path.dirname(MODEL_SERVER_KEY_FILE) or ".", mode=0o700, exist_ok=True)
+    key = secrets.token_hex(32).encode()
+    fd = os.open(MODEL_SERVER_KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    os.chmod(MODEL_SERVER_KEY_FILE, 0o600)
+    print(f"🔑 Generated model server key in {MODEL_SERVER_KEY_FILE}")
+
+    return key
+
+
+class ModelServerError(RuntimeError):
+    """
+    Raised when the model server reports a failed request.
+    """
+
+
+class ModelClient:
+    """
+    Blocking client for the local model server.
+
+    One connection per client; get_model_client() keeps one client per
+    thread, so concurrent threads (and processes) land in the same
+    server-side micro-batches.
+    """
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, authkey: bytes = None, timeout: float = MODEL_SERVER_TIMEOUT_SEC):
+        from multiprocessing.connection import Client
+
+        self.address = address
+        self.timeout = timeout
+        self.closed = False
+        conn_address, family = parse_address(address)
+        self._conn = Client(conn_address, family=family, authkey=authkey or load_authkey())
+
+    def call(self, op: str, **payload):
+        request_id = next(_request_ids)
+
+        try:
+            self._conn.send({"id": request_id, "op": op, "payload": payload})
+            if not self._conn.poll(self.timeout):
+                # A late reply would be read as the answer to the next
+                # request, so the connection is dropped
+                self.close()
+                raise TimeoutError(f"Model server at {self.address} did not answer '{op}' within {self.timeout:.0f}s")
+            reply = self._conn.recv()
+        except (EOFError, OSError) as exc:
+            self.close()
+            raise ConnectionError(f"Lost connection to model server at {self.address}") from exc
+
+        if not reply["ok"]:
+            raise ModelServerError(f"Model server '{op}' failed: {reply['error']}")
+        return reply["result"]
+
+    def close(self) -> None:
+        self.closed = True
+        self._conn.close()
+
+
+def get_model_client():
+    """
+    This thread's client, or None when no model server is configured
+    (pipeline functions then run their models in-process).
+    """
+    if not MODEL_SERVER_ADDRESS:
+        return None
+
+    client = getattr(_local, "client", None)
+    if client is None or client.closed or client.address != MODEL_SERVER_ADDRESS:
+        client = ModelClient(MODEL_SERVER_ADDRESS)
+        _local.client = client
+
+    return client
+
+
+def disable_model_client() -> None:
+    """
+    Route every call in-process (used by the server itself).
+    """
+    global MODEL_SERVER_ADDRESS
+    MODEL_SERVER_ADDRESS = None
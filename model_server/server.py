@@ -0,0 +1,312 @@
+import argparse
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+
+from model_server.client import DEFAULT_ADDRESS, disable_model_client, load_authkey, parse_address
+from monitoring.metrics import span
+from utils.model_cache import MODEL_CACHE, MODEL_CACHE_BUDGET_MB
+
+# -------------------- CONFIG --------------------
+
+# Largest micro-batch handed to a model in one call
+MAX_BATCH_SIZE = 8
+
+# How long the first request of a batch waits for company (seconds)
+MAX_WAIT_SEC = 0.02
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Collect requests for one endpoint into micro-batches.
+
+    A worker thread takes the first queued request, then keeps
+    collecting until max_batch requests are in hand or max_wait has
+    passed since the first one arrived, and hands the batch to
+    handler(payloads) → results (same order). Each submit() returns a
+    Future resolved with that request's result.
+    """
+
+    def __init__(self, name: str, handler: Callable[[List[dict]], list], max_batch: int = MAX_BATCH_SIZE, max_wait: float = MAX_WAIT_SEC):
+        self.name = name
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"batcher-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, payload: dict) -> Future:
+        future = Future()
+        self._queue.put((payload, future))
+        return future
+
+    def stop(self) -> None:
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is _STOP:
+            return None, True
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._collect()
+            if not batch:
+                continue
+
+            payloads = [payload for payload, _ in batch]
+            try:
+                with span(f"model_server.{self.name}", batch=len(batch)):
+                    results = self.handler(payloads)
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+# -------------------- ENDPOINT HANDLERS --------------------
+
+def _group_by(payloads: List[dict], *keys) -> dict:
+    groups = {}
+    for idx, payload in enumerate(payloads):
+        groups.setdefault(tuple(payload.get(k) for k in keys), []).append(idx)
+    return groups
+
+
+def _handle_transcribe(payloads: List[dict]) -> list:
+    from speech_to_text.batched_asr import transcribe_windows
+
+    results = [None] * len(payloads)
+
+    # Windows of every request sharing a profile go through one batched call
+    for (profile,), indices in _group_by(payloads, "profile").items():
+        windows = [w for i in indices for w in payloads[i]["windows"]]
+        outputs = transcribe_windows(windows, batch_size=MAX_BATCH_SIZE, profile=profile)
+
+        start = 0
+        for i in indices:
+            n = len(payloads[i]["windows"])
+            results[i] = outputs[start:start + n]
+            start += n
+
+    return results
+
+
+def _handle_transcribe_runs(payloads: List[dict]) -> list:
+    from speech_to_text.batched_asr import transcribe_runs
+
+    results = [None] * len(payloads)
+
+    # Runs of every request sharing a profile are decoded in the same rounds
+    for (profile,), indices in _group_by(payloads, "profile").items():
+        runs = [run for i in indices for run in payloads[i]["runs"]]
+        outputs = transcribe_runs(runs, batch_size=MAX_BATCH_SIZE, profile=profile)
+
+        start = 0
+        for i in indices:
+            n = len(payloads[i]["runs"])
+            results[i] = outputs[start:start + n]
+            start += n
+
+    return results
+
+
+def _handle_detect_language(payloads: List[dict]) -> list:
+    from language_detection.whisper_lang_detector import detect_languages_whisper
+
+    return detect_languages_whisper([p["audio"] for p in payloads])
+
+
+def _handle_translate(payloads: List[dict]) -> list:
+    from translation.tf_translator import translate_batch
+
+    results = [None] * len(payloads)
+
+    for (src, tgt, model_name), indices in _group_by(payloads, "src_lang", "tgt_lang", "model_name").items():
+        outputs = translate_batch([payloads[i]["text"] for i in indices], src, tgt, model_name)
+        for i, text in zip(indices, outputs):
+            results[i] = text
+
+    return results
+
+
+def _handle_summarize(payloads: List[dict]) -> list:
+    from summarization.summarizer import summarize_text
+
+    # Summaries have per-request length settings; run them back to back
+    return [summarize_text(p["text"], backend=p.get("backend"), **p.get("kwargs", {})) for p in payloads]
+
+
+def _handle_embed(payloads: List[dict]) -> list:
+    from speaker_diarization.embedding_extractor import extract_embedding
+
+    return [extract_embedding(p["audio"]) for p in payloads]
+
+
+HANDLERS = {
+    "transcribe": _handle_transcribe,
+    "transcribe_runs": _handle_transcribe_runs,
+    "detect_language": _handle_detect_language,
+    "translate": _handle_translate,
+    "summarize": _handle_summarize,
+    "embed": _handle_embed,
+}
+
+
+# -------------------- SERVER --------------------
+
+class ModelServer:
+    """
+    Hosts the models once and serves pipeline processes over a Unix
+    socket or local TCP (multiprocessing.connection).
+
+    Requests are {"id", "op", "payload"}; replies are {"id", "ok",
+    "result"} or {"id", "ok": False, "error"}. Each connection gets a
+    reader thread; requests of all connections meet in the per-endpoint
+    MicroBatchers.
+    """
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, authkey: bytes = None, max_batch: int = MAX_BATCH_SIZE, max_wait: float = MAX_WAIT_SEC):
+        self.address = address
+        self.authkey = authkey or load_authkey(create=True)
+        self.batchers = {
+            op: MicroBatcher(op, handler, max_batch, max_wait)
+            for op, handler in HANDLERS.items()
+        }
+        self._listener = None
+
+    def _serve_connection(self, conn) -> None:
+        send_lock = threading.Lock()
+
+        def reply(request_id, future):
+            exc = future.exception()
+            message = {"id": request_id, "ok": exc is None}
+            if exc is None:
+                message["result"] = future.result()
+            else:
+                message["error"] = f"{type(exc).__name__}: {exc}"
+
+            with send_lock:
+                try:
+                    conn.send(message)
+                except OSError:
+                    pass  # client went away
+
+        try:
+            while True:
+                request = conn.recv()
+                batcher = self.batchers.get(request.get("op"))
+
+                if batcher is None:
+                    with send_lock:
+                        conn.send({"id": request.get("id"), "ok": False, "error": f"Unknown op '{request.get('op')}'. Supported ops are: {tuple(HANDLERS)}"})
+                    continue
+
+                future = batcher.submit(request.get("payload", {}))
+                future.add_done_callback(lambda f, request_id=request.get("id"): reply(request_id, f))
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+
+    def serve_forever(self) -> None:
+        from multiprocessing.connection import Listener
+
+        conn_address, family = parse_address(self.address)
+        if family == "AF_UNIX" and os.path.exists(conn_address):
+            os.remove(conn_address)  # stale socket from a previous run
+
+        if family == "AF_UNIX":
+            # Owner-only socket from the moment it is bound
+            old_umask = os.umask(0o177)
+            try:
+                self._listener = Listener(conn_address, family=family, authkey=self.authkey)
+            finally:
+                os.umask(old_umask)
+            os.chmod(conn_address, 0o600)
+        else:
+            self._listener = Listener(conn_address, family=family, authkey=self.authkey)
+        print(f"🧠 Model server listening on {self.address}")
+
+        try:
+            while True:
+                try:
+                    conn = self._listener.accept()
+                except Exception as exc:  # failed handshake (wrong authkey, port scan)
+                    print(f"⚠️ Rejected model server connection: {exc}")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        for batcher in self.batchers.values():
+            batcher.stop()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Local model server shared by pipeline processes")
+    parser.add_argument("--address", default=os.getenv("ACMTS_MODEL_SERVER") or DEFAULT_ADDRESS,
+                        help="unix:<path> or tcp:<host>:<port>")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_SEC * 1000)
+    parser.add_argument("--translation-model", default="facebook/nllb-200-distilled-600M")
+    parser.add_argument("--summarization-model", default=None)
+    parser.add_argument("--no-warmup", action="store_true")
+    parser.add_argument("--model-cache-mb", type=int, default=MODEL_CACHE_BUDGET_MB,
+                        help="Memory budget for cached translation / summarization models")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_args()
+
+    # The server runs every model in-process, never through itself
+    disable_model_client()
+    MODEL_CACHE.budget_bytes = args.model_cache_mb * 1024 ** 2
+
+    if not args.no_warmup:
+        from utils.warmup import warm_up_models
+        warm_up_models(
+            translation_model=args.translation_model,
+            summarization_model=args.summarization_model
+        )
+
+    ModelServer(
+        args.address,
+        max_batch=args.max_batch,
+        max_wait=args.max_wait_ms / 1000
+    ).serve_forever()
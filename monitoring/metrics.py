@@ -0,0 +1,280 @@
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# -------------------- CONFIG --------------------
+
+# Disabled by default: span() then costs one attribute lookup and a yield
+METRICS_ENABLED = os.getenv("ACMTS_METRICS", "0") == "1"
+
+METRICS_LOG_PATH = os.getenv("ACMTS_METRICS_LOG", os.path.join("metrics", "spans.jsonl"))
+METRICS_PROM_PATH = os.getenv("ACMTS_METRICS_PROM", os.path.join("metrics", "metrics.prom"))
+
+# Numeric span attributes that are aggregated into Prometheus counters
+COUNTED_ATTRS = ("audio_seconds", "tokens_in", "tokens_out")
+
+_lock = threading.Lock()
+_context = threading.local()
+
+_stage_seconds = defaultdict(float)
+_stage_calls = defaultdict(int)
+_attr_totals = defaultdict(float)
+_cache_events = defaultdict(int)
+_language_tiers = defaultdict(int)
+_peak_rss_bytes = 0
+
+
+def enable_metrics(enabled: bool = True) -> None:
+    """
+    Turn instrumentation on or off at runtime.
+    """
+    global METRICS_ENABLED
+    METRICS_ENABLED = enabled
+
+
+def _peak_rss() -> int:
+    """
+    Peak resident set size of this process in bytes (0 if unavailable).
+    """
+    if resource is None:
+        return 0
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _emit(record: dict) -> None:
+    directory = os.path.dirname(METRICS_LOG_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    line = json.dumps(record, default=str)
+    with _lock:
+        with open(METRICS_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+# -------------------- CONTEXT --------------------
+
+def current_job_id():
+    return getattr(_context, "job_id", None)
+
+
+_job_end_hooks = []
+
+
+def add_job_end_hook(callback) -> None:
+    """
+    Call callback(job_id) whenever a job_context exits, so per-job state
+    kept elsewhere (e.g. the profiler) can be dropped.
+    """
+    _job_end_hooks.append(callback)
+
+
+@contextmanager
+def job_context(job_id: str = None):
+    """
+    Tag every span recorded on this thread with a job id.
+    """
+    job_id = job_id or uuid.uuid4().hex[:12]
+    previous = current_job_id()
+    _context.job_id = job_id
+
+    try:
+        with span("job"):
+            yield job_id
+    finally:
+        _context.job_id = previous
+        for callback in _job_end_hooks:
+            callback(job_id)
+        if METRICS_ENABLED:
+            write_prometheus()
+
+
+@contextmanager
+def inherit_job(job_id: str):
+    """
+    Tag spans on a worker thread with a job id opened on another thread
+    (no extra "job" span).
+    """
+    previous = current_job_id()
+    _context.job_id = job_id
+
+    try:
+        yield job_id
+    finally:
+        _context.job_id = previous
+
+
+# -------------------- SPANS --------------------
+
+@contextmanager
+def span(stage: str, chunk_id: int = None, **attrs):
+    """
+    Time a pipeline stage or model call.
+
+    The yielded dict can be filled with extra attributes while the span is
+    open (audio_seconds, tokens_in, tokens_out, cache_hit, ...).
+    """
+    if not METRICS_ENABLED:
+        yield attrs
+        return
+
+    global _peak_rss_bytes
+
+    start = time.perf_counter()
+    status = "ok"
+
+    try:
+        yield attrs
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        peak = _peak_rss()
+
+        with _lock:
+            _stage_seconds[stage] += duration
+            _stage_calls[stage] += 1
+            for name in COUNTED_ATTRS:
+                value = attrs.get(name)
+                if value:
+                    _attr_totals[(stage, name)] += value
+            _peak_rss_bytes = max(_peak_rss_bytes, peak)
+
+        record = {
+            "ts": time.time(),
+            "job_id": current_job_id(),
+            "stage": stage,
+            "chunk_id": chunk_id,
+            "duration_s": round(duration, 6),
+            "status": status,
+            "peak_rss_bytes": peak,
+        }
+        record.update(attrs)
+        _emit(record)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """
+    Count a model/tokenizer cache lookup.
+    """
+    if not METRICS_ENABLED:
+        return
+
+    with _lock:
+        _cache_events[(cache, "hit" if hit else "miss")] += 1
+
+
+def record_language_tier(tier: str) -> None:
+    """
+    Count which tier of the language detector decided a chunk.
+    """
+    if not METRICS_ENABLED:
+        return
+
+    with _lock:
+        _language_tiers[tier] += 1
+
+
+# -------------------- PROMETHEUS --------------------
+
+def render_prometheus() -> str:
+    """
+    Render the aggregated metrics in Prometheus text exposition format.
+    """
+    lines = [
+        "# HELP acmts_stage_seconds Time spent in each pipeline stage.",
+        "# TYPE acmts_stage_seconds summary",
+    ]
+
+    with _lock:
+        for stage in sorted(_stage_seconds):
+            lines.append(f'acmts_stage_seconds_sum{{stage="{stage}"}} {_stage_seconds[stage]:.6f}')
+            lines.append(f'acmts_stage_seconds_count{{stage="{stage}"}} {_stage_calls[stage]}')
+
+        for name in COUNTED_ATTRS:
+            metric = f"acmts_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for (stage, attr), value in sorted(_attr_totals.items()):
+                if attr == name:
+                    lines.append(f'{metric}{{stage="{stage}"}} {value:g}')
+
+        lines.append("# TYPE acmts_cache_requests_total counter")
+        for (cache, result), count in sorted(_cache_events.items()):
+            lines.append(f'acmts_cache_requests_total{{cache="{cache}",result="{result}"}} {count}')
+
+        lines.append("# TYPE acmts_language_detections_total counter")
+        for tier, count in sorted(_language_tiers.items()):
+            lines.append(f'acmts_language_detections_total{{tier="{tier}"}} {count}')
+
+        lines.append("# TYPE acmts_peak_rss_bytes gauge")
+        lines.append(f"acmts_peak_rss_bytes {_peak_rss_bytes}")
+
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str = None) -> str:
+    """
+    Write the metrics to a textfile-collector compatible file.
+    """
+    import tempfile
+
+    path = path or METRICS_PROM_PATH
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Unique temp file per writer: jobs ending together never replace
+    # each other's half-written file
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(render_prometheus())
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600; the collector must read it
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return path
+
+
+def start_metrics_server(port: int = 9108, host: str = "127.0.0.1"):
+    """
+    Serve /metrics over HTTP from a daemon thread.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,189 @@
+import cProfile
+import functools
+import os
+import threading
+import tracemalloc
+from collections import defaultdict
+
+from monitoring.metrics import add_job_end_hook, current_job_id
+
+# -------------------- CONFIG --------------------
+
+# Comma separated function names to profile, or "all"
+PROFILE_STAGES = {s.strip() for s in os.getenv("ACMTS_PROFILE", "").split(",") if s.strip()}
+
+# cprofile, tracemalloc or both ("cprofile,tracemalloc")
+PROFILE_MODES = {s.strip() for s in os.getenv("ACMTS_PROFILE_MODE", "cprofile").split(",") if s.strip()}
+
+# Only profile every Nth job
+PROFILE_EVERY = max(1, int(os.getenv("ACMTS_PROFILE_EVERY", "1")))
+
+PROFILE_DIR = os.getenv("ACMTS_PROFILE_DIR", "profiles")
+PROFILE_TOP_N = int(os.getenv("ACMTS_PROFILE_TOP", "25"))
+
+_lock = threading.Lock()
+_active = threading.local()
+
+# Per-job state, dropped when the job ends (see _forget_job)
+_job_sequence = {}
+_call_counter = defaultdict(lambda: defaultdict(int))
+_jobs_seen = 0
+
+# tracemalloc is process-wide: concurrent stages share one tracing
+# session, stopped only when the last of them finishes
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+
+
+def configure_profiling(
+    stages=None,
+    modes=None,
+    every: int = None,
+    out_dir: str = None,
+    top_n: int = None
+) -> None:
+    """
+    Override the environment configuration (used by CLI flags).
+    """
+    global PROFILE_STAGES, PROFILE_MODES, PROFILE_EVERY, PROFILE_DIR, PROFILE_TOP_N
+
+    if stages is not None:
+        PROFILE_STAGES = set(stages)
+    if modes is not None:
+        PROFILE_MODES = set(modes)
+    if every is not None:
+        PROFILE_EVERY = max(1, every)
+    if out_dir is not None:
+        PROFILE_DIR = out_dir
+    if top_n is not None:
+        PROFILE_TOP_N = top_n
+
+
+def _job_is_sampled(job_id: str) -> bool:
+    global _jobs_seen
+
+    with _lock:
+        if job_id not in _job_sequence:
+            _job_sequence[job_id] = _jobs_seen
+            _jobs_seen += 1
+        return _job_sequence[job_id] % PROFILE_EVERY == 0
+
+
+def _forget_job(job_id: str) -> None:
+    with _lock:
+        _job_sequence.pop(job_id, None)
+        _call_counter.pop(job_id, None)
+
+
+add_job_end_hook(_forget_job)
+
+
+def _should_profile(stage: str) -> bool:
+    if not PROFILE_STAGES:
+        return False
+    if stage not in PROFILE_STAGES and "all" not in PROFILE_STAGES:
+        return False
+    if getattr(_active, "running", False):
+        return False  # cProfile cannot nest; the outer stage already covers it
+
+    return _job_is_sampled(current_job_id() or "adhoc")
+
+
+def _output_prefix(stage: str) -> str:
+    job_id = current_job_id() or "adhoc"
+
+    with _lock:
+        seq = _call_counter[job_id][stage]
+        _call_counter[job_id][stage] += 1
+
+    job_dir = os.path.join(PROFILE_DIR, job_id)
+    os.makedirs(job_dir, exist_ok=True)
+
+    return os.path.join(job_dir, f"{stage}_{seq}")
+
+
+def _start_tracemalloc() -> int:
+    """
+    Join (or open) the shared tracing session; returns the number of
+    other stages already being traced.
+    """
+    global _tracemalloc_users, _tracemalloc_owned
+
+    with _lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+        return _tracemalloc_users - 1
+
+
+def _stop_tracemalloc() -> None:
+    global _tracemalloc_users, _tracemalloc_owned
+
+    with _lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+
+
+def _write_allocation_report(path: str, before, after, overlapping: int) -> None:
+    stats = after.compare_to(before, "lineno")
+
+    with open(path, "w", encoding="utf-8") as f:
+        total = sum(stat.size_diff for stat in stats)
+        f.write(f"Net allocated: {total / 1024:.1f} KiB\n")
+        if overlapping:
+            # tracemalloc cannot tell threads apart
+            f.write(f"Note: {overlapping} other traced stage(s) ran concurrently; their allocations are included\n")
+        f.write(f"Top {PROFILE_TOP_N} allocation sites:\n\n")
+
+        for stat in stats[:PROFILE_TOP_N]:
+            f.write(f"{stat}\n")
+
+
+# -------------------- DECORATOR --------------------
+
+def profile_stage(stage: str):
+    """
+    Wrap a stage function in cProfile and/or tracemalloc when it has been
+    selected via ACMTS_PROFILE (or configure_profiling).
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _should_profile(stage):
+                return func(*args, **kwargs)
+
+            prefix = _output_prefix(stage)
+            profiler = cProfile.Profile() if "cprofile" in PROFILE_MODES else None
+            use_tracemalloc = "tracemalloc" in PROFILE_MODES
+            overlapping = 0
+            before = None
+
+            if use_tracemalloc:
+                overlapping = _start_tracemalloc()
+                before = tracemalloc.take_snapshot()
+
+            _active.running = True
+            try:
+                if profiler is not None:
+                    return profiler.runcall(func, *args, **kwargs)
+                return func(*args, **kwargs)
+            finally:
+                _active.running = False
+
+                if profiler is not None:
+                    profiler.dump_stats(prefix + ".prof")
+
+                if use_tracemalloc:
+                    try:
+                        after = tracemalloc.take_snapshot()
+                        _write_allocation_report(prefix + "_alloc.txt", before, after, overlapping)
+                    finally:
+                        _stop_tracemalloc()
+
+        return wrapper
+
+    return decorator
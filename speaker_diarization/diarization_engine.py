@@ -1,15 +1,29 @@
+from audio_preprocessing.pcm_store import PcmView
 from speaker_diarization.embedding_extractor import extract_embedding
 from speaker_diarization.speaker_cluster import cluster_speakers
 
 
-def diarize_chunks(chunks: list[dict]) -> list[dict]:
+def diarize_chunks(chunks: list[dict], embeddings: list = None) -> list[dict]:
     """
-    Assign speaker IDs to each chunk.
+    Assign speaker IDs to each chunk (dicts or ChunkStore rows).
+
+    Audio is read from the job's memory-mapped PCM file when the chunk
+    carries a pcm_path, otherwise from the chunk WAV at chunk["path"].
+    Embeddings already computed (e.g. by the pipelined executor) are
+    passed in one per chunk and only the missing ones are extracted.
     """
 
+    precomputed = embeddings or [None] * len(chunks)
     embeddings = []
-    for chunk in chunks:
-        emb = extract_embedding(chunk["path"])
+    for chunk, emb in zip(chunks, precomputed):
+        if emb is not None:
+            embeddings.append(emb)
+            continue
+        if chunk.get("pcm_path"):
+            audio = PcmView.from_chunk(chunk).samples
+        else:
+            audio = chunk["path"]
+        emb = extract_embedding(audio)
         embeddings.append(emb)
 
     labels = cluster_speakers(embeddings)
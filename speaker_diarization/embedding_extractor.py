@@ -1,13 +1,53 @@
-from resemblyzer import VoiceEncoder, preprocess_wav
+import threading
+from typing import Union
+
 import numpy as np
 
-_encoder = VoiceEncoder()
+from audio_preprocessing.resampler import load_wav_16k
+from model_server.client import get_model_client
+from monitoring.metrics import span
+from monitoring.profiler import profile_stage
+
+_encoder = None
+_lock = threading.Lock()
 
 
-def extract_embedding(wav_path: str) -> np.ndarray:
+def get_voice_encoder():
     """
-    Extract speaker embedding from an audio chunk.
+    Build the Resemblyzer encoder on first use.
+    """
+    global _encoder
+
+    if _encoder is None:
+        with _lock:
+            if _encoder is None:
+                from resemblyzer import VoiceEncoder
+                _encoder = VoiceEncoder()
+
+    return _encoder
+
+
+@profile_stage("extract_embedding")
+def extract_embedding(audio: Union[str, np.ndarray]) -> np.ndarray:
     """
-    wav = preprocess_wav(wav_path)
-    embedding = _encoder.embed_utterance(wav)
+    Extract speaker embedding from an audio chunk (WAV path or 16 kHz array).
+    """
+    if isinstance(audio, str):
+        audio, sr = load_wav_16k(audio)
+    else:
+        sr = 16000
+
+    remote = get_model_client()
+    if remote is not None:
+        return remote.call("embed", audio=np.asarray(audio, dtype=np.float32))
+
+    from resemblyzer import preprocess_wav
+
+    encoder = get_voice_encoder()
+
+    # Already 16 kHz: preprocess_wav only normalizes volume and trims silence
+    wav = preprocess_wav(audio, source_sr=sr)
+
+    with span("resemblyzer.embed", audio_seconds=len(wav) / sr):
+        embedding = encoder.embed_utterance(wav)
     return embedding
@@ -1,8 +1,9 @@
 import numpy as np
-from sklearn.cluster import AgglomerativeClustering
-from sklearn.metrics.pairwise import cosine_similarity
 
+from monitoring.profiler import profile_stage
 
+
+@profile_stage("cluster_speakers")
 def cluster_speakers(
     embeddings: list[np.ndarray],
     similarity_threshold: float = 0.75
@@ -15,6 +16,9 @@ def cluster_speakers(
     if len(embeddings) == 1:
         return [0]
 
+    from sklearn.cluster import AgglomerativeClustering
+    from sklearn.metrics.pairwise import cosine_similarity
+
     similarity_matrix = cosine_similarity(embeddings)
 
     clustering = AgglomerativeClustering(
@@ -0,0 +1,413 @@
+import dataclasses
+from typing import List
+
+import numpy as np
+
+from model_server.client import get_model_client
+from monitoring.metrics import span
+from monitoring.profiler import profile_stage
+from speech_to_text.decoding_profiles import DEFAULT_PROFILE, get_decoding_options
+from speech_to_text.whisper_model import MODEL_NAME, get_whisper_model
+from speech_to_text.window_packing import offset_segments, split_into_windows
+
+SAMPLE_RATE = 16000
+
+# Seconds per Whisper timestamp token
+TIME_PRECISION = 0.02
+
+# Samples per Whisper window / per timestamp token
+N_SAMPLES = 30 * SAMPLE_RATE
+SAMPLES_PER_TOKEN = int(TIME_PRECISION * SAMPLE_RATE)
+
+# Previous-text tokens passed as the prompt (Whisper's n_text_ctx // 2 - 1)
+MAX_PROMPT_TOKENS = 223
+
+ASR_BATCH_SIZE = 8
+
+
+def _needs_fallback(result, options: dict) -> bool:
+    """
+    Same acceptance rule as whisper.transcribe's temperature fallback.
+    """
+    if result.compression_ratio > options["compression_ratio_threshold"]:
+        return True
+
+    if result.avg_logprob < options["logprob_threshold"]:
+        # Silence is not worth re-decoding
+        return result.no_speech_prob <= options["no_speech_threshold"]
+
+    return False
+
+
+def _is_silence(result, options: dict) -> bool:
+    return (
+        result.no_speech_prob > options["no_speech_threshold"]
+        and result.avg_logprob < options["logprob_threshold"]
+    )
+
+
+def _tokens_to_segments(result, tokenizer, duration: float, tokens: list = None, seek: int = 0) -> List[dict]:
+    """
+    Split a decoded token sequence (result.tokens, or the given prefix of
+    it) into segments at its timestamp tokens.
+    """
+    timestamp_begin = tokenizer.timestamp_begin
+    segments = []
+    seg_start = None
+    text_tokens = []
+
+    def flush(start, end):
+        segments.append({
+            "id": len(segments),
+            "seek": seek,
+            "start": start,
+            "end": min(max(end, start), duration),
+            "text": tokenizer.decode(text_tokens),
+            "tokens": list(text_tokens),
+            "temperature": result.temperature,
+            "avg_logprob": result.avg_logprob,
+            "compression_ratio": result.compression_ratio,
+            "no_speech_prob": result.no_speech_prob,
+        })
+
+    for token in (result.tokens if tokens is None else tokens):
+        if token < timestamp_begin:
+            text_tokens.append(token)
+            continue
+
+        time = (token - timestamp_begin) * TIME_PRECISION
+        if seg_start is not None and text_tokens:
+            flush(seg_start, time)
+            text_tokens = []
+            seg_start = None
+        else:
+            seg_start = time
+
+    if text_tokens:
+        flush(seg_start or 0.0, duration)
+
+    return segments
+
+
+def _decode_prompted(model, mel, decode_options, prompts: list) -> list:
+    """
+    whisper.decode with a different prompt for every row of mel.
+
+    Whisper's text decoder has no padding mask, so the prompts must all
+    have the same length; each row's initial tokens are swapped in just
+    before the sampling loop.
+    """
+    import torch
+    from whisper.decoding import DecodingTask
+
+    class PromptedDecodingTask(DecodingTask):
+        def _main_loop(self, audio_features, tokens):
+            head, tail = self.initial_tokens[:1], self.initial_tokens[1 + len(prompts[0]):]
+            rows = torch.tensor([head + tuple(prompt) + tail for prompt in prompts], device=tokens.device)
+            return super()._main_loop(audio_features, rows.repeat_interleave(self.n_group, dim=0))
+
+    with torch.no_grad():
+        return PromptedDecodingTask(model, dataclasses.replace(decode_options, prompt=list(prompts[0]))).run(mel)
+
+
+def _decode_batch(model, mel, language: str, options: dict, prompts: list = None) -> list:
+    """
+    Decode a stack of mel windows (or encoder outputs) in lockstep,
+    re-decoding only the windows that fail the quality thresholds at the
+    next temperature. prompts, when given, holds one equal-length token
+    prompt per window.
+    """
+    import whisper
+
+    temperatures = options["temperature"]
+    if isinstance(temperatures, (int, float)):
+        temperatures = (temperatures,)
+
+    results = [None] * mel.shape[0]
+    pending = list(range(mel.shape[0]))
+
+    for t in temperatures:
+        if not pending:
+            break
+
+        decode_options = whisper.DecodingOptions(
+            task="transcribe",
+            language=language,
+            temperature=t,
+            fp16=False,
+            without_timestamps=options.get("without_timestamps", False),
+            beam_size=options.get("beam_size") if t == 0 else None,
+            best_of=options.get("best_of") if t > 0 else None,
+        )
+
+        if prompts:
+            decoded = _decode_prompted(model, mel[pending], decode_options, [prompts[i] for i in pending])
+        else:
+            decoded = whisper.decode(model, mel[pending], decode_options)
+
+        retry = []
+        for idx, result in zip(pending, decoded):
+            results[idx] = result
+            if t != temperatures[-1] and _needs_fallback(result, options):
+                retry.append(idx)
+        pending = retry
+
+    return results
+
+
+@profile_stage("transcribe_windows")
+def transcribe_windows(
+    windows: List[dict],
+    batch_size: int = ASR_BATCH_SIZE,
+    profile: str = DEFAULT_PROFILE
+) -> List[dict]:
+    """
+    Transcribe many independent <= 30 s windows with batched
+    encoder/decoder passes (no context between windows; see
+    transcribe_runs for continuous audio).
+
+    Each window is {"audio": float32 16 kHz array, "language": code, ...};
+    windows may come from different recordings. Windows are grouped by
+    language (Whisper decodes one language per batch) and stacked into
+    mel batches of batch_size. Results come back in input order as
+    {"text", "segments", "language", "model"} with segment times relative
+    to the window start.
+    """
+    if not windows:
+        return []
+
+    remote = get_model_client()
+    if remote is not None:
+        return remote.call("transcribe", windows=windows, profile=profile)
+
+    import torch
+    import whisper
+
+    model = get_whisper_model()
+    options = get_decoding_options(profile)
+    n_mels = model.dims.n_mels
+
+    outputs = [None] * len(windows)
+
+    by_language = {}
+    for idx, window in enumerate(windows):
+        by_language.setdefault(window.get("language"), []).append(idx)
+
+    for language, indices in by_language.items():
+        tokenizer = whisper.tokenizer.get_tokenizer(
+            model.is_multilingual,
+            num_languages=model.num_languages,
+            language=language,
+            task="transcribe"
+        )
+
+        for start in range(0, len(indices), batch_size):
+            batch = indices[start:start + batch_size]
+            audio_seconds = sum(len(windows[i]["audio"]) for i in batch) / SAMPLE_RATE
+
+            mel = torch.stack([
+                whisper.log_mel_spectrogram(
+                    whisper.pad_or_trim(np.asarray(windows[i]["audio"], dtype=np.float32)),
+                    n_mels
+                )
+                for i in batch
+            ]).to(model.device)
+
+            with span("whisper.decode_batch", model=MODEL_NAME, batch=len(batch), audio_seconds=audio_seconds) as s:
+                results = _decode_batch(model, mel, language, options)
+                s["tokens_out"] = sum(len(r.tokens) for r in results)
+
+            for idx, result in zip(batch, results):
+                duration = len(windows[idx]["audio"]) / SAMPLE_RATE
+
+                if _is_silence(result, options):
+                    segments = []
+                else:
+                    segments = _tokens_to_segments(result, tokenizer, duration)
+
+                outputs[idx] = {
+                    "text": "".join(seg["text"] for seg in segments),
+                    "segments": segments,
+                    "language": language or result.language,
+                    "model": MODEL_NAME,
+                }
+
+    return outputs
+
+
+def _advance(result, tokenizer, window_samples: int) -> tuple:
+    """
+    Where decoding of a run continues after this window, as in
+    whisper.transcribe: at the last complete timestamp pair, unless the
+    window ended on a single timestamp (its speech is complete). Returns
+    (tokens to keep, samples consumed).
+    """
+    tokens = list(result.tokens)
+    timestamp_begin = tokenizer.timestamp_begin
+    is_ts = [t >= timestamp_begin for t in tokens]
+
+    single_timestamp_ending = is_ts[-2:] == [False, True]
+    consecutive = [i for i in range(1, len(tokens)) if is_ts[i - 1] and is_ts[i]]
+
+    if consecutive and not single_timestamp_ending:
+        last = consecutive[-1]
+        consumed = (tokens[last - 1] - timestamp_begin) * SAMPLES_PER_TOKEN
+        if consumed > 0:
+            # The words after the last complete segment are decoded again
+            # at the start of the next window
+            return tokens[:last], min(consumed, window_samples)
+
+    return tokens, window_samples
+
+
+def _transcribe_runs_seeking(runs: List[dict], batch_size: int, options: dict) -> List[dict]:
+    import torch
+    import whisper
+
+    model = get_whisper_model()
+    n_mels = model.dims.n_mels
+    condition = options.get("condition_on_previous_text", False)
+
+    states = [{"seek": 0, "tokens": [], "prompt_from": 0, "segments": []} for _ in runs]
+    tokenizers = {}
+
+    while True:
+        active = [r for r, run in enumerate(runs) if states[r]["seek"] < len(run["audio"])]
+        if not active:
+            break
+
+        # One round: the next window of every unfinished run
+        by_language = {}
+        for r in active:
+            by_language.setdefault(runs[r].get("language"), []).append(r)
+
+        for language, indices in by_language.items():
+            if language not in tokenizers:
+                tokenizers[language] = whisper.tokenizer.get_tokenizer(
+                    model.is_multilingual,
+                    num_languages=model.num_languages,
+                    language=language,
+                    task="transcribe"
+                )
+            tokenizer = tokenizers[language]
+
+            for start in range(0, len(indices), batch_size):
+                batch = indices[start:start + batch_size]
+                audios = [
+                    np.asarray(runs[r]["audio"][states[r]["seek"]:states[r]["seek"] + N_SAMPLES], dtype=np.float32)
+                    for r in batch
+                ]
+                prompts = [
+                    states[r]["tokens"][states[r]["prompt_from"]:][-MAX_PROMPT_TOKENS:] if condition else []
+                    for r in batch
+                ]
+
+                mel = torch.stack([
+                    whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), n_mels) for audio in audios
+                ]).to(model.device)
+
+                with span("whisper.decode_batch", model=MODEL_NAME, batch=len(batch),
+                          audio_seconds=sum(len(a) for a in audios) / SAMPLE_RATE) as s:
+                    # Encoder batched for the whole round; the decoder is
+                    # batched over windows whose prompts have the same
+                    # length. Runs past their first minute or so all carry
+                    # a full MAX_PROMPT_TOKENS prompt and share one batch.
+                    with torch.no_grad():
+                        features = model.embed_audio(mel)
+
+                    by_length = {}
+                    for i, prompt in enumerate(prompts):
+                        by_length.setdefault(len(prompt), []).append(i)
+
+                    results = [None] * len(batch)
+                    for length, rows in by_length.items():
+                        group_prompts = [prompts[i] for i in rows] if length else None
+                        for i, result in zip(rows, _decode_batch(model, features[rows], language, options, group_prompts)):
+                            results[i] = result
+
+                    s["tokens_out"] = sum(len(r.tokens) for r in results)
+
+                for r, audio, result in zip(batch, audios, results):
+                    state = states[r]
+
+                    if _is_silence(result, options):
+                        state["seek"] += len(audio)
+                        continue
+
+                    tokens, consumed = _advance(result, tokenizer, len(audio))
+                    offset = state["seek"] / SAMPLE_RATE
+                    segments = _tokens_to_segments(result, tokenizer, consumed / SAMPLE_RATE, tokens=tokens, seek=state["seek"])
+                    state["segments"].extend(offset_segments(segments, offset))
+
+                    state["tokens"].extend(tokens)
+                    if result.temperature > 0.5:
+                        # A high-temperature fallback is unreliable context
+                        state["prompt_from"] = len(state["tokens"])
+                    state["seek"] += consumed
+
+    return [
+        {
+            "text": "".join(seg["text"] for seg in state["segments"]),
+            "segments": state["segments"],
+            "language": run.get("language"),
+            "model": MODEL_NAME,
+        }
+        for run, state in zip(runs, states)
+    ]
+
+
+@profile_stage("transcribe_runs")
+def transcribe_runs(
+    runs: List[dict],
+    batch_size: int = ASR_BATCH_SIZE,
+    profile: str = DEFAULT_PROFILE
+) -> List[dict]:
+    """
+    Transcribe continuous same-language runs of audio of any length.
+
+    Each run is {"audio": float32 16 kHz array, "language": code} plus
+    optional "cuts" (sample offsets of chunk boundaries in the run). With
+    timestamp profiles, each run is decoded window by window like
+    whisper.transcribe: the next window starts at the last complete
+    timestamp (words straddling a 30 s cut are decoded again, not split)
+    and, when the profile sets condition_on_previous_text, the run's
+    previous tokens are the prompt. Windows of different runs are
+    batched per round, prompted ones with others whose prompt has the
+    same token length (all of them once runs reach MAX_PROMPT_TOKENS of
+    history). Profiles without timestamps return one segment
+    per window, so windows are cut at every chunk boundary as well as
+    every 30 s and decoded fully batched without context.
+
+    Results are {"text", "segments", "language", "model"} per run, with
+    segment times relative to the run start.
+    """
+    if not runs:
+        return []
+
+    remote = get_model_client()
+    if remote is not None:
+        return remote.call("transcribe_runs", runs=runs, profile=profile)
+
+    options = get_decoding_options(profile)
+
+    if not options.get("without_timestamps", False):
+        return _transcribe_runs_seeking(runs, batch_size, options)
+
+    windows = []
+    owners = []
+    for r, run in enumerate(runs):
+        for offset, audio in split_into_windows(run["audio"], SAMPLE_RATE, cuts=run.get("cuts")):
+            windows.append({"audio": audio, "language": run.get("language"), "offset": offset})
+            owners.append(r)
+
+    results = transcribe_windows(windows, batch_size=batch_size, profile=profile)
+
+    outputs = [
+        {"text": "", "segments": [], "language": run.get("language"), "model": MODEL_NAME}
+        for run in runs
+    ]
+    for r, window, result in zip(owners, windows, results):
+        outputs[r]["segments"].extend(offset_segments(result["segments"], window["offset"]))
+        outputs[r]["text"] += result["text"]
+
+    return outputs
@@ -0,0 +1,58 @@
+# -------------------- WHISPER DECODING PROFILES --------------------
+#
+# fast      → bulk / overnight jobs: greedy, no temperature fallback,
+#             no cross-window conditioning, no timestamp tokens
+# balanced  → Whisper's own transcribe() defaults (previous behaviour)
+# accurate  → flagged meetings: beam search plus full fallback schedule
+
+DEFAULT_PROFILE = "balanced"
+
+FALLBACK_TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+
+DECODING_PROFILES = {
+    "fast": {
+        "beam_size": None,
+        "best_of": None,
+        "temperature": (0.0,),
+        "compression_ratio_threshold": 2.4,
+        "logprob_threshold": -1.0,
+        "no_speech_threshold": 0.6,
+        "condition_on_previous_text": False,
+        "without_timestamps": True,
+    },
+    "balanced": {
+        "beam_size": None,
+        "best_of": None,
+        "temperature": FALLBACK_TEMPERATURES,
+        "compression_ratio_threshold": 2.4,
+        "logprob_threshold": -1.0,
+        "no_speech_threshold": 0.6,
+        "condition_on_previous_text": True,
+        "without_timestamps": False,
+    },
+    "accurate": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": FALLBACK_TEMPERATURES,
+        "compression_ratio_threshold": 2.4,
+        "logprob_threshold": -1.0,
+        "no_speech_threshold": 0.6,
+        "condition_on_previous_text": True,
+        "without_timestamps": False,
+    },
+}
+
+
+def get_decoding_options(profile: str = None) -> dict:
+    """
+    Return the Whisper transcribe() keyword arguments for a profile.
+    """
+    profile = profile or DEFAULT_PROFILE
+
+    if profile not in DECODING_PROFILES:
+        raise ValueError(
+            f"Unknown decoding profile '{profile}'. Available profiles are: {tuple(DECODING_PROFILES)}"
+        )
+
+    # Whisper rejects explicit None for some options, so drop unset ones
+    return {k: v for k, v in DECODING_PROFILES[profile].items() if v is not None}
@@ -1,32 +1,43 @@
-import os
-import whisper
+from typing import Union
 
-MODEL_NAME = "small"
+import numpy as np
 
-# 🔥 SAME cache directory as language detection
-CACHE_DIR = r"D:\.cache\whisper"
-os.makedirs(CACHE_DIR, exist_ok=True)
+from monitoring.metrics import span
+from monitoring.profiler import profile_stage
+from speech_to_text.decoding_profiles import DEFAULT_PROFILE, get_decoding_options
+from speech_to_text.whisper_model import MODEL_NAME, get_whisper_model
 
-# Load Whisper model explicitly from D drive
-model = whisper.load_model(
-    MODEL_NAME,
-    download_root=CACHE_DIR
-)
 
-
-def transcribe_audio(audio_path: str, language: str = None) -> dict:
+@profile_stage("transcribe_audio")
+def transcribe_audio(audio_path: Union[str, np.ndarray], language: str = None, profile: str = DEFAULT_PROFILE) -> dict:
     """
     Transcribe audio using Whisper ASR.
+
+    audio_path may also be a 16 kHz mono float32 array.
+
+    profile selects a decoding profile (fast / balanced / accurate), see
+    speech_to_text.decoding_profiles.
     """
-    result = model.transcribe(
-        audio_path,
-        language=language,
-        fp16=False
-    )
+    model = get_whisper_model()
+    options = get_decoding_options(profile)
+
+    with span("whisper.transcribe", model=MODEL_NAME, profile=profile) as s:
+        result = model.transcribe(
+            audio_path,
+            language=language,
+            fp16=False,
+            **options
+        )
+
+        segments = result["segments"]
+        if segments:
+            s["audio_seconds"] = segments[-1]["end"]
+        s["tokens_out"] = sum(len(seg.get("tokens", [])) for seg in segments)
 
     return {
         "text": result["text"],
         "segments": result["segments"],
         "language": result.get("language"),
-        "model": MODEL_NAME
+        "model": MODEL_NAME,
+        "profile": profile
     }
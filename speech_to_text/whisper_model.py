@@ -0,0 +1,58 @@
+import os
+import threading
+
+from utils import quantization
+
+MODEL_NAME = "small"
+
+# 🔥 One cache directory for ASR and language detection
+CACHE_DIR = r"D:\.cache\whisper"
+
+_MODEL = None
+_lock = threading.Lock()
+
+
+def load_whisper_model(model_name: str = MODEL_NAME, quantize: bool = False):
+    """
+    Load a Whisper model, optionally int8-quantized for CPU inference.
+    """
+    import whisper
+
+    def load_fp32():
+        return whisper.load_model(
+            model_name,
+            device="cpu" if quantize else None,
+            download_root=CACHE_DIR
+        )
+
+    def build_empty(checkpoint):
+        from whisper.model import ModelDimensions, Whisper
+
+        model = Whisper(ModelDimensions(**checkpoint["dims"]))
+        alignment_heads = getattr(whisper, "_ALIGNMENT_HEADS", {}).get(model_name)
+        if alignment_heads is not None:
+            model.set_alignment_heads(alignment_heads)
+        return model
+
+    if quantize:
+        return quantization.load_quantized(f"whisper-{model_name}", load_fp32, build_empty)
+
+    return load_fp32()
+
+
+def get_whisper_model():
+    """
+    Load the shared Whisper model on first use.
+
+    Language detection and ASR both use this instance, so the weights are
+    only ever loaded once per process.
+    """
+    global _MODEL
+
+    if _MODEL is None:
+        with _lock:
+            if _MODEL is None:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                _MODEL = load_whisper_model(quantize=quantization.QUANTIZE_ENABLED)
+
+    return _MODEL
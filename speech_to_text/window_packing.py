@@ -0,0 +1,101 @@
+from typing import List, Tuple
+
+# Whisper always encodes 30 s mel windows
+WHISPER_WINDOW_SEC = 30.0
+
+
+def group_chunks_by_language(languages: List[str]) -> List[Tuple[int, int, str]]:
+    """
+    Group consecutive chunks with the same detected language.
+
+    Returns (first_chunk, last_chunk_exclusive, language) runs. Each run is
+    transcribed as one continuous signal (batched_asr.transcribe_runs), so
+    Whisper fills its windows with audio instead of padding every 20 s
+    chunk.
+    """
+    runs = []
+    start = 0
+
+    for i in range(1, len(languages) + 1):
+        if i == len(languages) or languages[i] != languages[start]:
+            runs.append((start, i, languages[start]))
+            start = i
+
+    return runs
+
+
+def assign_segments_to_chunks(
+    segments: List[dict],
+    chunk_bounds: List[Tuple[float, float]],
+    offset: float = 0.0
+) -> List[List[dict]]:
+    """
+    Map Whisper segments back to the chunks they came from.
+
+    segments carry times relative to the start of the transcribed run
+    (shifted by offset to the job timeline); chunk_bounds are the absolute
+    (start, end) times of the run's chunks. A segment belongs to the chunk
+    containing its midpoint and its times are rewritten relative to that
+    chunk, matching per-chunk transcription output.
+    """
+    assigned = [[] for _ in chunk_bounds]
+    if not chunk_bounds:
+        return assigned
+
+    idx = 0
+    for seg in segments:
+        start = seg["start"] + offset
+        end = seg["end"] + offset
+        mid = (start + end) / 2
+
+        # Segments come out in time order, so the chunk index never decreases
+        while idx < len(chunk_bounds) - 1 and mid >= chunk_bounds[idx][1]:
+            idx += 1
+
+        chunk_start = chunk_bounds[idx][0]
+        mapped = dict(seg)
+        mapped["start"] = max(0.0, start - chunk_start)
+        mapped["end"] = max(0.0, end - chunk_start)
+        assigned[idx].append(mapped)
+
+    return assigned
+
+
+
+def split_into_windows(
+    audio,
+    sample_rate: int = 16000,
+    window_sec: float = WHISPER_WINDOW_SEC,
+    cuts: List[int] = None
+) -> List[Tuple[float, object]]:
+    """
+    Cut a continuous signal into window-aligned pieces of at most 30 s.
+
+    cuts are sample offsets (e.g. chunk boundaries) no window may
+    straddle: the signal is split there first, so a window decoded
+    without timestamps covers a single chunk. Returns (offset_seconds,
+    samples) pairs; without cuts every piece except the last fills a
+    whole Whisper window.
+    """
+    step = int(window_sec * sample_rate)
+    bounds = [0] + sorted(c for c in (cuts or []) if 0 < c < len(audio)) + [len(audio)]
+
+    return [
+        (start / sample_rate, audio[start:min(start + step, stop)])
+        for first, stop in zip(bounds, bounds[1:])
+        for start in range(first, stop, step)
+    ]
+
+
+def offset_segments(segments: List[dict], offset: float) -> List[dict]:
+    """
+    Shift window-relative segment times by the window's offset.
+    """
+    shifted = []
+    for seg in segments:
+        seg = dict(seg)
+        seg["start"] += offset
+        seg["end"] += offset
+        shifted.append(seg)
+
+    return shifted
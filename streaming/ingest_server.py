@@ -0,0 +1,204 @@
+"""
+Live ingest endpoints for StreamingSession.
+
+WebSocket (tornado, 127.0.0.1 unless --address is given):
+    ws://host:port/stream?rate=16000&format=s16le&target_language=hi&token=...
+        binary messages: raw mono PCM frames
+        text message "end": flush and close the session
+        server → client: JSON updates (utterance / error / closed)
+    ws://host:port/stream/<session_id>/updates?token=...
+        read-only subscription to a running session's updates
+    With ACMTS_STREAM_TOKEN set, both endpoints require it as the token
+    query argument or an "Authorization: Bearer" header.
+
+Pipe:
+    ffmpeg -i call.aac -f s16le -ac 1 -ar 16000 - | python -m streaming.ingest_server --pipe
+        JSON updates are printed one per line to stdout
+"""
+import argparse
+import asyncio
+import hmac
+import json
+import os
+import sys
+
+from streaming.session import StreamingSession
+
+PORT = 8765
+
+# Loopback by default; binding elsewhere requires STREAM_TOKEN
+ADDRESS = "127.0.0.1"
+
+# Shared secret clients must present (unset → loopback-only serving)
+STREAM_TOKEN = os.getenv("ACMTS_STREAM_TOKEN") or None
+
+# Bytes read from stdin per push in pipe mode (20 ms of 16 kHz s16le)
+PIPE_BLOCK_BYTES = 640
+
+SESSIONS = {}
+
+
+def _dumps(update: dict) -> str:
+    return json.dumps(update, ensure_ascii=False, default=str)
+
+
+def _authorized(handler, token: str) -> bool:
+    if not token:
+        return True
+
+    supplied = handler.get_query_argument("token", None)
+    auth = handler.request.headers.get("Authorization", "")
+    if supplied is None and auth.startswith("Bearer "):
+        supplied = auth[len("Bearer "):]
+
+    return supplied is not None and hmac.compare_digest(supplied.encode(), token.encode())
+
+
+def make_app(token: str = None):
+    import tornado.ioloop
+    import tornado.web
+    import tornado.websocket
+
+    token = token if token is not None else STREAM_TOKEN
+
+    class StreamHandler(tornado.websocket.WebSocketHandler):
+
+        def open(self):
+            self.session = None
+            self.loop = tornado.ioloop.IOLoop.current()
+            if not _authorized(self, token):
+                self.close(code=1008, reason="Missing or invalid token")
+                return
+            try:
+                self.session = StreamingSession(
+                    target_language=self.get_query_argument("target_language", None),
+                    decoding_profile=self.get_query_argument("decoding_profile", None),
+                    input_sample_rate=int(self.get_query_argument("rate", "16000")),
+                    sample_format=self.get_query_argument("format", "s16le")
+                )
+            except ValueError as exc:
+                self.close(code=1003, reason=str(exc))
+                return
+
+            SESSIONS[self.session.session_id] = self.session
+            self.session.subscribe(self._forward)
+            self.write_message(_dumps({"type": "opened", "session_id": self.session.session_id}))
+
+        def _forward(self, update: dict):
+            # Called on the session's worker thread
+            self.loop.add_callback(self._send, _dumps(update))
+
+        def _send(self, message: str):
+            try:
+                self.write_message(message)
+            except tornado.websocket.WebSocketClosedError:
+                pass
+
+        async def on_message(self, message):
+            if self.session is None or self.session.closed:
+                # open() refused the connection, or "end" was already sent
+                self.close(code=1008, reason="No open session")
+                return
+
+            if isinstance(message, bytes):
+                # push_pcm blocks while the session's utterance queue is
+                # full; tornado reads no further message until this returns
+                await self.loop.run_in_executor(None, self.session.push_pcm, message)
+            elif message.strip() == "end":
+                await asyncio.get_running_loop().run_in_executor(None, self.session.close)
+                self.close()
+
+        def on_close(self):
+            session = getattr(self, "session", None)
+            if session is not None:
+                session.unsubscribe(self._forward)
+                SESSIONS.pop(session.session_id, None)
+                if not session.closed:
+                    # Client left without "end": stop the worker thread
+                    # (read-only subscribers still get the final updates)
+                    self.loop.run_in_executor(None, session.close)
+
+    class UpdatesHandler(tornado.websocket.WebSocketHandler):
+
+        def open(self, session_id: str):
+            self.loop = tornado.ioloop.IOLoop.current()
+            self.session = None
+            if not _authorized(self, token):
+                self.close(code=1008, reason="Missing or invalid token")
+                return
+            self.session = SESSIONS.get(session_id)
+            if self.session is None:
+                self.close(code=1008, reason=f"Unknown session '{session_id}'")
+                return
+            self.session.subscribe(self._forward)
+
+        def _forward(self, update: dict):
+            self.loop.add_callback(self._send, _dumps(update))
+
+        def _send(self, message: str):
+            try:
+                self.write_message(message)
+            except tornado.websocket.WebSocketClosedError:
+                pass
+
+        def on_close(self):
+            if getattr(self, "session", None) is not None:
+                self.session.unsubscribe(self._forward)
+
+    return tornado.web.Application([
+        (r"/stream", StreamHandler),
+        (r"/stream/([0-9a-f]+)/updates", UpdatesHandler),
+    ])
+
+
+def run_pipe(args) -> None:
+    session = StreamingSession(
+        target_language=args.target_language,
+        decoding_profile=args.decoding_profile,
+        input_sample_rate=args.rate,
+        sample_format=args.format
+    )
+    session.subscribe(lambda update: print(_dumps(update), flush=True))
+
+    block_bytes = PIPE_BLOCK_BYTES * (2 if args.format == "f32le" else 1) * max(1, args.rate // 16000)
+    stdin = sys.stdin.buffer
+    while True:
+        data = stdin.read(block_bytes)
+        if not data:
+            break
+        session.push_pcm(data)
+
+    session.close()
+
+
+async def serve(port: int, address: str = ADDRESS, token: str = None) -> None:
+    token = token if token is not None else STREAM_TOKEN
+    if not token and address not in ("127.0.0.1", "::1", "localhost"):
+        raise SystemExit(f"Refusing to serve on {address} without a token: set ACMTS_STREAM_TOKEN or --token")
+
+    make_app(token).listen(port, address=address)
+    print(f"🎙️ Streaming ingest listening on ws://{address}:{port}/stream" + (" (token required)" if token else ""))
+    await asyncio.Event().wait()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Live streaming ingest (WebSocket or stdin pipe)")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--address", default=ADDRESS, help="Interface to bind (non-loopback requires a token)")
+    parser.add_argument("--token", default=None, help="Client token (default: ACMTS_STREAM_TOKEN)")
+    parser.add_argument("--pipe", action="store_true", help="Read raw PCM from stdin instead of serving WebSockets")
+    parser.add_argument("--rate", type=int, default=16000, help="Input sample rate (pipe mode)")
+    parser.add_argument("--format", choices=("s16le", "f32le"), default="s16le", help="Input sample format (pipe mode)")
+    parser.add_argument("--target-language", default=None)
+    parser.add_argument("--decoding-profile", default=None)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_args()
+
+    if args.pipe:
+        run_pipe(args)
+    else:
+        asyncio.run(serve(args.port, args.address, args.token))
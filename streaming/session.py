@@ -0,0 +1,276 @@
+import queue
+import threading
+import time
+import uuid
+from typing import Callable, List
+
+import numpy as np
+
+from audio_preprocessing.audio_normalizer import StreamingNormalizer
+from audio_preprocessing.resampler import StreamingResampler
+from conversation_structuring.conversation_builder import ConversationBuilder
+from conversation_structuring.repetition_filter import clean_transcript
+from monitoring.metrics import job_context, span
+from streaming.vad import SAMPLE_RATE, Utterance, VadSegmenter
+
+# -------------------- CONFIG --------------------
+
+# Cosine similarity needed to join an existing speaker
+SPEAKER_SIMILARITY = 0.75
+
+# Resemblyzer needs this much speech for a usable embedding
+MIN_EMBED_SEC = 1.0
+
+# Closed utterances waiting for the worker; push_pcm() blocks beyond this
+# so a client sending faster than real time cannot grow memory unbounded
+MAX_PENDING_UTTERANCES = 8
+
+
+class IncrementalSpeakerAssigner:
+    """
+    Online speaker labelling: each utterance embedding joins the most
+    similar running centroid above threshold, or opens a new speaker.
+    Utterances too short to embed inherit the previous speaker.
+    """
+
+    def __init__(self, threshold: float = SPEAKER_SIMILARITY):
+        self.threshold = threshold
+        self._centroids: List[np.ndarray] = []
+        self._counts: List[int] = []
+        self._last = None
+
+    def assign(self, embedding) -> str:
+        if embedding is None:
+            return f"Speaker {(self._last or 0) + 1}"
+
+        embedding = embedding / (np.linalg.norm(embedding) + 1e-9)
+
+        best, best_sim = None, -1.0
+        for i, centroid in enumerate(self._centroids):
+            sim = float(np.dot(centroid, embedding))
+            if sim > best_sim:
+                best, best_sim = i, sim
+
+        if best is None or best_sim < self.threshold:
+            self._centroids.append(embedding)
+            self._counts.append(1)
+            best = len(self._centroids) - 1
+        else:
+            count = self._counts[best]
+            centroid = (self._centroids[best] * count + embedding) / (count + 1)
+            self._centroids[best] = centroid / (np.linalg.norm(centroid) + 1e-9)
+            self._counts[best] = count + 1
+
+        self._last = best
+        return f"Speaker {best + 1}"
+
+
+class StreamingSession:
+    """
+    Live ingest of one call.
+
+    push_pcm() takes raw PCM (s16le or f32le bytes, or arrays) at any
+    sample rate; audio is resampled, loudness-normalized and cut into
+    utterances by VAD on the caller's thread. A worker thread then runs
+    language ID → ASR → repetition filter → translation → speaker
+    assignment for each utterance as soon as it closes, appends it to a
+    ConversationBuilder and pushes an update to every subscriber:
+
+        {"type": "utterance", "session_id", "chunk", "timeline_entry",
+         "latency_sec"}
+
+    latency_sec is measured from the moment VAD closed the utterance.
+    At most MAX_PENDING_UTTERANCES wait for the worker; push_pcm() then
+    blocks until one is processed (run it off the event loop).
+    """
+
+    def __init__(
+        self,
+        target_language: str = None,
+        decoding_profile: str = None,
+        input_sample_rate: int = SAMPLE_RATE,
+        sample_format: str = "s16le",
+        session_id: str = None
+    ):
+        from main06 import DECODING_PROFILE, TARGET_LANGUAGE
+
+        if sample_format not in ("s16le", "f32le"):
+            raise ValueError(f"Unsupported sample format '{sample_format}'. Supported formats are: ('s16le', 'f32le')")
+
+        self.session_id = session_id or uuid.uuid4().hex[:12]
+        self.target_language = (target_language or TARGET_LANGUAGE).lower()
+        self.decoding_profile = decoding_profile or DECODING_PROFILE
+        self.sample_format = sample_format
+
+        self.resampler = StreamingResampler(input_sample_rate, SAMPLE_RATE)
+        self.normalizer = StreamingNormalizer(SAMPLE_RATE)
+        self.segmenter = VadSegmenter()
+        self.speakers = IncrementalSpeakerAssigner()
+        self.builder = ConversationBuilder()
+
+        self.chunks = []
+        self.latencies = []
+        self._previous_text = ""
+        self._subscribers: List[Callable[[dict], None]] = []
+        self._lock = threading.Lock()
+
+        self.closed = False
+        self._queue = queue.Queue(maxsize=MAX_PENDING_UTTERANCES)
+        # Serialises push_pcm() and close() (resampler / VAD state)
+        self._ingest_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name=f"stream-{self.session_id}", daemon=True)
+        self._worker.start()
+
+    # ---------- subscribers ----------
+
+    def subscribe(self, callback: Callable[[dict], None]) -> None:
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[dict], None]) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _publish(self, update: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(update)
+            except Exception as exc:  # a broken subscriber must not stop the stream
+                print(f"⚠️ Stream subscriber failed: {exc}")
+
+    # ---------- ingest (caller's thread) ----------
+
+    def push_pcm(self, data) -> int:
+        """
+        Feed raw PCM; returns the number of utterances closed by it.
+        """
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            dtype = "<i2" if self.sample_format == "s16le" else "<f4"
+            data = np.frombuffer(data, dtype=dtype)
+
+        with self._ingest_lock:
+            if self.closed:
+                return 0
+            samples = self.resampler.process(data)
+            return self._ingest(samples)
+
+    def _ingest(self, samples: np.ndarray) -> int:
+        if samples.size:
+            samples = self.normalizer.process(np.array(samples, dtype=np.float32))
+
+        utterances = self.segmenter.push(samples)
+        for utterance in utterances:
+            self._queue.put(utterance)
+        return len(utterances)
+
+    def close(self, timeout: float = None) -> dict:
+        """
+        End of stream: flush VAD, wait for pending utterances and return
+        the final conversation snapshot. Closing twice only returns the
+        snapshot again.
+        """
+        with self._lock:
+            already_closed = self.closed
+            self.closed = True
+        if already_closed:
+            self._worker.join(timeout)
+            return self.builder.snapshot()
+
+        with self._ingest_lock:
+            tail = self.resampler.flush()
+            if tail.size:
+                self._ingest(tail)
+
+            for utterance in self.segmenter.flush():
+                self._queue.put(utterance)
+
+        self._queue.put(None)
+        self._worker.join(timeout)
+
+        snapshot = self.builder.snapshot()
+        self._publish({"type": "closed", "session_id": self.session_id, **snapshot})
+        return snapshot
+
+    # ---------- processing (worker thread) ----------
+
+    def _run(self) -> None:
+        with job_context(self.session_id):
+            while True:
+                utterance = self._queue.get()
+                if utterance is None:
+                    break
+                try:
+                    self._process(utterance)
+                except Exception as exc:
+                    self._publish({
+                        "type": "error",
+                        "session_id": self.session_id,
+                        "utterance": utterance.index,
+                        "error": f"{type(exc).__name__}: {exc}",
+                    })
+
+    def _process(self, utterance: Utterance) -> None:
+        from language_detection.tiered_detector import detect_language_tiered
+        from language_detection.whisper_lang_detector import detect_language_whisper
+        from main06 import LANGUAGE_PREFILTER, NLLB_LANG_MAP, TRANSLATION_MODEL
+        from speaker_diarization.embedding_extractor import extract_embedding
+        from speech_to_text.batched_asr import transcribe_windows
+        from translation.tf_translator import translate_text
+
+        audio = utterance.samples
+
+        with span("stream.utterance", chunk_id=utterance.index, audio_seconds=utterance.duration):
+            if LANGUAGE_PREFILTER:
+                lang_result = detect_language_tiered(audio)
+            else:
+                lang_result = detect_language_whisper(audio)
+            language = lang_result["detected_language"].lower()
+
+            result = transcribe_windows(
+                [{"audio": audio, "language": language, "offset": 0.0}],
+                profile=self.decoding_profile
+            )[0]
+
+            cleaned = clean_transcript(result["segments"], self._previous_text)
+            if cleaned["segments"]:
+                self._previous_text = cleaned["segments"][-1]["text"]
+
+            src_code = NLLB_LANG_MAP.get(language)
+            tgt_code = NLLB_LANG_MAP.get(self.target_language)
+            if cleaned["text"] and src_code and tgt_code and src_code != tgt_code:
+                translated = translate_text(cleaned["text"], src_code, tgt_code, TRANSLATION_MODEL)
+            else:
+                translated = cleaned["text"]
+
+            embedding = extract_embedding(audio) if utterance.duration >= MIN_EMBED_SEC else None
+            speaker = self.speakers.assign(embedding)
+
+        chunk = {
+            "chunk_id": utterance.index,
+            "start_time": utterance.start,
+            "end_time": utterance.end,
+            "detected_language": language,
+            "language_tier": lang_result.get("tier", "whisper"),
+            "user_output_language": self.target_language,
+            "transcript": cleaned["text"],
+            "translated_text": translated,
+            "speaker_id": speaker,
+            "segments": cleaned["segments"],
+        }
+        self.chunks.append(chunk)
+        self.builder.add_chunk(chunk)
+
+        latency = time.monotonic() - utterance.closed_at
+        self.latencies.append(latency)
+
+        latest = self.builder.timeline.tail(1)
+        self._publish({
+            "type": "utterance",
+            "session_id": self.session_id,
+            "chunk": chunk,
+            "timeline_entry": latest[0] if latest else None,
+            "latency_sec": round(latency, 3),
+        })
@@ -0,0 +1,157 @@
+import time
+from collections import deque
+from typing import List
+
+import numpy as np
+
+# -------------------- CONFIG --------------------
+
+SAMPLE_RATE = 16000
+
+# webrtcvad accepts 10, 20 or 30 ms frames
+FRAME_MS = 30
+
+# 0 (least) .. 3 (most aggressive at filtering non-speech)
+VAD_AGGRESSIVENESS = 2
+
+# Silence that closes an utterance
+MIN_SILENCE_MS = 500
+
+# Utterances shorter than this are treated as noise
+MIN_UTTERANCE_MS = 300
+
+# Long monologues are cut so latency stays bounded
+MAX_UTTERANCE_SEC = 15.0
+
+# Audio kept before the first voiced frame (onsets are often unvoiced)
+PRE_ROLL_MS = 150
+
+
+class Utterance:
+    """
+    One closed stretch of speech: samples plus its position in the stream.
+    """
+
+    __slots__ = ("index", "start", "end", "samples", "closed_at")
+
+    def __init__(self, index: int, start: float, samples: np.ndarray, closed_at: float):
+        self.index = index
+        self.start = start
+        self.end = start + len(samples) / SAMPLE_RATE
+        self.samples = samples
+        self.closed_at = closed_at
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class VadSegmenter:
+    """
+    Incremental webrtcvad segmenter for 16 kHz mono float32 audio.
+
+    push() accepts blocks of any size and returns the utterances closed
+    by them; an utterance closes after MIN_SILENCE_MS of non-speech or at
+    MAX_UTTERANCE_SEC. flush() closes whatever is open at end of stream.
+    """
+
+    def __init__(
+        self,
+        aggressiveness: int = VAD_AGGRESSIVENESS,
+        min_silence_ms: int = MIN_SILENCE_MS,
+        min_utterance_ms: int = MIN_UTTERANCE_MS,
+        max_utterance_sec: float = MAX_UTTERANCE_SEC
+    ):
+        import webrtcvad
+
+        self._vad = webrtcvad.Vad(aggressiveness)
+        self.frame_len = SAMPLE_RATE * FRAME_MS // 1000
+
+        self.silence_frames = max(1, min_silence_ms // FRAME_MS)
+        self.min_frames = max(1, min_utterance_ms // FRAME_MS)
+        self.max_frames = int(max_utterance_sec * 1000 // FRAME_MS)
+
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._pre_roll = deque(maxlen=max(1, PRE_ROLL_MS // FRAME_MS))
+        self._frames: List[np.ndarray] = []
+        self._voiced = 0
+        self._trailing_silence = 0
+        self._start_frame = 0
+        self._frame_index = 0
+        self._count = 0
+
+    def _is_speech(self, frame: np.ndarray) -> bool:
+        pcm = (np.clip(frame, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+        return self._vad.is_speech(pcm, SAMPLE_RATE)
+
+    def _close(self) -> List[Utterance]:
+        frames, voiced, trailing = self._frames, self._voiced, self._trailing_silence
+        self._frames = []
+        self._voiced = 0
+        self._trailing_silence = 0
+
+        # Drop the trailing silence that closed the utterance
+        speech_frames = len(frames) - trailing
+        if voiced < self.min_frames or speech_frames <= 0:
+            return []
+
+        utterance = Utterance(
+            self._count,
+            self._start_frame * FRAME_MS / 1000,
+            np.concatenate(frames[:speech_frames]),
+            time.monotonic()
+        )
+        self._count += 1
+        return [utterance]
+
+    def push(self, samples: np.ndarray) -> List[Utterance]:
+        samples = np.asarray(samples, dtype=np.float32)
+        if self._pending.size:
+            samples = np.concatenate([self._pending, samples])
+
+        n_frames = len(samples) // self.frame_len
+        self._pending = samples[n_frames * self.frame_len:]
+
+        closed = []
+        for i in range(n_frames):
+            frame = samples[i * self.frame_len:(i + 1) * self.frame_len]
+            speech = self._is_speech(frame)
+
+            if not self._frames:
+                if speech:
+                    # Open an utterance, including the pre-roll
+                    self._frames = list(self._pre_roll) + [frame]
+                    self._start_frame = self._frame_index - len(self._pre_roll)
+                    self._voiced = 1
+                    self._trailing_silence = 0
+                    self._pre_roll.clear()
+                else:
+                    self._pre_roll.append(frame)
+            else:
+                self._frames.append(frame)
+                if speech:
+                    self._voiced += 1
+                    self._trailing_silence = 0
+                else:
+                    self._trailing_silence += 1
+
+                if self._trailing_silence >= self.silence_frames or len(self._frames) >= self.max_frames:
+                    closed.extend(self._close())
+
+            self._frame_index += 1
+
+        return closed
+
+    def flush(self) -> List[Utterance]:
+        if self._pending.size:
+            frame = np.zeros(self.frame_len, dtype=np.float32)
+            frame[:self._pending.size] = self._pending
+            self._pending = np.zeros(0, dtype=np.float32)
+            closed = self.push(frame)
+        else:
+            closed = []
+
+        if self._frames:
+            closed.extend(self._close())
+
+        return closed
@@ -3,15 +3,8 @@ import tempfile
 import streamlit as st
 
 # --------- Pipeline Imports ----------
-from audio_preprocessing.audio_loader import load_audio
-from audio_preprocessing.audio_converter import convert_to_wav_mono
-from audio_preprocessing.audio_normalizer import normalize_audio
-from audio_preprocessing.audio_splitter import split_audio
-from audio_preprocessing.noise_reduction import reduce_noise
-
-from language_detection.whisper_lang_detector import detect_language_whisper
-from speech_to_text.whisper_asr import transcribe_audio
-from translation.tf_translator import translate_text
+from audio_preprocessing.pcm_store import release_chunk_pcm
+from main06 import preprocess_audio
 from speaker_diarization.diarization_engine import diarize_chunks
 from conversation_structuring.conversation_builder import build_conversation
 from business_intelligence.key_points_extractor import extract_business_key_points
@@ -23,8 +16,6 @@ from utils.file_utils import create_dir_if_not_exists
 TEMP_DIR = "temp_audio"
 CHUNKS_DIR = "audio_chunks"
 
-TRANSLATION_MODEL = "facebook/nllb-200-distilled-600M"
-
 NLLB_LANG_MAP = {
     "English": "eng_Latn",
     "Hindi": "hin_Deva",
@@ -43,6 +34,11 @@ LANG_CODE_MAP = {
     "kn": "Kannada",
 }
 
+LABEL_TO_CODE = {label: code for code, label in LANG_CODE_MAP.items()}
+
+# The app has always translated languages it has no NLLB code for as English
+FALLBACK_SOURCE_LANGUAGE = "en"
+
 
 # ==================== STREAMLIT UI ====================
 
@@ -65,6 +61,13 @@ target_language_label = st.sidebar.selectbox(
     index=1
 )
 
+decoding_profile = st.sidebar.selectbox(
+    "Transcription Profile",
+    ["fast", "balanced", "accurate"],
+    index=1,
+    help="fast: bulk jobs · balanced: default · accurate: beam search for important meetings"
+)
+
 enable_business_insights = st.sidebar.checkbox(
     "Enable Business Insights (LLM)",
     value=True
@@ -107,61 +110,23 @@ if run_btn and uploaded_file:
     progress = st.progress(0)
     status = st.empty()
 
-    # --------- STEP 1: Audio Preprocessing ---------
-    status.info("🔊 Loading & preprocessing audio...")
-    audio = load_audio(audio_path)
-    audio = convert_to_wav_mono(audio)
-    audio = normalize_audio(audio)
-
-    clean_wav = os.path.join(TEMP_DIR, "clean.wav")
-    audio.export(clean_wav, format="wav")
-
-    denoised = os.path.join(TEMP_DIR, "denoised.wav")
-    reduce_noise(clean_wav, denoised)
-
-    final_audio = load_audio(denoised)
-    chunks = split_audio(final_audio)
-
-    progress.progress(15)
-
-    # --------- STEP 2: ASR + Translation ---------
-    status.info("📝 Transcribing & translating...")
-    chunk_metadata = []
-
-    for i, chunk in enumerate(chunks):
-        chunk_path = os.path.join(CHUNKS_DIR, f"chunk_{i}.wav")
-        chunk.export(chunk_path, format="wav")
-
-        lang_result = detect_language_whisper(chunk_path)
-        detected_lang = lang_result["detected_language"]
-
-        asr = transcribe_audio(chunk_path, language=detected_lang)
-        transcript = asr["text"].strip()
-
-        src_code = NLLB_LANG_MAP.get(LANG_CODE_MAP.get(detected_lang, "English"))
-        tgt_code = NLLB_LANG_MAP[target_language_label]
-
-        if src_code != tgt_code:
-            translated = translate_text(
-                transcript, src_code, tgt_code, TRANSLATION_MODEL
-            )
-        else:
-            translated = transcript
-
-        chunk_metadata.append({
-            "chunk_id": i,
-            "path": chunk_path,
-            "detected_language": detected_lang,
-            "transcript": transcript,
-            "translated_text": translated,
-            "segments": asr["segments"],
-        })
+    # --------- STEP 1 + 2: Preprocessing, ASR + Translation ---------
+    status.info("🔊 Preprocessing, transcribing & translating...")
+    chunk_metadata = preprocess_audio(
+        audio_path,
+        target_language=LABEL_TO_CODE[target_language_label],
+        decoding_profile=decoding_profile,
+        fallback_source_language=FALLBACK_SOURCE_LANGUAGE
+    )
 
     progress.progress(40)
 
     # --------- STEP 3: Speaker Diarization ---------
     status.info("🎙️ Identifying speakers...")
-    chunk_metadata = diarize_chunks(chunk_metadata)
+    try:
+        chunk_metadata = diarize_chunks(chunk_metadata)
+    finally:
+        release_chunk_pcm(chunk_metadata)
     progress.progress(60)
 
     # --------- STEP 4: Conversation Structuring ---------
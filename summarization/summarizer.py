@@ -0,0 +1,45 @@
+import os
+
+from model_server.client import get_model_client
+
+# "torch" keeps every worker on a single ML runtime; "tf" is the original
+# TensorFlow implementation (ACMTS_QUANTIZE only applies to "torch").
+SUMMARIZATION_BACKEND = os.getenv("ACMTS_SUMMARIZATION_BACKEND", "torch")
+
+SUPPORTED_BACKENDS = ("torch", "tf")
+
+
+def get_backend(backend: str = None):
+    """
+    Return the summarization module for the configured backend.
+
+    The backend module is imported on demand, so TensorFlow is never
+    imported unless the "tf" backend is selected.
+    """
+    backend = (backend or SUMMARIZATION_BACKEND).lower()
+
+    if backend == "torch":
+        from summarization import torch_summarizer
+        return torch_summarizer
+    if backend == "tf":
+        from summarization import tf_summarizer
+        return tf_summarizer
+
+    raise ValueError(
+        f"Unsupported summarization backend '{backend}'. Supported backends are: {SUPPORTED_BACKENDS}"
+    )
+
+
+def summarize_text(text: str, backend: str = None, **kwargs) -> str:
+    """
+    Summarize text with the configured backend (same API as tf_summarizer).
+    """
+    remote = get_model_client()
+    if remote is not None:
+        return remote.call("summarize", text=text, backend=backend, kwargs=kwargs)
+
+    return get_backend(backend).summarize_text(text, **kwargs)
+
+
+def load_model_and_tokenizer(model_name: str, backend: str = None, pin: bool = False):
+    return get_backend(backend).load_model_and_tokenizer(model_name, pin=pin)
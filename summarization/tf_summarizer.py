@@ -1,21 +1,27 @@
-from transformers import AutoTokenizer, TFAutoModelForSeq2SeqLM
-import tensorflow as tf
+from monitoring.metrics import span
+from monitoring.profiler import profile_stage
+from translation.tokenizer import load_tokenizer
+from utils.model_cache import MODEL_CACHE, estimate_footprint
 
-MODEL_CACHE = {}
-TOKENIZER_CACHE = {}
 
+def load_model_and_tokenizer(model_name: str, pin: bool = False):
+    def load_model():
+        from transformers import TFAutoModelForSeq2SeqLM
+        return TFAutoModelForSeq2SeqLM.from_pretrained(model_name)
 
-def load_model_and_tokenizer(model_name: str):
-    if model_name not in MODEL_CACHE:
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = TFAutoModelForSeq2SeqLM.from_pretrained(model_name)
-
-        TOKENIZER_CACHE[model_name] = tokenizer
-        MODEL_CACHE[model_name] = model
+    tokenizer = load_tokenizer(model_name)
+    model = MODEL_CACHE.get_or_load(
+        "summarization_tf",
+        model_name,
+        load_model,
+        pin=pin,
+        estimate=lambda: estimate_footprint(model_name)
+    )
 
-    return MODEL_CACHE[model_name], TOKENIZER_CACHE[model_name]
+    return model, tokenizer
 
 
+@profile_stage("summarize_text")
 def summarize_text(
     text: str,
     model_name: str = "facebook/bart-large-cnn",
@@ -30,6 +36,8 @@ def summarize_text(
     if not text or len(text.strip()) == 0:
         return ""
 
+    import tensorflow as tf
+
     model, tokenizer = load_model_and_tokenizer(model_name)
 
     inputs = tokenizer(
@@ -40,15 +48,19 @@ def summarize_text(
         max_length=max_input_length
     )
 
-    summary_ids = model.generate(
-        input_ids=inputs["input_ids"],
-        attention_mask=inputs["attention_mask"],
-        max_length=max_summary_length,
-        min_length=min_summary_length,
-        num_beams=4,
-        length_penalty=2.0,
-        early_stopping=True
-    )
+    with span("bart.generate", model=model_name) as s:
+        summary_ids = model.generate(
+            input_ids=inputs["input_ids"],
+            attention_mask=inputs["attention_mask"],
+            max_length=max_summary_length,
+            min_length=min_summary_length,
+            num_beams=4,
+            length_penalty=2.0,
+            early_stopping=True
+        )
+
+        s["tokens_in"] = int(tf.reduce_sum(inputs["attention_mask"]))
+        s["tokens_out"] = int(summary_ids.shape[-1])
 
     summary = tokenizer.decode(
         summary_ids[0],
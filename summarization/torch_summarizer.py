@@ -0,0 +1,101 @@
+import os
+
+from monitoring.metrics import span
+from monitoring.profiler import profile_stage
+from translation.tokenizer import load_tokenizer
+from utils import quantization
+from utils.model_cache import MODEL_CACHE, estimate_footprint
+
+# -------------------- CACHE CONFIG --------------------
+
+HF_CACHE_DIR = r"D:\.cache\huggingface"
+
+
+def load_model(model_name: str, quantize: bool = False):
+    from transformers import AutoModelForSeq2SeqLM
+
+    def load_fp32():
+        model = AutoModelForSeq2SeqLM.from_pretrained(
+            model_name,
+            cache_dir=HF_CACHE_DIR
+        )
+        model.eval()
+        return model
+
+    def build_empty(checkpoint):
+        from transformers import AutoConfig, GenerationConfig
+
+        model = AutoModelForSeq2SeqLM.from_config(AutoConfig.from_pretrained(model_name, cache_dir=HF_CACHE_DIR))
+        model.generation_config = GenerationConfig.from_pretrained(model_name, cache_dir=HF_CACHE_DIR)
+        return model
+
+    if quantize:
+        return quantization.load_quantized(f"summarization-{model_name}", load_fp32, build_empty)
+
+    return load_fp32()
+
+
+def load_model_and_tokenizer(model_name: str, pin: bool = False):
+    os.makedirs(HF_CACHE_DIR, exist_ok=True)
+
+    tokenizer = load_tokenizer(model_name, cache_dir=HF_CACHE_DIR)
+    model = MODEL_CACHE.get_or_load(
+        "summarization",
+        model_name,
+        lambda: load_model(model_name, quantize=quantization.QUANTIZE_ENABLED),
+        pin=pin,
+        estimate=lambda: estimate_footprint(model_name, HF_CACHE_DIR)
+    )
+
+    return model, tokenizer
+
+
+# -------------------- SUMMARIZATION --------------------
+
+@profile_stage("summarize_text")
+def summarize_text(
+    text: str,
+    model_name: str = "facebook/bart-large-cnn",
+    max_input_length: int = 1024,
+    max_summary_length: int = 150,
+    min_summary_length: int = 40
+) -> str:
+    """
+    Abstractive summarization using a PyTorch Transformer.
+    """
+
+    if not text or len(text.strip()) == 0:
+        return ""
+
+    import torch
+
+    model, tokenizer = load_model_and_tokenizer(model_name)
+
+    # No max_length padding: PyTorch generate handles variable-length input
+    inputs = tokenizer(
+        text,
+        return_tensors="pt",
+        truncation=True,
+        max_length=max_input_length
+    )
+
+    with span("bart.generate", model=model_name) as s, torch.no_grad():
+        summary_ids = model.generate(
+            input_ids=inputs["input_ids"],
+            attention_mask=inputs["attention_mask"],
+            max_length=max_summary_length,
+            min_length=min_summary_length,
+            num_beams=4,
+            length_penalty=2.0,
+            early_stopping=True
+        )
+
+        s["tokens_in"] = int(inputs["input_ids"].shape[-1])
+        s["tokens_out"] = int(summary_ids.shape[-1])
+
+    summary = tokenizer.decode(
+        summary_ids[0],
+        skip_special_tokens=True
+    )
+
+    return summary.strip()
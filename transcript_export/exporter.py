@@ -0,0 +1,219 @@
+import json
+import math
+import os
+
+from transcript_export.writers import JsonlWriter, ParquetWriter, SubtitleWriter
+
+SUPPORTED_FORMATS = ("jsonl", "parquet", "srt", "vtt")
+
+DEFAULT_FORMATS = SUPPORTED_FORMATS
+
+
+def _optional_float(value):
+    # ChunkStore keeps missing segment scores as NaN; export them as null
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return float(value)
+
+
+def _segment_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("source", pa.string()),
+        ("chunk_id", pa.int32()),
+        ("segment_index", pa.int32()),
+        ("start", pa.float64()),
+        ("end", pa.float64()),
+        ("speaker_id", pa.string()),
+        ("language", pa.string()),
+        ("text", pa.string()),
+        ("avg_logprob", pa.float64()),
+        ("no_speech_prob", pa.float64()),
+    ])
+
+
+def _speaker_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("source", pa.string()),
+        ("chunk_id", pa.int32()),
+        ("speaker_id", pa.string()),
+    ])
+
+
+def _timeline_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("source", pa.string()),
+        ("index", pa.int32()),
+        ("speaker", pa.string()),
+        ("language", pa.string()),
+        ("text", pa.string()),
+    ])
+
+
+class TranscriptExporter:
+    """
+    Stream transcripts, timelines and insights to disk as they complete.
+
+    Files written to output_dir (per selected format):
+      <name>.jsonl           every chunk, segment, speaker, timeline and insight record
+      <name>.segments.parquet / <name>.speakers.parquet / <name>.timeline.parquet
+      <name>.srt / <name>.vtt   one cue per segment, speaker-labelled
+
+    Chunks are usually written as soon as they are transcribed and
+    translated, before diarization; write_speakers() then adds the
+    chunk_id → speaker_id records (join them onto the segments) and the
+    subtitle cues, which need the speaker label.
+
+    Nothing is accumulated in memory beyond the Parquet row-group buffer.
+    """
+
+    def __init__(self, output_dir: str, name: str, formats=DEFAULT_FORMATS, parquet_batch_rows: int = 1024):
+        unknown = set(formats) - set(SUPPORTED_FORMATS)
+        if unknown:
+            raise ValueError(f"Unsupported export formats {sorted(unknown)}. Supported formats are: {SUPPORTED_FORMATS}")
+
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(output_dir, name)
+
+        self.name = name
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.paths = {}
+
+        self._jsonl = None
+        self._segments = None
+        self._speakers = None
+        self._timeline = None
+        self._subtitles = []
+
+        if "jsonl" in formats:
+            self._jsonl = JsonlWriter(base + ".jsonl")
+            self.paths["jsonl"] = self._jsonl.path
+
+        if "parquet" in formats:
+            self._segments = ParquetWriter(base + ".segments.parquet", _segment_schema(), parquet_batch_rows)
+            self._speakers = ParquetWriter(base + ".speakers.parquet", _speaker_schema(), parquet_batch_rows)
+            self._timeline = ParquetWriter(base + ".timeline.parquet", _timeline_schema(), parquet_batch_rows)
+            self.paths["segments_parquet"] = self._segments.path
+            self.paths["speakers_parquet"] = self._speakers.path
+            self.paths["timeline_parquet"] = self._timeline.path
+
+        for fmt in ("srt", "vtt"):
+            if fmt in formats:
+                writer = SubtitleWriter(f"{base}.{fmt}", fmt)
+                self._subtitles.append(writer)
+                self.paths[fmt] = writer.path
+
+    # ---------- records ----------
+
+    def write_chunk(self, chunk) -> None:
+        """
+        Export one finished chunk (dict or ChunkStore row) and its segments.
+        Segment times are shifted onto the recording's timeline. Subtitle
+        cues are written here only if the chunk already has a speaker;
+        otherwise write_speakers() writes them after diarization.
+        """
+        offset = chunk.get("start_time", 0.0) or 0.0
+        speaker = chunk.get("speaker_id")
+        language = chunk.get("detected_language")
+        chunk_id = chunk.get("chunk_id")
+
+        if self._jsonl:
+            self._jsonl.write({
+                "type": "chunk",
+                "source": self.name,
+                "chunk_id": chunk_id,
+                "start": offset,
+                "end": chunk.get("end_time"),
+                "speaker_id": speaker,
+                "language": language,
+                "output_language": chunk.get("user_output_language"),
+                "transcript": chunk.get("transcript", ""),
+                "translated_text": chunk.get("translated_text", ""),
+            })
+
+        for index, seg in enumerate(chunk.get("segments", [])):
+            row = {
+                "source": self.name,
+                "chunk_id": chunk_id,
+                "segment_index": index,
+                "start": offset + seg["start"],
+                "end": offset + seg["end"],
+                "speaker_id": speaker,
+                "language": language,
+                "text": seg["text"].strip(),
+                "avg_logprob": _optional_float(seg.get("avg_logprob")),
+                "no_speech_prob": _optional_float(seg.get("no_speech_prob")),
+            }
+
+            if self._jsonl:
+                self._jsonl.write({"type": "segment", **row})
+            if self._segments:
+                self._segments.write(row)
+            if speaker:
+                self._write_cues(offset, [seg], speaker)
+
+    def _write_cues(self, offset: float, segments, speaker: str) -> None:
+        for seg in segments:
+            for writer in self._subtitles:
+                writer.write_cue(offset + seg["start"], offset + seg["end"], seg["text"].strip(), speaker)
+
+    def write_speakers(self, chunks) -> None:
+        """
+        After diarization: one speaker record per chunk, plus the subtitle
+        cues of chunks that were written before their speaker was known.
+        """
+        for chunk in chunks:
+            row = {"source": self.name, "chunk_id": chunk.get("chunk_id"), "speaker_id": chunk.get("speaker_id")}
+
+            if self._jsonl:
+                self._jsonl.write({"type": "speaker", **row})
+            if self._speakers:
+                self._speakers.write(row)
+            if self._subtitles:
+                self._write_cues(chunk.get("start_time", 0.0) or 0.0, chunk.get("segments", []), row["speaker_id"])
+
+    def write_timeline_entry(self, entry: dict) -> None:
+        row = {
+            "source": self.name,
+            "index": entry["index"],
+            "speaker": entry["speaker"],
+            "language": entry.get("language"),
+            "text": entry["text"],
+        }
+
+        if self._jsonl:
+            self._jsonl.write({"type": "timeline", **row})
+        if self._timeline:
+            self._timeline.write(row)
+
+    def write_insights(self, insights: dict) -> None:
+        if not insights:
+            return
+
+        if self._jsonl:
+            self._jsonl.write({"type": "insights", "source": self.name, **insights})
+
+        path = os.path.join(self.output_dir, f"{self.name}.insights.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(insights, f, ensure_ascii=False, indent=2)
+        self.paths["insights"] = path
+
+    # ---------- lifecycle ----------
+
+    def close(self) -> None:
+        for writer in [self._jsonl, self._segments, self._speakers, self._timeline, *self._subtitles]:
+            if writer is not None:
+                writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
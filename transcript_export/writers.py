@@ -0,0 +1,126 @@
+import json
+import os
+
+
+def _ensure_parent(path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+def format_timestamp(seconds: float, separator: str = ",") -> str:
+    """
+    HH:MM:SS,mmm (SRT) or HH:MM:SS.mmm (VTT).
+    """
+    millis = int(round(max(seconds, 0.0) * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+class JsonlWriter:
+    """
+    One JSON object per line, flushed after every record so streaming
+    consumers can tail the file.
+    """
+
+    def __init__(self, path: str):
+        _ensure_parent(path)
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SubtitleWriter:
+    """
+    Incremental SRT / WebVTT cue writer.
+    """
+
+    def __init__(self, path: str, fmt: str = "srt"):
+        if fmt not in ("srt", "vtt"):
+            raise ValueError(f"Unsupported subtitle format '{fmt}'. Supported formats are: ('srt', 'vtt')")
+
+        _ensure_parent(path)
+        self.path = path
+        self.fmt = fmt
+        self._count = 0
+        self._file = open(path, "w", encoding="utf-8")
+
+        if fmt == "vtt":
+            self._file.write("WEBVTT\n\n")
+
+    def write_cue(self, start: float, end: float, text: str, speaker: str = None) -> None:
+        text = text.strip()
+        if not text:
+            return
+
+        self._count += 1
+        separator = "," if self.fmt == "srt" else "."
+        start_ts = format_timestamp(start, separator)
+        end_ts = format_timestamp(max(end, start), separator)
+
+        if speaker:
+            text = f"<v {speaker}>{text}" if self.fmt == "vtt" else f"{speaker}: {text}"
+
+        if self.fmt == "srt":
+            self._file.write(f"{self._count}\n")
+        self._file.write(f"{start_ts} --> {end_ts}\n{text}\n\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter:
+    """
+    Buffered Parquet writer: rows are flushed as a row group every
+    batch_rows rows, so memory stays bounded for long recordings.
+    """
+
+    def __init__(self, path: str, schema, batch_rows: int = 1024):
+        _ensure_parent(path)
+        self.path = path
+        self.schema = schema
+        self.batch_rows = batch_rows
+        self._rows = {name: [] for name in schema.names}
+        self._pending = 0
+        self._writer = None
+
+    def write(self, row: dict) -> None:
+        for name, column in self._rows.items():
+            column.append(row.get(name))
+
+        self._pending += 1
+        if self._pending >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._pending:
+            return
+
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, self.schema)
+
+        self._writer.write_table(pa.Table.from_pydict(self._rows, schema=self.schema))
+        self._rows = {name: [] for name in self.schema.names}
+        self._pending = 0
+
+    def close(self) -> None:
+        import pyarrow.parquet as pq
+
+        self.flush()
+        if self._writer is None:
+            # Always leave a readable (possibly empty) file behind
+            self._writer = pq.ParquetWriter(self.path, self.schema)
+        self._writer.close()
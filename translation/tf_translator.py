@@ -1,35 +1,62 @@
 import os
-import torch
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+from model_server.client import get_model_client
+from monitoring.metrics import span
+from monitoring.profiler import profile_stage
+from translation.tokenizer import encode_with_src_lang, load_tokenizer
+from utils import quantization
+from utils.model_cache import MODEL_CACHE, estimate_footprint
 
 # -------------------- CACHE CONFIG --------------------
 
 HF_CACHE_DIR = r"D:\.cache\huggingface"
-os.makedirs(HF_CACHE_DIR, exist_ok=True)
 
-MODEL_CACHE = {}
-TOKENIZER_CACHE = {}
+# Tokenizer / generate() settings shared by every NLLB call (and the
+# quantization accuracy benchmark)
+ENCODE_KWARGS = {"truncation": True, "max_length": 512}
+GENERATE_KWARGS = {"max_length": 256}
 
 
-def load_model_and_tokenizer(model_name: str):
-    if model_name not in MODEL_CACHE:
-        tokenizer = AutoTokenizer.from_pretrained(
-            model_name,
-            cache_dir=HF_CACHE_DIR
-        )
-        model = AutoModelForSeq2SeqLM.from_pretrained(
+def load_model(model_name: str, quantize: bool = False):
+    from transformers import AutoModelForSeq2SeqLM
+
+    def load_fp32():
+        return AutoModelForSeq2SeqLM.from_pretrained(
             model_name,
             cache_dir=HF_CACHE_DIR
         )
 
-        TOKENIZER_CACHE[model_name] = tokenizer
-        MODEL_CACHE[model_name] = model
+    def build_empty(checkpoint):
+        from transformers import AutoConfig, GenerationConfig
 
-    return MODEL_CACHE[model_name], TOKENIZER_CACHE[model_name]
+        model = AutoModelForSeq2SeqLM.from_config(AutoConfig.from_pretrained(model_name, cache_dir=HF_CACHE_DIR))
+        model.generation_config = GenerationConfig.from_pretrained(model_name, cache_dir=HF_CACHE_DIR)
+        return model
+
+    if quantize:
+        return quantization.load_quantized(f"translation-{model_name}", load_fp32, build_empty)
+
+    return load_fp32()
+
+
+def load_model_and_tokenizer(model_name: str, pin: bool = False):
+    os.makedirs(HF_CACHE_DIR, exist_ok=True)
+
+    tokenizer = load_tokenizer(model_name, cache_dir=HF_CACHE_DIR)
+    model = MODEL_CACHE.get_or_load(
+        "translation",
+        model_name,
+        lambda: load_model(model_name, quantize=quantization.QUANTIZE_ENABLED),
+        pin=pin,
+        estimate=lambda: estimate_footprint(model_name, HF_CACHE_DIR)
+    )
+
+    return model, tokenizer
 
 
 # -------------------- TRANSLATION --------------------
 
+@profile_stage("translate_text")
 def translate_text(
     text: str,
     src_lang: str,
@@ -44,27 +71,83 @@ def translate_text(
     if not text.strip():
         return ""
 
+    remote = get_model_client()
+    if remote is not None:
+        return remote.call("translate", text=text, src_lang=src_lang, tgt_lang=tgt_lang, model_name=model_name)
+
+    import torch
+
     model, tokenizer = load_model_and_tokenizer(model_name)
 
     # 🔑 NLLB-specific handling
-    tokenizer.src_lang = src_lang
     tgt_lang_id = tokenizer.convert_tokens_to_ids(tgt_lang)
 
-    encoded = tokenizer(
+    encoded = encode_with_src_lang(
+        tokenizer,
         text,
+        src_lang,
         return_tensors="pt",
-        truncation=True,
-        max_length=512
+        **ENCODE_KWARGS
     )
 
-    with torch.no_grad():
+    with span("nllb.generate", model=model_name) as s, torch.no_grad():
         generated_tokens = model.generate(
             **encoded,
             forced_bos_token_id=tgt_lang_id,
-            max_length=256
+            **GENERATE_KWARGS
         )
 
+        s["tokens_in"] = int(encoded["input_ids"].shape[-1])
+        s["tokens_out"] = int(generated_tokens.shape[-1])
+
     return tokenizer.decode(
         generated_tokens[0],
         skip_special_tokens=True
     )
+
+
+def translate_batch(
+    texts: list,
+    src_lang: str,
+    tgt_lang: str,
+    model_name: str
+) -> list:
+    """
+    Translate several texts sharing one language pair in a single padded
+    generate() call (used by the model server's micro-batches).
+    """
+    results = [""] * len(texts)
+    indices = [i for i, text in enumerate(texts) if text.strip()]
+    if not indices:
+        return results
+
+    import torch
+
+    model, tokenizer = load_model_and_tokenizer(model_name)
+
+    tgt_lang_id = tokenizer.convert_tokens_to_ids(tgt_lang)
+
+    encoded = encode_with_src_lang(
+        tokenizer,
+        [texts[i] for i in indices],
+        src_lang,
+        return_tensors="pt",
+        padding=True,
+        **ENCODE_KWARGS
+    )
+
+    with span("nllb.generate", model=model_name, batch=len(indices)) as s, torch.no_grad():
+        generated_tokens = model.generate(
+            **encoded,
+            forced_bos_token_id=tgt_lang_id,
+            **GENERATE_KWARGS
+        )
+
+        s["tokens_in"] = int(encoded["attention_mask"].sum())
+        s["tokens_out"] = int((generated_tokens != tokenizer.pad_token_id).sum())
+
+    decoded = tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+    for i, text in zip(indices, decoded):
+        results[i] = text
+
+    return results
@@ -1,8 +1,40 @@
-from transformers import AutoTokenizer
+import threading
+import weakref
 
-TOKENIZER_CACHE = {}
+from utils.model_cache import MODEL_CACHE
 
-def load_tokenizer(model_name: str):
-    if model_name not in TOKENIZER_CACHE:
-        TOKENIZER_CACHE[model_name] = AutoTokenizer.from_pretrained(model_name)
-    return TOKENIZER_CACHE[model_name]
+# One lock per shared tokenizer instance (see encode_with_src_lang)
+_locks = weakref.WeakKeyDictionary()
+_locks_guard = threading.Lock()
+
+
+def load_tokenizer(model_name: str, cache_dir: str = None):
+    """
+    Shared tokenizer for model_name (one instance per process, whichever
+    module asks first).
+    """
+    def load():
+        from transformers import AutoTokenizer
+        return AutoTokenizer.from_pretrained(model_name, cache_dir=cache_dir)
+
+    return MODEL_CACHE.get_or_load("tokenizer", model_name, load)
+
+
+def tokenizer_lock(tokenizer) -> threading.Lock:
+    with _locks_guard:
+        lock = _locks.get(tokenizer)
+        if lock is None:
+            lock = _locks[tokenizer] = threading.Lock()
+        return lock
+
+
+def encode_with_src_lang(tokenizer, texts, src_lang: str, **kwargs):
+    """
+    Tokenize with the NLLB source-language tag. src_lang is state on the
+    shared tokenizer, so setting it and encoding happen under the
+    tokenizer's lock; concurrent jobs with other source languages would
+    otherwise tag each other's input.
+    """
+    with tokenizer_lock(tokenizer):
+        tokenizer.src_lang = src_lang
+        return tokenizer(texts, **kwargs)
@@ -0,0 +1,267 @@
+import gc
+import glob
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from monitoring.metrics import record_cache
+
+# -------------------- CONFIG --------------------
+
+# Memory budget for cached models (parameter bytes, all entries together)
+MODEL_CACHE_BUDGET_MB = int(os.getenv("ACMTS_MODEL_CACHE_MB", "4096"))
+
+
+def model_footprint(model) -> int:
+    """
+    Parameter + buffer bytes of a torch or TF model (0 if unknown, e.g.
+    tokenizers). Dynamically quantized torch layers keep their packed
+    weights in the state dict rather than in parameters().
+    """
+    if hasattr(model, "state_dict") and "torch" in sys.modules:
+        import torch
+
+        total = 0
+        for value in model.state_dict().values():
+            tensors = value if isinstance(value, (tuple, list)) else (value,)
+            for tensor in tensors:
+                if isinstance(tensor, torch.Tensor):
+                    total += tensor.numel() * tensor.element_size()
+        return total
+
+    weights = getattr(model, "weights", None)
+    if weights is not None:
+        total = 0
+        for w in weights:
+            count = 1
+            for dim in w.shape:
+                count *= int(dim)
+            total += count * w.dtype.size
+        return total
+
+    return 0
+
+
+# Checkpoint files per framework, in order of preference (a repo can ship
+# the same weights in several formats)
+_WEIGHT_PATTERNS = ("*.safetensors", "pytorch_model*.bin", "tf_model*.h5")
+
+
+def _checkpoint_dirs(model_name: str, cache_dir: str = None) -> list:
+    if os.path.isdir(model_name):
+        return [model_name]
+
+    hub_cache = cache_dir or os.getenv("HF_HUB_CACHE") or os.path.join(
+        os.getenv("HF_HOME") or os.path.join(os.path.expanduser("~"), ".cache", "huggingface"), "hub"
+    )
+    repo_dir = os.path.join(hub_cache, "models--" + model_name.replace("/", "--"), "snapshots")
+    return sorted(glob.glob(os.path.join(repo_dir, "*")), key=os.path.getmtime, reverse=True)
+
+
+def _config_footprint(config_path: str) -> int:
+    with open(config_path, encoding="utf-8") as f:
+        config = json.load(f)
+
+    d_model = config.get("d_model") or config.get("hidden_size") or 0
+    layers = (
+        (config.get("encoder_layers") or 0) + (config.get("decoder_layers") or 0)
+        or (config.get("num_layers") or 0) + (config.get("num_decoder_layers") or 0)
+        or config.get("num_hidden_layers") or 0
+    )
+    ffn = config.get("encoder_ffn_dim") or config.get("intermediate_size") or config.get("d_ff") or 4 * d_model
+    vocab = config.get("vocab_size") or 0
+
+    # Attention + feed-forward weights per layer, plus the embeddings
+    params = layers * (4 * d_model * d_model + 2 * d_model * ffn) + vocab * d_model
+    bytes_per_param = 2 if config.get("torch_dtype") in ("float16", "bfloat16") else 4
+    return params * bytes_per_param
+
+
+def estimate_footprint(model_name: str, cache_dir: str = None) -> int:
+    """
+    Bytes a model will take once loaded, known before loading it: the
+    size of its downloaded checkpoint, else a parameter count from its
+    config.json, else 0 (not downloaded yet).
+    """
+    for directory in _checkpoint_dirs(model_name, cache_dir):
+        for pattern in _WEIGHT_PATTERNS:
+            files = glob.glob(os.path.join(directory, pattern))
+            if files:
+                return sum(os.path.getsize(f) for f in files)
+
+        config_path = os.path.join(directory, "config.json")
+        if os.path.exists(config_path):
+            return _config_footprint(config_path)
+
+    return 0
+
+
+class _Entry:
+    __slots__ = ("value", "nbytes", "pinned")
+
+    def __init__(self, value, nbytes: int, pinned: bool):
+        self.value = value
+        self.nbytes = nbytes
+        self.pinned = pinned
+
+
+class ModelCache:
+    """
+    Process-wide LRU cache of models and tokenizers under a memory budget.
+
+    Entries are keyed by (kind, model_name). Before a model is loaded,
+    least recently used unpinned entries are evicted to fit its estimated
+    footprint (so the old and new model are never resident together);
+    once loaded, the budget is reconciled with its measured footprint.
+    Pinned entries are never evicted. A model larger than the whole
+    budget is still cached (with everything else unpinned evicted) so
+    the caller never loads it twice in a row.
+    """
+
+    def __init__(self, budget_bytes: int = MODEL_CACHE_BUDGET_MB * 1024 ** 2):
+        self.budget_bytes = budget_bytes
+
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+        # Estimated bytes of the loads in progress
+        self._reserved = 0
+
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    @property
+    def bytes_in_use(self) -> int:
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def get_or_load(self, kind: str, name: str, loader: Callable, pin: bool = False, estimate: Callable[[], int] = None):
+        """
+        Return the cached (kind, name) entry, loading it with loader() on
+        a miss. estimate() gives the expected bytes of the loaded model
+        (see estimate_footprint); without it nothing is evicted before
+        the load. Concurrent callers for the same key wait for one load.
+        """
+        key = (kind, name)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return self._hit(key, entry, pin)
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    return self._hit(key, entry, pin)
+
+            record_cache(kind, False)
+            expected = estimate() if estimate is not None else 0
+
+            with self._lock:
+                self._make_room(expected)
+                self._reserved += expected
+
+            try:
+                value = loader()
+                nbytes = model_footprint(value)
+            except BaseException:
+                with self._lock:
+                    self._reserved -= expected
+                    self._loading.pop(key, None)
+                raise
+
+            # Entry in and loading lock out in one step: a caller never
+            # sees neither and starts a second load
+            with self._lock:
+                self._reserved -= expected
+                self._make_room(nbytes)
+                self._entries[key] = _Entry(value, nbytes, pin)
+                self._loading.pop(key, None)
+                self.loads += 1
+
+        return value
+
+    def _hit(self, key: tuple, entry: _Entry, pin: bool):
+        self._entries.move_to_end(key)
+        entry.pinned = entry.pinned or pin
+        self.hits += 1
+        record_cache(key[0], True)
+        return entry.value
+
+    def _make_room(self, nbytes: int) -> None:
+        evicted = False
+        for key in list(self._entries):
+            if self.bytes_in_use + self._reserved + nbytes <= self.budget_bytes:
+                break
+            entry = self._entries[key]
+            if entry.pinned or entry.nbytes == 0:
+                # Evicting a tokenizer frees nothing worth counting
+                continue
+            del self._entries[key]
+            self.evictions += 1
+            evicted = True
+            print(f"♻️ Model cache: evicted {key[0]} '{key[1]}' to stay under {self.budget_bytes / 1024 ** 2:.0f} MB")
+
+        if evicted:
+            _release_memory()
+
+    def pin(self, kind: str, name: str) -> bool:
+        with self._lock:
+            entry = self._entries.get((kind, name))
+            if entry is not None:
+                entry.pinned = True
+            return entry is not None
+
+    def unpin(self, kind: str, name: str) -> None:
+        with self._lock:
+            entry = self._entries.get((kind, name))
+            if entry is not None:
+                entry.pinned = False
+
+    def evict(self, kind: str, name: str) -> bool:
+        with self._lock:
+            entry = self._entries.pop((kind, name), None)
+            if entry is not None:
+                self.evictions += 1
+        if entry is not None:
+            _release_memory()
+        return entry is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self.evictions += len(self._entries)
+            self._entries.clear()
+        _release_memory()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "bytes_in_use": self.bytes_in_use,
+                "budget_bytes": self.budget_bytes,
+                "entries": [
+                    {"kind": kind, "name": name, "bytes": entry.nbytes, "pinned": entry.pinned}
+                    for (kind, name), entry in self._entries.items()
+                ],
+            }
+
+
+def _release_memory() -> None:
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+MODEL_CACHE = ModelCache()
+
+
+def get_model_cache() -> ModelCache:
+    return MODEL_CACHE
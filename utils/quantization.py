@@ -0,0 +1,98 @@
+import os
+import re
+
+# Opt-in: dynamic int8 quantization of Linear layers for CPU inference
+QUANTIZE_ENABLED = os.getenv("ACMTS_QUANTIZE", "0") == "1"
+
+QUANT_CACHE_DIR = os.getenv("ACMTS_QUANT_CACHE", r"D:\.cache\quantized")
+
+
+def _as_plain_linear(model) -> None:
+    """
+    Whisper subclasses nn.Linear only to cast weights to the input dtype.
+    quantize_dynamic matches exact module types, so downgrade such
+    subclasses to nn.Linear (identical behaviour in fp32 on CPU).
+    """
+    import torch.nn as nn
+
+    for module in model.modules():
+        if isinstance(module, nn.Linear) and type(module) is not nn.Linear:
+            module.__class__ = nn.Linear
+
+
+def quantize_model(model):
+    """
+    Apply dynamic int8 quantization to every Linear layer of a model.
+    """
+    import torch
+    import torch.nn as nn
+
+    model.eval()
+    _as_plain_linear(model)
+
+    return torch.quantization.quantize_dynamic(
+        model,
+        {nn.Linear},
+        dtype=torch.qint8
+    )
+
+
+def _cache_path(cache_key: str) -> str:
+    import torch
+
+    safe_key = re.sub(r"[^A-Za-z0-9_.-]+", "_", cache_key)
+    return os.path.join(QUANT_CACHE_DIR, f"{safe_key}-torch{torch.__version__}-int8-state.pt")
+
+
+def load_quantized(cache_key: str, load_fp32, build_empty=None):
+    """
+    Return the int8 version of a model, reusing the quantized weights
+    cached on disk when available.
+
+    The cache holds only a state_dict (plus Whisper's dims), loaded with
+    weights_only=True, so nothing in the cache directory is unpickled as
+    code. On a hit the state is loaded into a freshly quantized
+    skeleton: build_empty(checkpoint) returns the fp32 architecture
+    without pretrained weights; without it load_fp32 provides the
+    skeleton, which materializes the fp32 weights once more.
+    """
+    import torch
+
+    path = _cache_path(cache_key)
+
+    if os.path.exists(path):
+        try:
+            checkpoint = torch.load(path, map_location="cpu", weights_only=True)
+            skeleton = build_empty(checkpoint) if build_empty is not None else load_fp32()
+            model = quantize_model(skeleton)
+            model.load_state_dict(checkpoint["state_dict"])
+            model.eval()
+            return model
+        except Exception:
+            pass  # stale or incompatible cache entry, rebuild below
+
+    model = quantize_model(load_fp32())
+
+    checkpoint = {"state_dict": model.state_dict()}
+    dims = getattr(model, "dims", None)
+    if dims is not None:
+        checkpoint["dims"] = dict(vars(dims))
+
+    os.makedirs(QUANT_CACHE_DIR, exist_ok=True)
+    tmp_path = path + ".tmp"
+    torch.save(checkpoint, tmp_path)
+    os.replace(tmp_path, path)
+
+    return model
+
+
+def model_size_bytes(model) -> int:
+    """
+    Serialized size of a model's weights (counts packed int8 weights too).
+    """
+    import io
+    import torch
+
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
@@ -0,0 +1,213 @@
+import queue
+import threading
+import time
+from typing import Callable, Iterable, List
+
+from monitoring.metrics import current_job_id, inherit_job, span
+
+# Default bound of every inter-stage queue
+STAGE_QUEUE_SIZE = 4
+
+_DONE = object()
+
+
+class _Failed:
+    """
+    Marker passed downstream in place of an item whose stage raised.
+    """
+
+    __slots__ = ("stage", "error")
+
+    def __init__(self, stage: str, error: BaseException):
+        self.stage = stage
+        self.error = error
+
+
+class Stage:
+    """
+    One pipeline stage.
+
+    func(item) → item, or with batch_size > 1 func([items]) → [items]
+    (up to batch_size items already waiting are taken together). With
+    fan_out=True, func returns an iterable of items for the next stage.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        workers: int = 1,
+        batch_size: int = 1,
+        fan_out: bool = False,
+        queue_size: int = STAGE_QUEUE_SIZE
+    ):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.batch_size = batch_size
+        self.fan_out = fan_out
+        self.queue_size = queue_size
+
+        # Stats, updated by this stage's workers
+        self.processed = 0
+        self.busy_sec = 0.0
+        self.blocked_sec = 0.0
+        self.depth_samples = 0
+        self.depth_total = 0
+        self.max_depth = 0
+
+
+class StagePipeline:
+    """
+    Run items through a chain of stages, each with its own worker
+    thread(s) and a bounded input queue, so different items occupy
+    different stages at the same time (chunk i+1 in ASR while chunk i
+    is translated). Full queues block the upstream stage
+    (backpressure). stats() reports per-stage queue depth and
+    utilization; the stage with the highest utilization is the
+    bottleneck.
+    """
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+        self._queues = [queue.Queue(maxsize=stage.queue_size) for stage in stages]
+        self._results = []
+        self._lock = threading.Lock()
+        self._started = None
+        self._finished = None
+
+    def _put(self, index: int, item) -> float:
+        """Put into stage index's queue (or the results); returns seconds blocked."""
+        if index == len(self.stages):
+            with self._lock:
+                self._results.append(item)
+            return 0.0
+
+        started = time.perf_counter()
+        self._queues[index].put(item)
+        return time.perf_counter() - started
+
+    def _take_batch(self, stage: Stage, inbox: queue.Queue) -> list:
+        first = inbox.get()
+        batch = [first]
+
+        while first is not _DONE and len(batch) < stage.batch_size:
+            try:
+                item = inbox.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DONE:
+                inbox.put(_DONE)  # leave it for the end of this batch
+                break
+            batch.append(item)
+
+        return batch
+
+    def _worker(self, index: int, job_id: str) -> None:
+        with inherit_job(job_id):
+            self._work(index)
+
+    def _work(self, index: int) -> None:
+        stage = self.stages[index]
+        inbox = self._queues[index]
+
+        while True:
+            depth = inbox.qsize()
+            batch = self._take_batch(stage, inbox)
+            if batch[0] is _DONE:
+                break
+
+            with self._lock:
+                stage.depth_samples += 1
+                stage.depth_total += depth
+                stage.max_depth = max(stage.max_depth, depth)
+
+            failed = [item for item in batch if isinstance(item, _Failed)]
+            items = [item for item in batch if not isinstance(item, _Failed)]
+
+            outputs = list(failed)
+            started = time.perf_counter()
+            try:
+                if items:
+                    with span(f"pipeline.{stage.name}", batch=len(items)):
+                        if stage.batch_size > 1:
+                            results = stage.func(items)
+                        else:
+                            results = [stage.func(items[0])]
+
+                    for result in results:
+                        outputs.extend(result if stage.fan_out else [result])
+            except Exception as exc:
+                outputs.append(_Failed(stage.name, exc))
+
+            busy = time.perf_counter() - started
+            blocked = sum(self._put(index + 1, out) for out in outputs)
+
+            with self._lock:
+                stage.processed += len(items)
+                stage.busy_sec += busy
+                stage.blocked_sec += blocked
+
+    def run(self, items: Iterable) -> list:
+        """
+        Feed items through every stage; returns the final outputs in
+        completion order (FIFO with one worker per stage). Re-raises the
+        first stage error after the pipeline has drained.
+        """
+        self._results = []
+        self._started = time.perf_counter()
+
+        job_id = current_job_id()
+        threads = []
+        for index, stage in enumerate(self.stages):
+            workers = [
+                threading.Thread(target=self._worker, args=(index, job_id), name=f"stage-{stage.name}-{n}", daemon=True)
+                for n in range(stage.workers)
+            ]
+            for thread in workers:
+                thread.start()
+            threads.append(workers)
+
+        for item in items:
+            self._put(0, item)
+
+        # Shut stages down in order: one _DONE per worker, after that
+        # stage's upstream workers have all exited
+        for index, workers in enumerate(threads):
+            for _ in workers:
+                self._queues[index].put(_DONE)
+            for thread in workers:
+                thread.join()
+
+        self._finished = time.perf_counter()
+
+        failures = [item for item in self._results if isinstance(item, _Failed)]
+        if failures:
+            raise RuntimeError(f"Pipeline stage '{failures[0].stage}' failed: {failures[0].error}") from failures[0].error
+
+        return list(self._results)
+
+    def stats(self) -> dict:
+        """
+        Per stage: items processed, busy seconds, utilization (busy time
+        per worker over wall time), time blocked on a full downstream
+        queue, and average / max input queue depth.
+        """
+        wall = ((self._finished or time.perf_counter()) - self._started) if self._started else 0.0
+
+        stats = {}
+        for stage in self.stages:
+            stats[stage.name] = {
+                "processed": stage.processed,
+                "busy_sec": round(stage.busy_sec, 3),
+                "utilization": round(stage.busy_sec / (wall * stage.workers), 3) if wall else 0.0,
+                "blocked_sec": round(stage.blocked_sec, 3),
+                "avg_queue_depth": round(stage.depth_total / stage.depth_samples, 2) if stage.depth_samples else 0.0,
+                "max_queue_depth": stage.max_depth,
+            }
+
+        return stats
+
+    def bottleneck(self) -> str:
+        stats = self.stats()
+        return max(stats, key=lambda name: stats[name]["utilization"]) if stats else None
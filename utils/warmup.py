@@ -0,0 +1,38 @@
+from monitoring.metrics import span
+
+
+def warm_up_models(
+    translation_model: str = None,
+    summarization_model: str = None,
+    whisper: bool = True,
+    diarization: bool = True,
+    summarization_backend: str = None,
+    pin: bool = True
+) -> None:
+    """
+    Load models ahead of the first request.
+
+    Imports and model construction are deferred until a stage needs them,
+    so long-running servers call this once at startup to move that cost
+    out of the first job. Warmed models are the hot ones, so by default
+    they are pinned in the model cache and never evicted.
+    """
+    if whisper:
+        from speech_to_text.whisper_model import get_whisper_model
+        with span("warmup.whisper"):
+            get_whisper_model()
+
+    if diarization:
+        from speaker_diarization.embedding_extractor import get_voice_encoder
+        with span("warmup.resemblyzer"):
+            get_voice_encoder()
+
+    if translation_model:
+        from translation.tf_translator import load_model_and_tokenizer
+        with span("warmup.translation", model=translation_model):
+            load_model_and_tokenizer(translation_model, pin=pin)
+
+    if summarization_model:
+        from summarization.summarizer import load_model_and_tokenizer
+        with span("warmup.summarization", model=summarization_model):
+            load_model_and_tokenizer(summarization_model, backend=summarization_backend, pin=pin)